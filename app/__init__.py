@@ -1,20 +1,34 @@
 import json
+import numpy
+import os
 import pygame
 
-from typing import List, Tuple
+from typing import List, Tuple, Optional
 
 from app.events import EventManager
-from app.events.subscriptions import LMB, RMB
-from bezier import BezierCurve, BezierCurvesBunch
+from app.scheduler import FrameScheduler
+from app.worker import SamplingWorker
+from app.events.subscriptions import LMB, MMB, RMB
+from bezier import BezierCurvesBunch, EditHistory
 from render import AppRender
+from render.camera import Camera
+from render.export import export_png, export_svg
+from tracks.io import dump_binary, iter_track
+from utils.profiler import profiler
 from utils.types import ABCBaseApp
 
 
 class BaseApp(ABCBaseApp):
     _curves: List[BezierCurvesBunch]
+    sampling: SamplingWorker
+    history: EditHistory
+    camera: Camera
+    render: AppRender
 
     _mouse_LMB_event_id = None
     _mouse_RMB_event_id = None
+    _mouse_motion_event_id = None
+    _pan_event_id = None
     _esc_event_id = None
     _enter_event_id = None
     _temp_curve = None
@@ -24,9 +38,13 @@ class BaseApp(ABCBaseApp):
 
     MODE_NORMAL = "normal"
 
+    # Max deviation in pixels of drawn polyline from the true curve.
+    CURVE_FLATNESS = 0.5
+
     MODE_TEXTS = {
         MODE_CURVE_COMPLETION: "Press ENTER to save curve",
-        MODE_NORMAL: "Press A to add new curve, or LMB to select point for moving"
+        MODE_NORMAL: "Press A to add new curve, or LMB to select point for moving. "
+                     "Ctrl+Z to undo, Ctrl+Y to redo. Wheel to zoom, MMB to pan, Home to fit"
     }
 
     @property
@@ -36,11 +54,24 @@ class BaseApp(ABCBaseApp):
         else:
             return [*self._curves]
 
+    def _edits_restored(self):
+        """Edits were undone or redone."""
+
+    def _to_world(self, position: Tuple[float, float]) -> Tuple[float, float]:
+        """World coordinates of curves at screen `position`."""
+
+        x, y = self.camera.to_world(position).tolist()
+        return x, y
+
 
 class CurveCreatingMixin(BaseApp):
     def _add_curve(self, event: pygame.event.Event):
         """Command to eneter in 'Create curve mode'."""
 
+        # Not finished curve is dropped with its edits.
+        if self._temp_curve:
+            self._interrupt_adding_curve(event)
+
         self.state["mode"] = self.MODE_CURVE_CREATING
 
         self.events.unsubscribe(self._mouse_LMB_event_id)
@@ -54,31 +85,56 @@ class CurveCreatingMixin(BaseApp):
             callback=self._interrupt_adding_curve,
         )
 
-        self._temp_curve = BezierCurvesBunch()
+        self._temp_curve = BezierCurvesBunch(flatness=self.CURVE_FLATNESS, deferred=True, history=self.history)
 
     def _interrupt_adding_curve(self, event: pygame.event.Event):
         """Interrupt 'Create curve mode' and delete not finished curve."""
 
+        self.sampling.cancel(self._temp_curve)
+        self.history.forget(self._temp_curve)
+
         del self._temp_curve
         self._temp_curve = None
 
         self._set_escape_default()
         self._set_mouse_default()
 
+        self.events.unsubscribe(self._enter_event_id)
+        self._enter_event_id = None
+
         self.state["mode"] = self.MODE_NORMAL
 
     def _add_point_to_temp_curve(self, event: pygame.event.Event):
-        mouse_position = event.pos
+        mouse_position = self._to_world(event.pos)
 
         self._temp_curve.add_vertex(pygame.Vector2(mouse_position))
+        self._update_curve_completion()
 
-        if len(self._temp_curve.vertices) % 4 == 0 and not self._enter_event_id:
+    def _edits_restored(self):
+        if self._temp_curve:
+            self._update_curve_completion()
+
+    def _update_curve_completion(self):
+        """Allow to save new curve only while it has a complete curve.
+
+        Vertices of new curve are added, and removed or added again by undo
+         and redo.
+        """
+
+        complete = len(self._temp_curve.vertices) >= 4
+
+        if complete and not self._enter_event_id:
             self.state["mode"] = self.MODE_CURVE_COMPLETION
 
             self._enter_event_id = self.events.subscribe(
                 on_key_down=pygame.K_RETURN,
                 callback=self._complete_curve
             )
+        elif not complete and self._enter_event_id:
+            self.state["mode"] = self.MODE_CURVE_CREATING
+
+            self.events.unsubscribe(self._enter_event_id)
+            self._enter_event_id = None
 
     def _complete_curve(self, event: pygame.event.Event):
         self._curves.append(self._temp_curve)
@@ -94,19 +150,26 @@ class CurveCreatingMixin(BaseApp):
 
 
 class CurveManipulatingMixin(BaseApp):
-    def _select_point(self, event: pygame.event.Event):
-        pos = pygame.Vector2(event.pos)
+    # Max distance in pixels from cursor to vertex to pick it.
+    PICK_RADIUS = 5
 
+    def _select_point(self, event: pygame.event.Event):
         for curve_bunch in self.curves:
-            for point in curve_bunch.vertices:
-                if abs(point.x - pos.x) < 5 and abs(point.y - pos.y) < 5:
-                    self.state["selected_point"] = curve_bunch.select_point(point)
-                    self.state["selected_curve"] = curve_bunch
+            index = curve_bunch.find_vertex(self._to_world(event.pos), self.PICK_RADIUS / self.camera.zoom)
+
+            if index is not None:
+                self.state["selected_point"] = curve_bunch.select_point(index)
+                self.state["selected_curve"] = curve_bunch
 
-                    self._set_events_for_moving_point()
-                    return
+                self._set_events_for_moving_point()
+                return
 
     def _set_events_for_moving_point(self):
+        self.events.unsubscribe(self._mouse_motion_event_id)
+        self._mouse_motion_event_id = self.events.subscribe(
+            on_event=pygame.MOUSEMOTION,
+            callback=self._move_point,
+        )
         self.events.unsubscribe(self._mouse_LMB_event_id)
         self._mouse_LMB_event_id = self.events.subscribe(
             on_mouse_button=LMB,
@@ -123,7 +186,11 @@ class CurveManipulatingMixin(BaseApp):
             callback=self._cancel_point_selection
         )
 
+    def _move_point(self, event: pygame.event.Event):
+        self.state["selected_curve"].move_point(self._to_world(event.pos))
+
     def _save_point_position(self, event: pygame.event.Event):
+        self.state["selected_curve"].move_point(self._to_world(event.pos))
         self.state["selected_curve"].save_point_position()
         self.state["selected_curve"] = None
         self.state["selected_point"] = None
@@ -142,15 +209,69 @@ class CurveManipulatingMixin(BaseApp):
     def _add_point_to_curve(self):
         raise NotImplementedError
 
+    def _undo(self, event: pygame.event.Event):
+        if event.mod & pygame.KMOD_CTRL and not self.state["selected_curve"]:
+            if event.mod & pygame.KMOD_SHIFT:
+                self.history.redo()
+            else:
+                self.history.undo()
+
+            self._edits_restored()
+
+    def _redo(self, event: pygame.event.Event):
+        if event.mod & pygame.KMOD_CTRL and not self.state["selected_curve"]:
+            self.history.redo()
+
+            self._edits_restored()
+
+
+class CameraMixin(BaseApp):
+    # Change of zoom per step of mouse wheel.
+    ZOOM_STEP = 1.25
+
+    def _zoom(self, event: pygame.event.Event):
+        self.camera.zoom_at(self.ZOOM_STEP ** event.y, pygame.mouse.get_pos())
+
+    def _start_panning(self, event: pygame.event.Event):
+        self.events.unsubscribe(self._pan_event_id)
+        self._pan_event_id = self.events.subscribe(
+            on_event=pygame.MOUSEMOTION,
+            callback=self._pan,
+        )
+
+    def _pan(self, event: pygame.event.Event):
+        # Button up isn't subscribed, panning stops on the first motion without it.
+        if not event.buttons[MMB - 1]:
+            self.events.unsubscribe(self._pan_event_id)
+            self._pan_event_id = None
+            return
+
+        self.camera.pan(event.rel)
+
+    def _fit_view(self, event: pygame.event.Event):
+        """Show all curves."""
+
+        bounds = [curve.bounds for curve in self.curves if len(curve.vertices)]
+        if not bounds:
+            return
+
+        left, top, _, _ = numpy.min(bounds, axis=0).tolist()
+        _, _, right, bottom = numpy.max(bounds, axis=0).tolist()
+
+        self.camera.fit((left, top, right, bottom), self.render.screen.get_size())
+
 
 class DataManagement(BaseApp):
+    # Size of exported image in pixels, all curves are fitted into it.
+    EXPORT_SIZE = 4096, 3072
+
     @property
     def data(self):
         data = {"curves": []}
 
         for curve in self._curves:
             curve_data = {
-                "vertices": [(v.x, v.y) for v in curve.vertices]
+                "vertices": curve.vertices.tolist()
             }
             data["curves"].append(curve_data)
 
@@ -160,18 +281,52 @@ class DataManagement(BaseApp):
         with open("trek.json", "w") as file:
             json.dump(self.data, file, indent=4)
 
+    def save_binary(self, event: pygame.event.Event):
+        """Write binary track, which is opened without parsing and copying."""
+
+        dump_binary([curve.vertices for curve in self._curves], "trek.bin")
+
+    def export(self, event: pygame.event.Event):
+        """Write all curves to images, drawn offscreen and not the window."""
+
+        with open("trek.png", "wb") as file:
+            export_png(self.curves, file, self.EXPORT_SIZE)
+
+        with open("trek.svg", "w") as file:
+            export_svg(self.curves, file)
+
     def open(self, event: pygame.event.Event):
-        with open("trek.json", "r") as file:
-            data = json.load(file)
+        """Replace curves with the last saved ones, binary or json.
+
+        Binary track is mapped, and its vertices are copied only by bunches
+         edited after opening. Json track is parsed bunch by bunch. Points of
+         curves are calculated in background.
+        """
 
-        for curve in data["curves"]:
-            raise NotImplementedError("Should be rewritten for BezierCurvesBunch")
-            self._curves.append(BezierCurve(curve["vertices"]))
+        saved = [path for path in ("trek.bin", "trek.json") if os.path.exists(path)]
+        if not saved:
+            return
+
+        for curve in self._curves:
+            self.sampling.cancel(curve)
+
+        self.history.clear()
+
+        self._curves = [
+            BezierCurvesBunch.from_vertices(
+                vertices, flatness=self.CURVE_FLATNESS, deferred=True, history=self.history
+            )
+            for vertices in iter_track(max(saved, key=os.path.getmtime))
+        ]
 
 
-class App(CurveCreatingMixin, CurveManipulatingMixin, DataManagement):
+class App(CurveCreatingMixin, CurveManipulatingMixin, CameraMixin, DataManagement):
+    # Max rate of render, frames without changes aren't rendered at all.
     FPS = 100
 
+    # Posted by sampling worker, when points of curves are ready.
+    SAMPLES_READY = pygame.event.custom_type()
+
     def __init__(self):
         self.events: EventManager = EventManager()
         self._curves = []
@@ -184,9 +339,14 @@ class App(CurveCreatingMixin, CurveManipulatingMixin, DataManagement):
         }
 
         pygame.init()
-        self.clock = pygame.time.Clock()
+        self.scheduler: Optional[FrameScheduler] = None
+        self.history = EditHistory()
+        self.sampling = SamplingWorker(
+            on_ready=lambda: pygame.event.post(pygame.event.Event(self.SAMPLES_READY))
+        )
 
-        self.render = AppRender(self.state)
+        self.camera = Camera()
+        self.render = AppRender(self.state, self.camera)
 
         self.__subscribe_events()
 
@@ -201,18 +361,22 @@ class App(CurveCreatingMixin, CurveManipulatingMixin, DataManagement):
         self.state["running"] = True
         self.state["mode"] = self.MODE_NORMAL
 
-        while self.state["running"]:
-            self.events.handle_events()
-            self.__update_stuff()
-            self.__render_stuff()
-            self.clock.tick(self.FPS)
+        self.scheduler = FrameScheduler(
+            handle_input=self.events.handle_events,
+            wait_input=self.events.wait_events,
+            update=self.__update_stuff,
+            render=self.__render_stuff,
+            render_rate=self.FPS
+        )
+        self.scheduler.run(lambda: self.state["running"])
+
+    def __update_stuff(self, dt: float) -> bool:
+        """Submit changed curves for sampling and take the sampled ones."""
 
-    def __update_stuff(self):
         for curve in self.curves:
-            curve.update()
+            self.sampling.submit_bunch(curve)
 
-        if self._temp_curve:
-            self._temp_curve.update()
+        return self.sampling.apply()
 
     def __render_stuff(self):
         self.render.update(self.curves, self.help_text)
@@ -220,6 +384,12 @@ class App(CurveCreatingMixin, CurveManipulatingMixin, DataManagement):
     def _exit(self, event: pygame.event.Event):
         self.state["running"] = False
 
+    def _toggle_profiler(self, event: pygame.event.Event):
+        profiler.enable(not profiler.enabled)
+
+    def _export_profile(self, event: pygame.event.Event):
+        profiler.export("trace.json")
+
     def __subscribe_events(self):
         self._set_escape_default()
         self._set_mouse_default()
@@ -241,10 +411,49 @@ class App(CurveCreatingMixin, CurveManipulatingMixin, DataManagement):
             on_key_down=pygame.K_s,
             callback=self.save
         )
+        self.events.subscribe(
+            on_key_down=pygame.K_b,
+            callback=self.save_binary
+        )
         self.events.subscribe(
             on_key_down=pygame.K_o,
             callback=self.open
         )
+        self.events.subscribe(
+            on_key_down=pygame.K_e,
+            callback=self.export
+        )
+
+        self.events.subscribe(
+            on_key_down=pygame.K_z,
+            callback=self._undo
+        )
+        self.events.subscribe(
+            on_key_down=pygame.K_y,
+            callback=self._redo
+        )
+
+        self.events.subscribe(
+            on_event=pygame.MOUSEWHEEL,
+            callback=self._zoom
+        )
+        self.events.subscribe(
+            on_mouse_button=MMB,
+            callback=self._start_panning
+        )
+        self.events.subscribe(
+            on_key_down=pygame.K_HOME,
+            callback=self._fit_view
+        )
+
+        self.events.subscribe(
+            on_key_down=pygame.K_F3,
+            callback=self._toggle_profiler
+        )
+        self.events.subscribe(
+            on_key_down=pygame.K_F4,
+            callback=self._export_profile
+        )
 
     def _set_mouse_default(self):
         self.events.unsubscribe(self._mouse_LMB_event_id)
@@ -254,6 +463,7 @@ class App(CurveCreatingMixin, CurveManipulatingMixin, DataManagement):
         )
 
         self.events.unsubscribe(self._mouse_RMB_event_id)
+        self.events.unsubscribe(self._mouse_motion_event_id)
 
     def _set_escape_default(self):
         self.events.unsubscribe(self._esc_event_id)
@@ -6,6 +6,7 @@ from typing import Callable, Optional, List
 from app.events.store import SubscriptionsStore
 from app.events.subscriptions import EventSubscription
 from utils.decorators import as_singleton
+from utils.profiler import profiler
 
 
 logger = logging.getLogger(__name__)
@@ -18,6 +19,7 @@ class EventManager:
 
         self.__store = SubscriptionsStore()
         self.__events = []
+        self.__waited = []
 
     def subscribe(
             self,
@@ -74,34 +76,93 @@ class EventManager:
         TODO: looks like not enough useful method, may be should be removed.
         """
 
-        logger.debug(
-            f"Manual dispatching <{event_type}> with kwargs <{kwargs}>."
-        )
+        logger.debug("Manual dispatching <%s> with kwargs <%s>.", event_type, kwargs)
 
         event = pygame.event.Event(event_type, kwargs)
         pygame.event.post(event)
 
-    def handle_events(self):
-        """Used to check and handle events in mainloop."""
+    def handle_events(self) -> bool:
+        """Used to check and handle events in mainloop.
+
+        :return: Were there any events or not.
+        """
 
         logger.debug("Start handling pygame events.")
 
-        self.__events = pygame.event.get()
+        self.__events = [*self.__waited, *pygame.event.get()]
+        self.__waited = []
+
+        # Consecutive mouse motions are handled as one motion to the last
+        #  position, so dragging costs one update per frame.
+        motion = None
+
         for event in self.__events:
-            logger.debug(f"Handle <{event}>")
-            self._handle_event(event)
+            if event.type == pygame.MOUSEMOTION:
+                motion = self.__merge_motions(motion, event)
+                continue
+
+            if motion is not None:
+                self.__handle(motion)
+                motion = None
+
+            self.__handle(event)
+
+        if motion is not None:
+            self.__handle(motion)
+
+        handled = bool(self.__events)
 
         logger.debug("Clear events.")
         self.__events = []
 
         logger.debug("End of handling pygame events.")
 
+        return handled
+
+    def wait_events(self, timeout: int) -> bool:
+        """Block until any event comes, but not longer than `timeout` ms.
+
+        Event is kept for the next `handle_events`.
+
+        :return: Did event come or not.
+        """
+
+        if self.__waited:
+            return True
+
+        event = pygame.event.wait(timeout)
+        if event.type == pygame.NOEVENT:
+            return False
+
+        self.__waited.append(event)
+
+        return True
+
+    def __handle(self, event):
+        logger.debug("Handle <%s>", event)
+        self._handle_event(event)
+
+    @staticmethod
+    def __merge_motions(previous, event):
+        if previous is None:
+            return event
+
+        x, y = previous.rel
+        dx, dy = event.rel
+
+        return pygame.event.Event(pygame.MOUSEMOTION, {**event.dict, "rel": (x + dx, y + dy)})
+
     def _handle_event(self, event):
-        for subscription in self.__store[event.type]:
+        entries = self.__store.match(event)
+
+        if profiler.enabled:
+            profiler.count("subscriptions checked", len(entries))
+
+        for subscription, check_conditions in entries:
             if subscription.subtype and not subscription.check_subtype(event):
                 continue
 
-            if not subscription.check_conditions(event):
+            if check_conditions and not subscription.check_conditions(event):
                 continue
 
             subscription.callback(event)
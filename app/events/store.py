@@ -3,22 +3,49 @@ from __future__ import annotations
 import logging
 
 from collections import defaultdict
-from typing import Dict
+from typing import Dict, Hashable, Tuple, Any, Optional
 
 from app.events.subscriptions import EventSubscription
 
 
 logger = logging.getLogger(__name__)
 
+# Subscription and whether its conditions should be checked on dispatch.
+DispatchEntry = Tuple[EventSubscription, bool]
+
+_missing = object()
+
 
 class SubscriptionsStore:
+    """Subscriptions indexed by event type and by value of condition.
+
+    Subscriptions with single condition, like `{"key": pygame.K_a}`, are
+     indexed by value of that event attribute, so KEYDOWN reaches only
+     handlers of its key. All other subscriptions of event type are checked
+     for every event of that type. Dispatched tuples are cached and rebuilt
+     only on changes of subscriptions.
+    """
+
     __store: Dict[int, Dict[str, EventSubscription]]
     __stored_indices: Dict[str, int]  # {subscription.id: event.type}
+    __attributes: Dict[int, str]  # {event.type: dispatch attribute}
+    __indexed: Dict[int, Dict[Hashable, Dict[str, EventSubscription]]]
+    __generic: Dict[int, Dict[str, EventSubscription]]
+    __orders: Dict[str, int]  # {subscription.id: order of adding}
+    __dispatch: Dict[int, Dict[Hashable, Tuple[DispatchEntry, ...]]]
 
     def __init__(self):
         self.__store = defaultdict(dict)
         self.__stored_indices = {}
 
+        self.__attributes = {}
+        self.__indexed = defaultdict(lambda: defaultdict(dict))
+        self.__generic = defaultdict(dict)
+        self.__orders = {}
+        self.__order = 0
+
+        self.__dispatch = {}
+
     def add(self, subscription: EventSubscription) -> None:
         if subscription.id in self.__stored_indices:
             raise KeyError(f"Subscription <{subscription}> already exists.")
@@ -26,16 +53,100 @@ class SubscriptionsStore:
         self.__store[subscription.event_type][subscription.id] = subscription
         self.__stored_indices[subscription.id] = subscription.event_type
 
+        self.__orders[subscription.id] = self.__order
+        self.__order += 1
+
+        values = self.__get_dispatch_values(subscription)
+        if values is None:
+            self.__generic[subscription.event_type][subscription.id] = subscription
+        else:
+            for value in values:
+                self.__indexed[subscription.event_type][value][subscription.id] = subscription
+
+        self.__dispatch.pop(subscription.event_type, None)
+
     def remove(self, subscription_id: str) -> bool:
         if subscription_id not in self.__stored_indices:
             return False
 
         event_type = self.__stored_indices[subscription_id]
+        subscription = self.__store[event_type][subscription_id]
+
+        values = self.__get_dispatch_values(subscription)
+        if values is None:
+            del self.__generic[event_type][subscription_id]
+        else:
+            for value in values:
+                indexed = self.__indexed[event_type][value]
+                del indexed[subscription_id]
+
+                if not indexed:
+                    del self.__indexed[event_type][value]
 
         del self.__store[event_type][subscription_id]
         del self.__stored_indices[subscription_id]
+        del self.__orders[subscription_id]
+
+        self.__dispatch.pop(event_type, None)
 
         return True
 
+    def match(self, event) -> Tuple[DispatchEntry, ...]:
+        """Subscriptions which may handle `event`, in order of subscribing.
+
+        Conditions of entries marked with `True` should be checked, others
+         are matched by the index already. Returned tuple is cached, so it is
+         safe to change subscriptions while iterating over it.
+        """
+
+        attribute = self.__attributes.get(event.type)
+        value = _missing if attribute is None else getattr(event, attribute, _missing)
+
+        try:
+            return self.__dispatch[event.type][value]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable event attribute can't match indexed conditions.
+            value = _missing
+
+        entries = self.__build_entries(event.type, value)
+        self.__dispatch.setdefault(event.type, {})[value] = entries
+
+        return entries
+
+    def __build_entries(self, event_type: int, value: Any) -> Tuple[DispatchEntry, ...]:
+        entries = [(s, True) for s in self.__generic[event_type].values()]
+
+        if value is not _missing and event_type in self.__indexed:
+            indexed = self.__indexed[event_type].get(value, {})
+            entries.extend((s, False) for s in indexed.values())
+
+        entries.sort(key=lambda entry: self.__orders[entry[0].id])
+
+        return tuple(entries)
+
+    def __get_dispatch_values(self, subscription: EventSubscription) -> Optional[Tuple[Hashable, ...]]:
+        """Values to index subscription by, or `None` if it can't be indexed."""
+
+        if len(subscription.conditions) != 1:
+            return None
+
+        (attribute, value), = subscription.conditions.items()
+
+        # Every event type is indexed by one attribute, chosen by the first
+        #  subscription with condition.
+        if self.__attributes.setdefault(subscription.event_type, attribute) != attribute:
+            return None
+
+        values = tuple(value) if isinstance(value, (list, tuple)) else (value,)
+
+        try:
+            hash(values)
+        except TypeError:
+            return None
+
+        return values
+
     def __getitem__(self, event_type):
         return list(self.__store[event_type].values())
@@ -34,11 +34,9 @@ class EventSubscription:
             dict stored in key as attribute name.
         """
 
-        logger.debug(
-            f"Subscribe callback <{callback}> on event_type <{event_type}>."
-        )
-        logger.debug(f"Conditions <{conditions}>.")
-        logger.debug(f"Subtype <{subtype}>")
+        logger.debug("Subscribe callback <%s> on event_type <%s>.", callback, event_type)
+        logger.debug("Conditions <%s>.", conditions)
+        logger.debug("Subtype <%s>", subtype)
 
         index = id(callback)
 
@@ -62,7 +60,7 @@ class EventSubscription:
         try:
             return event.subtype == self.subtype
         except AttributeError:
-            logger.debug(f"Event <{event}> has no subtype of <{self.subtype}>")
+            logger.debug("Event <%s> has no subtype of <%s>", event, self.subtype)
             return False
 
     def check_conditions(self, event):
@@ -70,15 +68,15 @@ class EventSubscription:
             return True
 
         try:
-            return all([
-                self.__check_condition(getattr(event, attr), value)
-                for attr, value in self.conditions.items()
-            ])
+            for attr, value in self.conditions.items():
+                if not self.__check_condition(getattr(event, attr), value):
+                    return False
+
+            return True
         except AttributeError:
             # May be fail try to check some non-existent event attribute.
             logger.debug(
-                f"Check event <{event}> conditions for <{self.conditions}> not"
-                " successful."
+                "Check event <%s> conditions for <%s> not successful.", event, self.conditions
             )
             return False
 
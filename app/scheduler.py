@@ -0,0 +1,166 @@
+import logging
+import time
+
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+from utils.profiler import profiler
+
+
+logger = logging.getLogger(__name__)
+
+
+class FrameScheduler:
+    """Main loop with separated stages of input, update and render.
+
+    Input is handled on every iteration. Update runs with fixed timestep, so
+     geometry doesn't depend on speed of render, and render runs only when
+     something is dirty and not more often than `render_rate`. Between frames
+     the loop sleeps until the next deadline or the next event, so the idle
+     editor doesn't spin.
+
+    Every stage callback should return whether it made something dirty.
+     Update keeps running on its rate while it does, otherwise the loop waits
+     for events, and the first update after waiting runs at once.
+    """
+
+    STAGES = ("input", "update", "render")
+
+    # Steps of update per iteration, the rest of lag is dropped to not fall
+    #  behind forever after a long stall.
+    MAX_UPDATE_STEPS = 5
+
+    # Max time of single wait for events in idle.
+    IDLE_TIMEOUT_MS = 1000
+
+    # Weight of the last frame in smoothed timings.
+    TIMING_SMOOTHING = 0.1
+
+    def __init__(
+            self,
+            handle_input: Callable[[], bool],
+            wait_input: Callable[[int], bool],
+            render: Callable[[], None],
+            update: Optional[Callable[[float], bool]] = None,
+            update_rate: int = 100,
+            render_rate: int = 60
+    ):
+        """
+        :param handle_input: Handles pending events.
+        :param wait_input: Blocks until the next event, but not longer than
+            passed timeout in ms.
+        :param render: Draws the frame.
+        :param update: Advances state on fixed timestep passed in seconds.
+        :param update_rate: Steps of update per second.
+        :param render_rate: Max frames per second.
+        """
+
+        self.__handle_input = handle_input
+        self.__wait_input = wait_input
+        self.__render = render
+        self.__update = update
+
+        self.__update_step = 1.0 / update_rate
+        self.__render_interval = 1.0 / render_rate
+
+        self.__lag = 0.0
+        self.__previous = None
+        self.__last_render = -self.__render_interval
+        self.__dirty = True
+        self.__active = True
+
+        self.timings: Dict[str, float] = dict.fromkeys(self.STAGES, 0.0)
+        self.counters: Dict[str, int] = dict.fromkeys(self.STAGES, 0)
+
+    def invalidate(self):
+        """Force render of the next frame."""
+
+        self.__dirty = True
+
+    def run(self, is_running: Callable[[], bool]):
+        logger.debug("Start main loop.")
+
+        self.__previous = time.perf_counter()
+
+        while is_running():
+            self.step()
+            self.__sleep()
+
+    def step(self):
+        """One iteration of the loop without sleeping."""
+
+        now = time.perf_counter()
+        if self.__previous is None:
+            self.__previous = now
+
+        with self.__measure("input"):
+            handled = bool(self.__handle_input())
+
+        self.__dirty |= handled
+
+        if self.__update is not None:
+            if self.__active:
+                self.__lag += now - self.__previous
+            else:
+                self.__lag = self.__update_step
+
+            self.__active = handled
+
+            steps = 0
+            while self.__lag >= self.__update_step and steps < self.MAX_UPDATE_STEPS:
+                with self.__measure("update"):
+                    updated = bool(self.__update(self.__update_step))
+
+                self.__dirty |= updated
+                self.__active |= updated
+
+                self.__lag -= self.__update_step
+                steps += 1
+
+            if steps == self.MAX_UPDATE_STEPS:
+                self.__lag = 0.0
+
+        self.__previous = now
+
+        if self.__dirty and now - self.__last_render >= self.__render_interval:
+            with self.__measure("render"):
+                self.__render()
+
+            self.__dirty = False
+            self.__last_render = now
+
+            if profiler.enabled:
+                profiler.end_frame()
+
+    def __sleep(self):
+        deadlines = []
+
+        if self.__update is not None and self.__active:
+            deadlines.append(self.__previous + self.__update_step - self.__lag)
+
+        if self.__dirty:
+            deadlines.append(self.__last_render + self.__render_interval)
+
+        if deadlines:
+            timeout = int((min(deadlines) - time.perf_counter()) * 1000)
+        else:
+            # Nothing to do until the next event.
+            timeout = self.IDLE_TIMEOUT_MS
+
+        if timeout > 0:
+            self.__wait_input(timeout)
+
+    @contextmanager
+    def __measure(self, stage: str):
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+
+            self.timings[stage] += (duration - self.timings[stage]) * self.TIMING_SMOOTHING
+            self.counters[stage] += 1
+
+            if profiler.enabled:
+                profiler.add(stage, start, duration)
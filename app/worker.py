@@ -0,0 +1,212 @@
+"""
+Sampling of curves in background thread.
+
+Main thread takes control points of changed curves of deferred bunches and
+ submits them as jobs. The worker samples them by chunks into its own arrays
+ and passes finished chunks back, while curves keep drawing their previous
+ points. Chunks of curves edited again after submitting are skipped, and
+ samples of curves edited while sampling are dropped on applying by versions.
+"""
+
+import logging
+import numpy
+import queue
+import threading
+
+from typing import Callable, Dict, Hashable, List, NamedTuple, Optional
+
+from bezier import BezierCurvesBunch, bunch_controls, flattening_resolution
+from tracks.sampling import BunchSamples, points_offsets, sample_into, split_points
+from utils.profiler import profiler
+
+
+logger = logging.getLogger(__name__)
+
+
+class SamplingJob(NamedTuple):
+    key: Hashable
+    indices: numpy.ndarray  # Indices of curves, `(k,)`.
+    versions: numpy.ndarray  # Versions of curves at submitting, `(k,)`.
+    controls: numpy.ndarray  # Copy of control points, `(k, 4, 2)`.
+    resolutions: numpy.ndarray  # Fixed resolutions of curves, `(k,)`.
+    flatness: Optional[float]
+
+
+class SamplingResult(NamedTuple):
+    key: Hashable
+    indices: numpy.ndarray
+    versions: numpy.ndarray
+    samples: BunchSamples
+
+
+class SamplingWorker:
+    """Thread sampling submitted curves by chunks."""
+
+    CHUNK_SIZE = 4096
+
+    def __init__(self, on_ready: Optional[Callable[[], None]] = None):
+        """
+        :param on_ready: Called from the worker thread, when new results can
+            be taken by `poll`.
+        """
+
+        self.__on_ready = on_ready
+
+        self.__jobs: "queue.Queue[Optional[SamplingJob]]" = queue.Queue()
+        self.__results: List[SamplingResult] = []
+        self.__lock = threading.Lock()
+
+        # The last submitted version of every curve by keys.
+        self.__versions: Dict[Hashable, numpy.ndarray] = {}
+
+        self.__thread = threading.Thread(target=self.__run, name="sampling", daemon=True)
+        self.__thread.start()
+
+    def submit(
+            self,
+            key: Hashable,
+            indices: numpy.ndarray,
+            versions: numpy.ndarray,
+            controls: numpy.ndarray,
+            resolutions: numpy.ndarray,
+            flatness: Optional[float] = None
+    ) -> None:
+        """Sample curves `indices` of `key`, older jobs of them are cancelled."""
+
+        if not len(indices):
+            return
+
+        with self.__lock:
+            latest = self.__versions.get(key, numpy.empty(0, dtype=numpy.int64))
+
+            if indices[-1] >= len(latest):
+                latest = numpy.concatenate([latest, numpy.full(indices[-1] + 1 - len(latest), -1)])
+                self.__versions[key] = latest
+
+            latest[indices] = versions
+
+        self.__jobs.put(SamplingJob(key, indices, versions, controls, resolutions, flatness))
+
+    def submit_bunch(self, bunch: BezierCurvesBunch) -> None:
+        """Submit curves of deferred `bunch` changed since previous call."""
+
+        indices = bunch.take_unsampled_curves()
+        if not indices:
+            return
+
+        versions, resolutions = bunch.curves_state(indices)
+
+        self.submit(
+            bunch,
+            numpy.array(indices, dtype=numpy.int64),
+            versions,
+            bunch_controls(bunch.vertices, indices),
+            resolutions,
+            bunch.flatness
+        )
+
+    def cancel(self, key: Hashable) -> None:
+        """Drop all jobs and results of `key`."""
+
+        with self.__lock:
+            self.__versions.pop(key, None)
+            self.__results = [r for r in self.__results if r.key is not key]
+
+    def poll(self) -> List[SamplingResult]:
+        """Results finished since previous call."""
+
+        with self.__lock:
+            results, self.__results = self.__results, []
+
+        return results
+
+    def apply(self) -> bool:
+        """Pass finished results to their bunches.
+
+        :return: Was any curve updated or not.
+        """
+
+        updated = False
+
+        for result in self.poll():
+            updated |= result.key.apply_samples(
+                result.indices, result.versions, result.samples.curves, result.samples.lengths
+            )
+
+            if profiler.enabled:
+                profiler.count("curves recalculated", len(result.indices))
+
+        return updated
+
+    def close(self) -> None:
+        self.__jobs.put(None)
+        self.__thread.join()
+
+    def __run(self):
+        while True:
+            job = self.__jobs.get()
+            if job is None:
+                return
+
+            for start in range(0, len(job.indices), self.CHUNK_SIZE):
+                chunk = slice(start, start + self.CHUNK_SIZE)
+
+                alive = self.__get_alive(job, chunk)
+                if alive is None:
+                    # All curves of the key are cancelled.
+                    break
+
+                if not alive.any():
+                    continue
+
+                result = self.__sample(
+                    job.key,
+                    job.indices[chunk][alive],
+                    job.versions[chunk][alive],
+                    job.controls[chunk][alive],
+                    job.resolutions[chunk][alive],
+                    job.flatness
+                )
+
+                with self.__lock:
+                    if job.key not in self.__versions:
+                        break
+
+                    self.__results.append(result)
+
+                if self.__on_ready is not None:
+                    self.__on_ready()
+
+    def __get_alive(self, job: SamplingJob, chunk: slice) -> Optional[numpy.ndarray]:
+        """Mask of curves of `chunk`, which weren't submitted again since `job`."""
+
+        with self.__lock:
+            latest = self.__versions.get(job.key)
+            if latest is None:
+                return None
+
+            return latest[job.indices[chunk]] == job.versions[chunk]
+
+    @staticmethod
+    def __sample(
+            key: Hashable,
+            indices: numpy.ndarray,
+            versions: numpy.ndarray,
+            controls: numpy.ndarray,
+            resolutions: numpy.ndarray,
+            flatness: Optional[float]
+    ) -> SamplingResult:
+        if flatness is not None:
+            resolutions = flattening_resolution(controls, flatness)
+
+        offsets = points_offsets(resolutions)
+
+        # New arrays for every chunk, points of applied results are never
+        #  written again.
+        points = numpy.empty((offsets[-1], 2), dtype=numpy.float64)
+        lengths = numpy.empty(len(controls), dtype=numpy.float64)
+        bounds = numpy.empty((len(controls), 4), dtype=numpy.float64)
+
+        sample_into(controls, resolutions, offsets, points, lengths, bounds)
+
+        return SamplingResult(key, indices, versions, BunchSamples(split_points(points, offsets), lengths, bounds))
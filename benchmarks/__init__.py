@@ -0,0 +1,17 @@
+"""
+Headless benchmarks of curve math, event dispatch and render.
+
+Render runs on the dummy SDL video driver, so benchmarks work on servers and
+ in CI. See `python -m benchmarks --help`.
+"""
+
+import os
+
+# Must be set before display is initialised, windows are never shown.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from benchmarks.runner import (
+    BENCHMARKS, Benchmark, Comparison, benchmark, select, measure, run_benchmarks, compare, save_results, load_results
+)
+from benchmarks import cases
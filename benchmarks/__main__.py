@@ -0,0 +1,96 @@
+"""
+Run benchmarks and compare them with baseline.
+
+Usage:
+    python -m benchmarks --save baseline.json
+    python -m benchmarks --compare baseline.json --threshold 0.15
+    python -m benchmarks -k "render|events" --repeat 9
+"""
+
+import argparse
+import re
+import sys
+
+from loguru import logger
+
+from benchmarks import compare, load_results, run_benchmarks, save_results, select
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.split("\n\n")[0])
+
+    parser.add_argument("-k", "--filter", help="Regular expression to select benchmarks by names.")
+    parser.add_argument("-l", "--list", action="store_true", help="List benchmarks and exit.")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="Timed groups of calls per benchmark.")
+    parser.add_argument(
+        "--min-time", type=float, default=0.05,
+        help="Min seconds of every group, calls are grouped to reach it."
+    )
+    parser.add_argument("-s", "--save", help="Write results to JSON file, to use as baseline later.")
+    parser.add_argument("-c", "--compare", help="Baseline JSON file to compare results with.")
+    parser.add_argument(
+        "-t", "--threshold", type=float, default=0.1,
+        help="Relative slowdown of the fastest group to report as regression."
+    )
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    benchmarks = select(args.filter)
+
+    if args.list:
+        for case in benchmarks:
+            print(case.name)
+        return 0
+
+    # Debug logs of curves go to stderr by default and would be timed too.
+    logger.disable("bezier")
+
+    results = run_benchmarks(
+        benchmarks, args.repeat, args.min_time,
+        on_result=lambda name, result: print(
+            f"{name:<60} {format_time(result['min']):>10} {format_time(result['median']):>10}", flush=True
+        )
+    )
+
+    if args.save:
+        save_results(results, args.save)
+
+    if not args.compare:
+        return 0
+
+    baseline = load_results(args.compare)
+    if args.filter:
+        baseline = {name: result for name, result in baseline.items() if re.search(args.filter, name)}
+
+    comparisons = compare(results, baseline, args.threshold)
+
+    print()
+    for comparison in comparisons:
+        if comparison.status in ("new", "missing"):
+            ratio = ""
+        else:
+            ratio = f"{comparison.ratio:.2f}x"
+
+        print(f"{comparison.name:<60} {ratio:>10} {comparison.status}")
+
+    regressions = [c for c in comparisons if c.status == "regression"]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}.", file=sys.stderr)
+        return 1
+
+    return 0
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,264 @@
+"""
+Benchmarks of hot paths of the editor.
+
+Data is generated from fixed seeds, so every run times the same work.
+"""
+
+import numpy
+import pygame
+
+from app import CurveManipulatingMixin
+from app.events import EventManager
+from bezier import BezierCurve, BezierCurvesBunch
+from benchmarks.runner import benchmark
+from render import AppRender
+from render.camera import Camera
+
+
+SEED = 0
+SCREEN_SIZE = 1024, 768
+
+
+def random_vertices(count: int, seed: int = SEED) -> numpy.ndarray:
+    """Vertices of a track wandering over the screen, `(count, 2)`."""
+
+    rng = numpy.random.default_rng(seed)
+
+    steps = rng.normal(0, 40, (count, 2))
+    vertices = numpy.cumsum(steps, axis=0) + numpy.divide(SCREEN_SIZE, 2)
+
+    # Reflect from borders to stay on the screen.
+    vertices = numpy.abs(vertices) % (2 * numpy.array(SCREEN_SIZE))
+    vertices = numpy.where(vertices > SCREEN_SIZE, 2 * numpy.array(SCREEN_SIZE) - vertices, vertices)
+
+    return vertices
+
+
+def bunch_vertices(curves: int, seed: int = SEED) -> numpy.ndarray:
+    return random_vertices(3 * curves + 1, seed)
+
+
+@benchmark("curve.recalculate[{method}, resolution={resolution}]", method=("numpy", "loop"), resolution=(10, 30, 100, 1000))
+def curve_recalculate(method: str, resolution: int):
+    curve = BezierCurve(vertices=random_vertices(4).tolist(), curve_resolution=resolution)
+
+    # The switch is a class attribute, the curve is the only one touched here.
+    vectorized = method == "numpy"
+
+    def target():
+        BezierCurve.vectorized = vectorized
+        try:
+            curve._set_resolution(resolution)
+            curve.points
+        finally:
+            BezierCurve.vectorized = True
+
+    return target
+
+
+@benchmark("curve.recalculate[flatness={flatness}]", flatness=(0.1, 0.5, 2.0))
+def curve_recalculate_adaptive(flatness: float):
+    curve = BezierCurve(vertices=random_vertices(4).tolist(), flatness=flatness)
+
+    def target():
+        curve._set_flatness(flatness)
+        curve.points
+
+    return target
+
+
+@benchmark("bunch.add_vertex[vertices={count}]", count=(100, 1000, 10000))
+def bunch_add_vertex(count: int):
+    vertices = random_vertices(count).tolist()
+
+    def target():
+        bunch = BezierCurvesBunch()
+        for vertex in vertices:
+            bunch.add_vertex(vertex)
+
+    return target
+
+
+@benchmark("bunch.from_vertices[curves={count}]", count=(100, 1000, 10000))
+def bunch_from_vertices(count: int):
+    vertices = bunch_vertices(count)
+
+    def target():
+        bunch = BezierCurvesBunch.from_vertices(vertices, flatness=0.5)
+        for curve in bunch.curves:
+            curve.points
+
+    return target
+
+
+@benchmark("bunch.move_point[curves={count}]", count=(100, 10000))
+def bunch_move_point(count: int):
+    """Dragging of a vertex shared by two curves, with sampling of them."""
+
+    bunch = BezierCurvesBunch.from_vertices(bunch_vertices(count), flatness=0.5)
+    index = 3 * (count // 2)
+    origin = bunch.select_point(index).copy()
+    positions = [origin + (5, 0), origin - (5, 0)]
+
+    def target():
+        positions.reverse()
+        bunch.move_point(positions[0])
+
+        for i in bunch.take_changed_curves():
+            bunch.curves[i].points
+
+    # The first call samples the whole track.
+    target()
+
+    return target
+
+
+@benchmark("bunch.edit_point[curves={count}]", count=(100, 100000))
+def bunch_edit_point(count: int):
+    """Selection, move and commit of a joint of two curves, without sampling."""
+
+    bunch = BezierCurvesBunch.from_vertices(bunch_vertices(count), deferred=True)
+    index = 3 * (count // 2)
+    origin = bunch.vertices[index].copy()
+    positions = [origin + (5, 0), origin - (5, 0)]
+
+    def target():
+        positions.reverse()
+
+        bunch.select_point(index)
+        bunch.move_point(positions[0])
+        bunch.save_point_position()
+
+    return target
+
+
+class _Editor(CurveManipulatingMixin):
+    """Picking of vertices of the app, without display and worker."""
+
+    def __init__(self, curves):
+        self.events = EventManager.__wrapped__()
+        self._curves = curves
+        self.state = {"selected_point": None, "selected_curve": None}
+        self.camera = Camera()
+
+
+@benchmark("editor.select_point[curves={count}, {outcome}]", count=(100, 10000), outcome=("hit", "miss"))
+def editor_select_point(count: int, outcome: str):
+    bunches = [BezierCurvesBunch.from_vertices(bunch_vertices(count // 10, seed)) for seed in range(10)]
+    editor = _Editor(bunches)
+
+    if outcome == "hit":
+        position = tuple(bunches[-1].vertices[len(bunches[-1].vertices) // 2])
+    else:
+        # Far off the screen, vertices never wander there.
+        position = (-1000.0, -1000.0)
+
+    event = pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=position, button=1)
+
+    def target():
+        editor._select_point(event)
+
+        selected = editor.state["selected_curve"]
+        if selected is not None:
+            selected.cancel_point_selection()
+            editor.state["selected_curve"] = None
+
+    # The first call builds indexes of bunches.
+    target()
+
+    return target
+
+
+def _do_nothing():
+    return lambda event: None
+
+
+@benchmark("events.handle_event[subscriptions={count}, {event}]", count=(10, 100, 1000), event=("key", "motion"))
+def events_handle_event(count: int, event: str):
+    events = EventManager.__wrapped__()
+    rng = numpy.random.default_rng(SEED)
+
+    # Mix of subscriptions of the app: keys, mouse buttons and raw events.
+    #  Ids of subscriptions come from callbacks, so every one gets its own.
+    for kind in rng.integers(0, 3, count):
+        callback = _do_nothing()
+
+        if kind == 0:
+            events.subscribe(callback, on_key_down=int(rng.integers(pygame.K_a, pygame.K_z + 1)))
+        elif kind == 1:
+            events.subscribe(callback, on_mouse_button=int(rng.integers(1, 4)))
+        else:
+            events.subscribe(callback, on_event=int(rng.choice([pygame.MOUSEMOTION, pygame.KEYUP])))
+
+    if event == "key":
+        dispatched = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a, mod=0)
+    else:
+        dispatched = pygame.event.Event(pygame.MOUSEMOTION, pos=(10, 10), rel=(1, 1), buttons=(0, 0, 0))
+
+    def target():
+        events._handle_event(dispatched)
+
+    return target
+
+
+@benchmark("render.update[curves={count}, {frame}]", count=(100, 1000), frame=("idle", "drag", "redraw", "pan"))
+def render_update(count: int, frame: str):
+    pygame.display.init()
+    pygame.font.init()
+
+    bunch = BezierCurvesBunch.from_vertices(bunch_vertices(count), flatness=0.5)
+    state = {"mode": "normal", "selected_point": None, "selected_curve": None}
+    render = AppRender(state, Camera())
+
+    render.update([bunch], "")
+
+    index = 3 * (count // 2)
+    origin = bunch.vertices[index].copy()
+    positions = [origin + (5, 0), origin - (5, 0)]
+    offsets = [(1, 0), (-1, 0)]
+
+    if frame == "drag":
+        state["selected_point"] = bunch.select_point(index)
+        state["selected_curve"] = bunch
+
+    def target():
+        if frame == "drag":
+            positions.reverse()
+            bunch.move_point(positions[0])
+        elif frame == "redraw":
+            bunch.set_flatness(0.5)
+        elif frame == "pan":
+            offsets.reverse()
+            render.camera.pan(offsets[0])
+
+        render.update([bunch], "")
+
+    return target
+
+
+@benchmark("render.overview[curves={count}]", count=(10000, 100000))
+def render_overview(count: int):
+    """Whole track zoomed out to fit the screen, rebuilt on every pan."""
+
+    pygame.display.init()
+    pygame.font.init()
+
+    rng = numpy.random.default_rng(SEED)
+
+    # Road-like track far larger than the screen: direction drifts smoothly.
+    heading = numpy.cumsum(rng.normal(0, 0.05, 3 * count + 1))
+    steps = numpy.stack([numpy.cos(heading), numpy.sin(heading)], axis=1) * 30
+    bunch = BezierCurvesBunch.from_vertices(numpy.cumsum(steps, axis=0), flatness=0.5)
+
+    state = {"mode": "normal", "selected_point": None, "selected_curve": None}
+    render = AppRender(state, Camera())
+    render.camera.fit(bunch.bounds, SCREEN_SIZE)
+
+    offsets = [(1, 0), (-1, 0)]
+
+    def target():
+        offsets.reverse()
+        render.camera.pan(offsets[0])
+        render.update([bunch], "")
+
+    return target
@@ -0,0 +1,184 @@
+"""
+Registry, timing and baselines of benchmarks.
+
+Every benchmark is a setup function, which prepares data and returns the
+ callable to time. Setup runs once per case and isn't timed.
+"""
+
+import json
+import numpy
+import platform
+import pygame
+import re
+import statistics
+import time
+
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+
+# Timed callable of a case.
+Target = Callable[[], None]
+
+
+class Benchmark(NamedTuple):
+    name: str
+    setup: Callable[[], Target]
+
+
+class Comparison(NamedTuple):
+    name: str
+    baseline: Optional[float]  # Seconds per call, `None` for new benchmarks.
+    current: Optional[float]  # Seconds per call, `None` for missing ones.
+    status: str  # One of `ok`, `regression`, `improvement`, `new` and `missing`.
+
+    @property
+    def ratio(self) -> Optional[float]:
+        if self.baseline is None or self.current is None:
+            return None
+
+        return self.current / self.baseline
+
+
+BENCHMARKS: List[Benchmark] = []
+
+
+def benchmark(name: str, **params: Iterable):
+    """Register setup function as benchmark, once per combination of `params`.
+
+    Values of params are passed to setup by keywords and formatted into
+     `name`, e.g. `benchmark("curve[{resolution}]", resolution=(10, 30))`.
+    """
+
+    def decorator(setup: Callable[..., Target]):
+        combinations = [{}]
+        for key, values in params.items():
+            combinations = [{**combination, key: value} for combination in combinations for value in values]
+
+        for combination in combinations:
+            BENCHMARKS.append(Benchmark(
+                name.format(**combination),
+                lambda setup=setup, combination=combination: setup(**combination)
+            ))
+
+        return setup
+
+    return decorator
+
+
+def select(pattern: Optional[str] = None) -> List[Benchmark]:
+    """Registered benchmarks with names matching regular expression `pattern`."""
+
+    if pattern is None:
+        return list(BENCHMARKS)
+
+    return [b for b in BENCHMARKS if re.search(pattern, b.name)]
+
+
+def measure(target: Target, repeat: int = 5, min_time: float = 0.05) -> Dict[str, float]:
+    """Time `target` like `timeit`: calls are grouped to last at least `min_time`.
+
+    Groups run while choosing number of calls aren't counted, they warm
+     `target` up too.
+
+    :return: Seconds per call of the fastest and median groups, and calls per
+        group.
+    """
+
+    loops = 1
+    while True:
+        elapsed = _time(target, loops)
+        if elapsed >= min_time:
+            break
+
+        # Aim for the min time at once, but not more than 10x per try.
+        loops *= min(10, max(2, int(min_time / max(elapsed, 1e-9)) + 1))
+
+    timings = [_time(target, loops) / loops for _ in range(repeat)]
+
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "loops": loops,
+        "repeat": repeat,
+    }
+
+
+def run_benchmarks(
+        benchmarks: Iterable[Benchmark],
+        repeat: int = 5,
+        min_time: float = 0.05,
+        on_result: Optional[Callable[[str, Dict[str, float]], None]] = None
+) -> Dict[str, Dict[str, float]]:
+    results = {}
+
+    for case in benchmarks:
+        results[case.name] = measure(case.setup(), repeat, min_time)
+
+        if on_result is not None:
+            on_result(case.name, results[case.name])
+
+    return results
+
+
+def environment() -> Dict[str, str]:
+    """Versions results depend on, saved along with them."""
+
+    return {
+        "python": platform.python_version(),
+        "numpy": numpy.__version__,
+        "pygame": pygame.version.ver,
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+    }
+
+
+def save_results(results: Dict[str, Dict[str, float]], path: str):
+    with open(path, "w") as file:
+        json.dump({"environment": environment(), "results": results}, file, indent=4, sort_keys=True)
+
+
+def load_results(path: str) -> Dict[str, Dict[str, float]]:
+    with open(path) as file:
+        return json.load(file)["results"]
+
+
+def compare(
+        results: Dict[str, Dict[str, float]],
+        baseline: Dict[str, Dict[str, float]],
+        threshold: float = 0.1
+) -> List[Comparison]:
+    """Compare the fastest timings with baseline ones.
+
+    :param threshold: Relative slowdown to report as regression, the same
+        speedup is reported as improvement.
+    """
+
+    comparisons = []
+
+    for name in sorted(set(results) | set(baseline)):
+        before = baseline[name]["min"] if name in baseline else None
+        after = results[name]["min"] if name in results else None
+
+        if before is None:
+            status = "new"
+        elif after is None:
+            status = "missing"
+        elif after > before * (1 + threshold):
+            status = "regression"
+        elif after < before * (1 - threshold):
+            status = "improvement"
+        else:
+            status = "ok"
+
+        comparisons.append(Comparison(name, before, after, status))
+
+    return comparisons
+
+
+def _time(target: Target, loops: int) -> float:
+    start = time.perf_counter()
+
+    for _ in range(loops):
+        target()
+
+    return time.perf_counter() - start
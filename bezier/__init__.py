@@ -0,0 +1,8 @@
+from bezier.arclength import ArcLengthTable, chords_lengths
+from bezier.curves import BezierCurve, BezierCurvesBunch
+from bezier.history import EditHistory, VerticesEdit
+from bezier.evaluation import (
+    evaluate_curve, evaluate_curves, evaluate_bunch, evaluate_at, evaluate_frames, bunch_controls,
+    basis_matrix, step_powers, polynomial_coefficients, flattening_resolution, flatten_curves, flatten_bunch,
+    CurveFrames
+)
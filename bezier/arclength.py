@@ -0,0 +1,113 @@
+"""
+Arc length parameterisation of curves, for traversal with constant speed.
+
+Curves are sampled on uniform steps of `t` and lengths of chords between
+ samples are accumulated along the whole bunch, so parameter of a distance is
+ found by binary search and distance of a parameter is taken by index.
+"""
+
+import numpy
+
+from typing import Sequence
+
+from bezier.evaluation import basis_matrix
+
+
+# Chords per curve, length of chords converges to length of curve
+#  quadratically with their number.
+ARC_LENGTH_STEPS = 32
+
+
+def chords_lengths(controls: numpy.ndarray, steps: int = ARC_LENGTH_STEPS) -> numpy.ndarray:
+    """Lengths of chords between uniform samples of curves.
+
+    :param controls: Control points of shape `(k, 4, 2)`.
+    :return: Array of shape `(k, steps)`.
+    """
+
+    controls = numpy.asarray(controls, dtype=numpy.float64)
+
+    # Coordinates go first to take norms on contiguous memory.
+    coordinates = numpy.matmul(controls.transpose(0, 2, 1), basis_matrix(steps).T)
+    differences = numpy.diff(coordinates, axis=2)
+
+    return numpy.hypot(differences[:, 0], differences[:, 1])
+
+
+class ArcLengthTable:
+    """Cumulative lengths along consecutive curves.
+
+    Parameters `t` are global: integer part is index of curve, fractional one
+     is parameter on it. Distances between samples are interpolated linearly.
+    """
+
+    def __init__(self, controls: numpy.ndarray, steps: int = ARC_LENGTH_STEPS):
+        """
+        :param controls: Control points of shape `(k, 4, 2)`.
+        :param steps: Chords per curve.
+        """
+
+        self.__steps = steps
+        self.__chords = chords_lengths(controls, steps)
+        self.__cumulative = None
+
+    def __len__(self):
+        return len(self.__chords)
+
+    @property
+    def length(self) -> float:
+        """Length of all curves."""
+
+        return float(self.__get_cumulative()[-1])
+
+    @property
+    def lengths(self) -> numpy.ndarray:
+        """Length of every curve, `(k,)`."""
+
+        return self.__chords.sum(axis=1)
+
+    def update(self, indices: Sequence[int], controls: numpy.ndarray) -> None:
+        """Replace lengths of curves `indices` with lengths of `controls`."""
+
+        if len(indices):
+            self.__chords[numpy.asarray(indices)] = chords_lengths(controls, self.__steps)
+            self.__cumulative = None
+
+    def distance_at(self, t: numpy.ndarray) -> numpy.ndarray:
+        """Distances from the start to global parameters `t`."""
+
+        cumulative = self.__get_cumulative()
+
+        position = numpy.clip(numpy.asarray(t, dtype=numpy.float64) * self.__steps, 0, len(cumulative) - 1)
+        index = numpy.minimum(position.astype(numpy.int64), len(cumulative) - 2)
+
+        start = cumulative[index]
+
+        return start + (position - index) * (cumulative[index + 1] - start)
+
+    def t_at(self, distance: numpy.ndarray) -> numpy.ndarray:
+        """Global parameters at `distance` from the start, by binary search."""
+
+        cumulative = self.__get_cumulative()
+
+        distance = numpy.clip(numpy.asarray(distance, dtype=numpy.float64), 0, cumulative[-1])
+        index = numpy.searchsorted(cumulative, distance, side="right") - 1
+        index = numpy.clip(index, 0, len(cumulative) - 2)
+
+        start = cumulative[index]
+        chord = cumulative[index + 1] - start
+
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            fraction = numpy.where(chord > 0, (distance - start) / chord, 0.0)
+
+        return (index + fraction) / self.__steps
+
+    def __get_cumulative(self) -> numpy.ndarray:
+        if not len(self.__chords):
+            raise ValueError("Table has no curves.")
+
+        if self.__cumulative is None:
+            self.__cumulative = numpy.zeros(self.__chords.size + 1, dtype=numpy.float64)
+            numpy.cumsum(self.__chords.ravel(), out=self.__cumulative[1:])
+
+        return self.__cumulative
@@ -0,0 +1,172 @@
+import numpy
+
+from typing import List, Tuple
+
+from bezier.spatial import BoundsType
+
+
+# Bounds of empty node, union with it changes nothing.
+EMPTY_BOUNDS = (numpy.inf, numpy.inf, -numpy.inf, -numpy.inf)
+
+
+class BoundsTree:
+    """Bounding volume hierarchy over bounds of consecutive curves.
+
+    Implicit complete binary tree in one array: leaves hold bounds of curves,
+     every node holds union of its children. Curves of a track go one after
+     another, so neighbouring leaves are close in space too.
+    """
+
+    def __init__(self, bounds: numpy.ndarray = None):
+        bounds = numpy.empty((0, 4)) if bounds is None else numpy.asarray(bounds, dtype=numpy.float64)
+
+        self.__count = len(bounds)
+        self.__capacity = 1
+        while self.__capacity < self.__count:
+            self.__capacity *= 2
+
+        self.__nodes = numpy.empty((2 * self.__capacity, 4), dtype=numpy.float64)
+        self.__nodes[:] = EMPTY_BOUNDS
+        self.__nodes[self.__capacity:self.__capacity + self.__count] = bounds
+
+        self.__build()
+
+    @property
+    def bounds(self) -> BoundsType:
+        """Bounds of all curves together."""
+
+        return tuple(self.__nodes[1].tolist())
+
+    def __len__(self):
+        return self.__count
+
+    def update(self, index: int, bounds: BoundsType) -> None:
+        """Set bounds of leaf, appending new leaves if needed."""
+
+        if index >= self.__capacity:
+            self.__grow(index + 1)
+
+        self.__count = max(self.__count, index + 1)
+
+        node = self.__capacity + index
+        self.__nodes[node] = bounds
+
+        node //= 2
+        while node:
+            self.__nodes[node, :2] = numpy.minimum(self.__nodes[2 * node, :2], self.__nodes[2 * node + 1, :2])
+            self.__nodes[node, 2:] = numpy.maximum(self.__nodes[2 * node, 2:], self.__nodes[2 * node + 1, 2:])
+            node //= 2
+
+    def truncate(self, count: int) -> None:
+        """Drop leaves after the first `count` of them, capacity is kept."""
+
+        if count >= self.__count:
+            return
+
+        start, stop = self.__capacity + count, self.__capacity + self.__count
+        self.__nodes[start:stop] = EMPTY_BOUNDS
+        self.__count = count
+
+        # Only ancestors of dropped leaves are changed, level by level.
+        start, stop = start // 2, (stop - 1) // 2 + 1
+        while start:
+            children = self.__nodes[2 * start:2 * stop].reshape(-1, 2, 4)
+            parents = self.__nodes[start:stop]
+
+            parents[:, :2] = children[:, :, :2].min(axis=1)
+            parents[:, 2:] = children[:, :, 2:].max(axis=1)
+
+            start, stop = start // 2, (stop - 1) // 2 + 1
+
+    def query(self, bounds: BoundsType) -> List[Tuple[int, int]]:
+        """Ranges `[start, stop)` of leaves, which bounds intersect `bounds`.
+
+        Nodes inside of `bounds` are taken as whole ranges without descending.
+        """
+
+        left, top, right, bottom = bounds
+
+        ranges = []
+        stack = [(1, 0, self.__capacity)]
+
+        while stack:
+            node, start, stop = stack.pop()
+            if start >= self.__count:
+                continue
+
+            node_left, node_top, node_right, node_bottom = self.__nodes[node]
+            if node_left > right or node_right < left or node_top > bottom or node_bottom < top:
+                continue
+
+            inside = left <= node_left and node_right <= right and top <= node_top and node_bottom <= bottom
+            if inside or stop - start == 1:
+                stop = min(stop, self.__count)
+
+                if ranges and ranges[-1][1] == start:
+                    ranges[-1] = ranges[-1][0], stop
+                else:
+                    ranges.append((start, stop))
+                continue
+
+            middle = (start + stop) // 2
+            stack.append((2 * node + 1, middle, stop))
+            stack.append((2 * node, start, middle))
+
+        return ranges
+
+    def cut(self, bounds: BoundsType, size: float) -> List[Tuple[int, int]]:
+        """Ranges of leaves, which bounds intersect `bounds`, by nodes smaller than `size`.
+
+        Every range is either a single leaf or a whole node, which width and
+         height are less than `size`. Ranges go in order of leaves and aren't
+         merged, so far zoomed out curves can be drawn by groups.
+        """
+
+        left, top, right, bottom = bounds
+
+        ranges = []
+        stack = [(1, 0, self.__capacity)]
+
+        while stack:
+            node, start, stop = stack.pop()
+            if start >= self.__count:
+                continue
+
+            node_left, node_top, node_right, node_bottom = self.__nodes[node].tolist()
+            if node_left > right or node_right < left or node_top > bottom or node_bottom < top:
+                continue
+
+            small = node_right - node_left < size and node_bottom - node_top < size
+            if small or stop - start == 1:
+                ranges.append((start, min(stop, self.__count)))
+                continue
+
+            middle = (start + stop) // 2
+            stack.append((2 * node + 1, middle, stop))
+            stack.append((2 * node, start, middle))
+
+        return ranges
+
+    def __grow(self, count: int):
+        leaves = self.__nodes[self.__capacity:self.__capacity + self.__count].copy()
+
+        while self.__capacity < count:
+            self.__capacity *= 2
+
+        self.__nodes = numpy.empty((2 * self.__capacity, 4), dtype=numpy.float64)
+        self.__nodes[:] = EMPTY_BOUNDS
+        self.__nodes[self.__capacity:self.__capacity + len(leaves)] = leaves
+
+        self.__build()
+
+    def __build(self):
+        # Every level is union of pairs of the level below.
+        level = self.__capacity
+        while level > 1:
+            children = self.__nodes[level:2 * level].reshape(-1, 2, 4)
+            parents = self.__nodes[level // 2:level]
+
+            parents[:, :2] = children[:, :, :2].min(axis=1)
+            parents[:, 2:] = children[:, :, 2:].max(axis=1)
+
+            level //= 2
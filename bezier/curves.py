@@ -0,0 +1,1056 @@
+"""
+The code from [[here | https://www.drdobbs.com/forward-difference-calculation-of-bezier/184403417?pgno=5]]
+ is taken as a basis for working with bezier curves
+"""
+
+import itertools
+import math
+import numpy
+import pygame
+
+from typing import Callable, Dict, Iterator, Union, List, Optional, Tuple, Set, Sequence
+from loguru import logger
+
+from bezier.arclength import ArcLengthTable
+from bezier.bvh import BoundsTree, EMPTY_BOUNDS
+from bezier.history import EditHistory, VerticesEdit
+from bezier.evaluation import (
+    evaluate_curve, evaluate_bunch, evaluate_at, evaluate_frames, bunch_controls, flattening_resolution,
+    step_powers, CurveFrames
+)
+from bezier.spatial import SpatialGrid, BoundsType, nearest_on_polyline
+from bezier.storage import VertexStorage, VertexType
+from utils.profiler import profiler
+from utils.types import ABCBezierCurve, ABCBezierCurvesBunch
+
+
+class BezierCurvesBunch(ABCBezierCurvesBunch):
+    """List abstraction of bunch of curves.
+
+    To draw a few sequence curves, where the last point previous curve should
+     be the first point of next curve. That class manages that.
+
+    All control points of the bunch are packed in one `VertexStorage` with
+     shape `(3k + 1, 2)` and curves are views over windows of 4 vertices of it.
+
+    Vertices and control polygons of curves are indexed by `SpatialGrid` to
+     pick them by position without scanning the whole bunch, and bounds of
+     curves are kept in `BoundsTree` to find visible ones. Both are built on
+     the first search, grids are filled by numpy at once.
+
+    Curves are kept in `CurveViews`, views of curves loaded by `from_vertices`
+     are created on the first access to them.
+
+    Deferred bunch doesn't sample its curves itself: points are calculated
+     elsewhere, e.g. in background, for curves taken by
+     `take_unsampled_curves` and passed back to `apply_samples`. Curves keep
+     their previous points until then.
+
+    Adding and moving of vertices are recorded to `EditHistory`, if passed.
+    """
+
+    GRID_CELL_SIZE = 64.0
+
+    def __init__(
+            self,
+            flatness: Optional[float] = None,
+            deferred: bool = False,
+            history: Optional[EditHistory] = None
+    ):
+        """
+        :param flatness: Max deviation in pixels of sampled points from the
+            true curve. Curves are sampled adaptively when passed, otherwise
+            with fixed resolution.
+        :param deferred: Don't sample curves on access of their points.
+        :param history: History to record edits to.
+        """
+
+        self.__flatness = flatness
+        self.__deferred = deferred
+        self.__history = history
+        self.__storage = VertexStorage()
+
+        # Versions of all curves of the bunch, so a recreated view never
+        #  repeats a version of the dropped one.
+        self.__versions = itertools.count()
+        # Version of views, which aren't created yet, their vertices are intact.
+        self.__lazy_version = next(self.__versions)
+
+        # Samples of curves, which views aren't created yet.
+        self.__samples: Dict[int, Tuple[numpy.ndarray, float, int]] = {}
+
+        self.curves = CurveViews(self.__create_curve)
+        self.curves.append(self.__new_curve(0))
+
+        self.__vertices_grid: Optional[SpatialGrid] = None
+        self.__curves_grid: Optional[SpatialGrid] = None
+        self.__bounds_tree: Optional[BoundsTree] = None
+
+        self.__arc_length: Optional[ArcLengthTable] = None
+        self.__arc_length_changes: Set[int] = set()
+
+        self.__selected_index = None
+        self.__selected_point = None
+        self.__selected_owners: List[BezierCurve] = []
+        self.__selected_origin: Optional[numpy.ndarray] = None
+
+        self.__changed_curves: Set[int] = set()
+        self.__unsampled_curves: Set[int] = set()
+
+        logger.debug("Create new curves bunch <{}>", self)
+
+    @classmethod
+    def from_vertices(
+            cls,
+            vertices: numpy.ndarray,
+            flatness: Optional[float] = None,
+            deferred: bool = False,
+            history: Optional[EditHistory] = None
+    ) -> "BezierCurvesBunch":
+        """Bunch of packed vertices `(3k + 1, 2)`, as `vertices` stores them.
+
+        Neither views of curves are created, nor their points are calculated
+         until they are requested. Read-only float64 vertices, like ones of
+         mapped binary track, aren't copied until the first edit.
+        """
+
+        bunch = cls(flatness, deferred, history)
+
+        vertices = numpy.asarray(vertices, dtype=numpy.float64).reshape(-1, 2)
+        if vertices.flags.writeable:
+            bunch.__storage.extend(vertices)
+        else:
+            bunch.__storage.share(vertices)
+
+        bunch.curves.extend_lazy(max(0, (len(bunch.vertices) - 2) // 3))
+        bunch.__changed_curves.update(range(len(bunch.curves)))
+        bunch.__unsampled_curves.update(range(len(bunch.curves)))
+
+        return bunch
+
+    @property
+    def vertices(self) -> numpy.ndarray:
+        return self.__storage.array
+
+    @property
+    def flatness(self) -> Optional[float]:
+        return self.__flatness
+
+    def add_vertex(self, vector: VertexType):
+        self.__storage.make_writable()
+
+        size = len(self.vertices)
+        self.__append_vertex(vector)
+
+        self.__record([size], [(numpy.nan, numpy.nan)], [self.vertices[size]], size)
+
+    def __append_vertex(self, vector: VertexType):
+        if len(self.vertices) < 4 or (len(self.vertices) - 4) % 3 != 0:
+            curve = self.curves[-1]
+        else:
+            logger.debug("Add new curve in <{}>.", self)
+
+            # New curve starts from the last vertex of previous one.
+            curve = self.__new_curve(len(self.curves))
+            self.curves.append(curve)
+
+        curve.add_vertex(vector)
+
+        self.__index_vertex(len(self.vertices) - 1)
+        self.__index_curve(len(self.curves) - 1)
+
+        self.__mark_changed(len(self.curves) - 1)
+
+    def __new_curve(self, index: int, version: Optional[int] = None) -> "BezierCurve":
+        return BezierCurve(
+            storage=self.__storage,
+            offset=3 * index,
+            flatness=self.__flatness,
+            deferred=self.__deferred,
+            versions=self.__versions,
+            version=version
+        )
+
+    def __create_curve(self, index: int) -> "BezierCurve":
+        """View of curve `index` appended lazily, with samples waiting for it."""
+
+        curve = self.__new_curve(index, self.__lazy_version)
+
+        samples = self.__samples.pop(index, None)
+        if samples is not None:
+            curve._set_samples(*samples)
+
+        return curve
+
+    def cancel_point_selection(self):
+        for curve in self.__selected_owners:
+            curve.cancel_point_selection()
+            self.__mark_changed(curve.offset // 3)
+
+        self.__reindex_selected()
+
+    def select_point(self, index: int) -> numpy.ndarray:
+        self.__storage.make_writable()
+
+        self.__selected_owners = self.__get_owners(index)
+        for curve in self.__selected_owners:
+            curve.select_point(index - curve.offset)
+
+        self.__selected_index = index
+        self.__selected_point = self.__storage[index]
+        self.__selected_origin = self.__selected_point.copy()
+
+        # Moving vertex can't be picked until its position is committed.
+        if self.__vertices_grid is not None:
+            self.__vertices_grid.remove(index)
+
+        return self.__selected_point
+
+    def move_point(self, position: VertexType) -> bool:
+        """Move selected point, only curves sharing it are recalculated.
+
+        :return: Was the point moved or not.
+        """
+
+        if self.__selected_index is None:
+            return False
+
+        x, y = position
+        if self.__selected_point[0] == x and self.__selected_point[1] == y:
+            return False
+
+        for curve in self.__selected_owners:
+            curve.move_point(position)
+            self.__mark_changed(curve.offset // 3)
+
+        return True
+
+    def save_point_position(self):
+        for curve in self.__selected_owners:
+            curve.save_point_position()
+
+        if not numpy.array_equal(self.__selected_origin, self.__selected_point):
+            self.__record(
+                [self.__selected_index],
+                [self.__selected_origin],
+                [self.__selected_point.copy()],
+                len(self.vertices)
+            )
+
+        self.__reindex_selected()
+
+    def _restore(self, indices: Sequence[int], values: numpy.ndarray, size: int):
+        """Set vertices `indices` to `values` and number of vertices to `size`.
+
+        Vertices after `size` are removed and indices after the last vertex
+         are appended. Used by history and not recorded to it.
+        """
+
+        self.__storage.make_writable()
+
+        if size < len(self.vertices):
+            self.__truncate(size)
+
+        for index, value in zip(indices, values):
+            if index < len(self.vertices):
+                self.__set_vertex(index, value)
+            elif index < size:
+                self.__append_vertex(value)
+
+    def __set_vertex(self, index: int, value: VertexType):
+        self.__storage[index] = value
+
+        self.__index_vertex(index)
+        for curve in self.__get_owners(index):
+            curve._vertices_changed()
+
+            self.__index_curve(curve.offset // 3)
+            self.__mark_changed(curve.offset // 3)
+
+    def __truncate(self, size: int):
+        count = len(self.vertices)
+        self.__storage.truncate(size)
+
+        if self.__vertices_grid is not None:
+            for index in range(size, count):
+                self.__vertices_grid.remove(index)
+
+        # The last curve keeps at least its first vertex, except the first one.
+        while len(self.curves) > 1 and len(self.curves[-1].vertices) < 2:
+            self.curves.pop()
+            self.__changed_curves.add(len(self.curves))
+            self.__samples.pop(len(self.curves), None)
+
+            if self.__curves_grid is not None:
+                self.__curves_grid.remove(len(self.curves))
+
+        if self.__bounds_tree is not None:
+            self.__bounds_tree.truncate(len(self.curves))
+
+        self.curves[-1]._vertices_changed()
+        self.__index_curve(len(self.curves) - 1)
+        self.__mark_changed(len(self.curves) - 1)
+
+    def __record(self, indices: Sequence[int], before, after, size_before: int):
+        if self.__history is None:
+            return
+
+        self.__history.push(VerticesEdit(
+            self,
+            numpy.array(indices, dtype=numpy.int64),
+            numpy.array(before, dtype=numpy.float64).reshape(-1, 2),
+            numpy.array(after, dtype=numpy.float64).reshape(-1, 2),
+            size_before,
+            len(self.vertices)
+        ))
+
+    def find_vertex(
+            self,
+            position: Tuple[float, float],
+            radius: float
+    ) -> Optional[int]:
+        """Index of the nearest to `position` vertex within `radius`.
+
+        Radius of far zoomed out view covers lots of cells of the grid, then
+         all vertices are checked at once instead.
+        """
+
+        self.__build_index()
+
+        x, y = position
+        area = x - radius, y - radius, x + radius, y + radius
+
+        if self.__vertices_grid.count_cells(area) > len(self.vertices):
+            candidates = numpy.arange(len(self.vertices))
+            if self.__selected_index is not None:
+                candidates = numpy.delete(candidates, self.__selected_index)
+        else:
+            candidates = list(self.__vertices_grid.query(area))
+
+        if not len(candidates):
+            return None
+
+        distances = numpy.linalg.norm(self.vertices[candidates] - (x, y), axis=1)
+        nearest = int(numpy.argmin(distances))
+
+        return int(candidates[nearest]) if distances[nearest] <= radius else None
+
+    def find_point_on_curve(
+            self,
+            position: Tuple[float, float],
+            radius: float
+    ) -> Optional[Tuple[int, numpy.ndarray]]:
+        """Index of curve and the nearest to `position` point on it within `radius`.
+
+        Point is searched on sampled `points` of curves, which control polygon
+         is near enough to `position`.
+        """
+
+        self.__build_index()
+
+        x, y = position
+        area = x - radius, y - radius, x + radius, y + radius
+        found = None
+
+        if self.__curves_grid.count_cells(area) > len(self.curves):
+            candidates = [index for curves in self.find_curves(area) for index in curves]
+        else:
+            candidates = self.__curves_grid.query(area)
+
+        for index in candidates:
+            curve = self.curves[index]
+            if not len(curve.points):
+                continue
+
+            point, distance = nearest_on_polyline(curve.points, position)
+            if distance <= radius:
+                radius = distance
+                found = index, point
+
+        return found
+
+    @property
+    def bounds(self) -> BoundsType:
+        """Bounds of all curves of the bunch."""
+
+        return self.__get_bounds_tree().bounds
+
+    def find_curves(self, bounds: BoundsType) -> List[range]:
+        """Ranges of indices of curves, which bounds intersect `bounds`."""
+
+        return [range(start, stop) for start, stop in self.__get_bounds_tree().query(bounds)]
+
+    def find_curves_groups(self, bounds: BoundsType, size: float) -> List[range]:
+        """Ranges of curves intersecting `bounds`, grouped while smaller than `size`.
+
+        Every range is a single curve, or consecutive curves which fit in
+         square of `size` together, see `BoundsTree.cut`.
+        """
+
+        return [range(start, stop) for start, stop in self.__get_bounds_tree().cut(bounds, size)]
+
+    @property
+    def arc_length(self) -> ArcLengthTable:
+        """Cumulative lengths of complete curves, updated on access after changes."""
+
+        count = (len(self.vertices) - 1) // 3
+
+        if self.__arc_length is None or len(self.__arc_length) != count:
+            self.__arc_length = ArcLengthTable(bunch_controls(self.vertices))
+        elif self.__arc_length_changes:
+            indices = sorted(self.__arc_length_changes)
+            self.__arc_length.update(indices, bunch_controls(self.vertices, indices))
+
+        self.__arc_length_changes = set()
+
+        return self.__arc_length
+
+    def point_at_distance(self, distance: numpy.ndarray) -> numpy.ndarray:
+        """Points at `distance` along the bunch from its start, `distance.shape + (2,)`."""
+
+        return evaluate_at(self.vertices, self.arc_length.t_at(distance))
+
+    def distance_at(self, t: numpy.ndarray) -> numpy.ndarray:
+        """Distances along the bunch to global parameters `t`.
+
+        Integer part of `t` is index of curve, fractional one is parameter on it.
+        """
+
+        return self.arc_length.distance_at(t)
+
+    def points_at(self, t: numpy.ndarray) -> numpy.ndarray:
+        """Points of the bunch at global parameters `t`, `t.shape + (2,)`."""
+
+        return evaluate_at(self.vertices, t)
+
+    def frames_at(self, t: numpy.ndarray) -> CurveFrames:
+        """Points, derivatives, normals and curvature at global parameters `t`."""
+
+        return evaluate_frames(self.vertices, t)
+
+    def frames_at_distance(self, distance: numpy.ndarray) -> CurveFrames:
+        """Points, derivatives, normals and curvature at `distance` from the start."""
+
+        return evaluate_frames(self.vertices, self.arc_length.t_at(distance))
+
+    def curves_state(self, indices: Sequence[int]) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """Versions and resolutions of curves `indices`, views aren't created for it.
+
+        Views not created yet have the version they'll be created with and
+         the default resolution.
+        """
+
+        versions = numpy.full(len(indices), self.__lazy_version, dtype=numpy.int64)
+        resolutions = numpy.full(len(indices), BezierCurve.DEFAULT_RESOLUTION, dtype=numpy.int64)
+
+        for i, index in enumerate(indices):
+            curve = self.curves.peek(index)
+            if curve is not None:
+                versions[i] = curve.version
+                resolutions[i] = curve.resolution
+
+        return versions, resolutions
+
+    def take_changed_curves(self) -> Set[int]:
+        """Indices of curves changed since previous call."""
+
+        changed, self.__changed_curves = self.__changed_curves, set()
+
+        return changed
+
+    def take_unsampled_curves(self) -> List[int]:
+        """Sorted indices of complete curves changed since previous call.
+
+        Incomplete curve is kept until it gets all its vertices.
+        """
+
+        complete = (len(self.vertices) - 1) // 3
+
+        unsampled = sorted(i for i in self.__unsampled_curves if i < complete)
+        self.__unsampled_curves.difference_update(unsampled)
+
+        return unsampled
+
+    def apply_samples(
+            self,
+            indices: Sequence[int],
+            versions: Sequence[int],
+            points: Sequence[numpy.ndarray],
+            lengths: Sequence[float]
+    ) -> bool:
+        """Set points of curves sampled elsewhere.
+
+        Samples of curves changed after `versions` were taken are outdated
+         and dropped. Views of curves aren't created for it, samples wait for
+         them in the bunch. Changed curve always has its view, so waiting
+         samples are never outdated, and versions are unique in the bunch, so
+         samples of a dropped view don't match the recreated one.
+
+        :return: Was any curve updated or not.
+        """
+
+        updated = False
+
+        for index, version, curve_points, length in zip(indices, versions, points, lengths):
+            if index >= len(self.curves):
+                continue
+
+            curve = self.curves.peek(index)
+            if curve is None:
+                if version != self.__lazy_version:
+                    continue
+
+                self.__samples[index] = curve_points, length, version
+            elif not curve._set_samples(curve_points, length, version):
+                continue
+
+            self.__changed_curves.add(index)
+            updated = True
+
+        return updated
+
+    def __reindex_selected(self):
+        self.__index_vertex(self.__selected_index)
+        for curve in self.__selected_owners:
+            self.__index_curve(curve.offset // 3)
+
+        self.__selected_index = None
+        self.__selected_point = None
+        self.__selected_owners = []
+        self.__selected_origin = None
+
+    def __build_index(self):
+        if self.__vertices_grid is not None:
+            return
+
+        self.__vertices_grid = SpatialGrid(self.GRID_CELL_SIZE)
+        self.__curves_grid = SpatialGrid(self.GRID_CELL_SIZE)
+
+        indices = numpy.arange(len(self.vertices))
+        if self.__selected_index is not None:
+            indices = numpy.delete(indices, self.__selected_index)
+
+        self.__vertices_grid.extend(indices, numpy.tile(self.vertices[indices], 2))
+
+        # Complete curves at once, the incomplete tail one by one.
+        controls = bunch_controls(self.vertices)
+        self.__curves_grid.extend(
+            numpy.arange(len(controls)),
+            numpy.concatenate([controls.min(axis=1), controls.max(axis=1)], axis=1)
+        )
+
+        for index in range(len(controls), len(self.curves)):
+            self.__index_curve(index)
+
+    def __index_vertex(self, index: int):
+        if self.__vertices_grid is None:
+            return
+
+        x, y = self.vertices[index]
+        self.__vertices_grid.insert(index, (x, y, x, y))
+
+    def __index_curve(self, index: int):
+        if self.__curves_grid is None:
+            return
+
+        if self.curves[index].bounds is None:
+            self.__curves_grid.remove(index)
+        else:
+            self.__curves_grid.insert(index, self.curves[index].bounds)
+
+    def __get_bounds_tree(self) -> BoundsTree:
+        if self.__bounds_tree is None:
+            bounds = numpy.empty((len(self.curves), 4), dtype=numpy.float64)
+            bounds[:] = EMPTY_BOUNDS
+
+            controls = bunch_controls(self.vertices)
+            bounds[:len(controls), :2] = controls.min(axis=1)
+            bounds[:len(controls), 2:] = controls.max(axis=1)
+
+            # Incomplete tail curve.
+            for index in range(len(controls), len(self.curves)):
+                bounds[index] = self.curves[index].bounds or EMPTY_BOUNDS
+
+            self.__bounds_tree = BoundsTree(bounds)
+
+        return self.__bounds_tree
+
+    def __mark_changed(self, index: int):
+        self.__changed_curves.add(index)
+        self.__unsampled_curves.add(index)
+
+        if self.__bounds_tree is not None:
+            self.__bounds_tree.update(index, self.curves[index].bounds or EMPTY_BOUNDS)
+
+        if self.__arc_length is not None and index < len(self.__arc_length):
+            self.__arc_length_changes.add(index)
+
+    def __get_owners(self, index: int) -> List["BezierCurve"]:
+        """Curves of vertex `index`, two for joint of curves, one for others.
+
+        Curve `k` owns vertices from `3k` to `3k + 3`, so owners are found
+         by index without scanning curves.
+        """
+
+        curve = index // 3
+        owners = [self.curves[curve - 1]] if index % 3 == 0 and curve > 0 else []
+
+        if curve < len(self.curves) and index - 3 * curve < len(self.curves[curve].vertices):
+            owners.append(self.curves[curve])
+
+        return owners
+
+    def set_flatness(self, tolerance: Optional[float]):
+        """Switch all curves on adaptive sampling, or back if `None` passed.
+
+        Curves switched back are sampled with the default fixed resolution
+         again, as new curves of the bunch are.
+        """
+
+        self.__flatness = tolerance
+
+        for index, curve in enumerate(self.curves):
+            if tolerance is None:
+                curve._set_resolution(BezierCurve.DEFAULT_RESOLUTION)
+            else:
+                curve._set_flatness(tolerance)
+
+            self.__mark_changed(index)
+
+    def evaluate(self, resolution: int = 30) -> numpy.ndarray:
+        """Points of all complete curves of the bunch as one polyline."""
+
+        return evaluate_bunch(self.vertices, resolution)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}> with {len(self.vertices)}"
+
+
+class BezierCurve(ABCBezierCurve):
+    """Lightweight view over window of 4 vertices in `VertexStorage`.
+
+    Curve without passed storage owns the new one.
+    """
+
+    __slots__ = (
+        "__points",
+        "__storage",
+        "__offset",
+        "__curve_resolution",
+        "__step_size",
+        "__step_powers",
+        "__coefs",
+        "__flatness",
+        "__changed",
+        "__deferred",
+        "__versions",
+        "__version",
+        "__length",
+        "__arc_length",
+        "__levels",
+        "__bounds",
+        "__selected_index",
+        "__old_point_position",
+    )
+
+    # Use numpy evaluation instead of forward differences loop. The loop is
+    #  kept as fallback and as reference implementation.
+    vectorized = True
+
+    # Max resolution of levels of detail, see `level_points`.
+    MAX_LEVEL_RESOLUTION = 1024
+    DEFAULT_RESOLUTION = 30
+
+    def __init__(
+            self,
+            vertices: list = None,
+            curve_resolution: int = DEFAULT_RESOLUTION,
+            storage: Optional[VertexStorage] = None,
+            offset: int = 0,
+            flatness: Optional[float] = None,
+            deferred: bool = False,
+            versions: Optional[Iterator[int]] = None,
+            version: Optional[int] = None
+    ):
+        """
+        :param curve_resolution: Number of steps to sample curve.
+        :param storage: Storage of vertices shared with other curves.
+        :param offset: Index of the first vertex of the curve in `storage`.
+        :param flatness: Max deviation in pixels of sampled points from the
+            true curve. When passed, resolution is chosen adaptively on each
+            recalculation instead of `curve_resolution`.
+        :param deferred: Don't recalculate points on access, they are set
+            by `_set_samples` instead.
+        :param versions: Source of versions shared with other curves.
+        :param version: Initial version, the next one from `versions` by default.
+        """
+
+        self.__storage = storage if storage is not None else VertexStorage(4)
+        self.__offset = offset
+        self.__points: Union[numpy.ndarray, List[pygame.Vector2]] = []
+        self.__bounds: Optional[BoundsType] = None
+        self.__length: Optional[float] = None
+        self.__arc_length: Optional[ArcLengthTable] = None
+        self.__levels: Dict[int, numpy.ndarray] = {}
+        self.__coefs: Optional[Tuple[pygame.Vector2, ...]] = None
+
+        self.__deferred = deferred
+        self.__versions = versions if versions is not None else itertools.count()
+        self.__version = 0
+
+        self.__selected_index: Optional[int] = None
+        self.__old_point_position: Optional[numpy.ndarray] = None
+
+        for vertex in vertices or []:
+            self.add_vertex(vertex)
+
+        self._set_resolution(curve_resolution)
+        self._set_flatness(flatness)
+
+        if version is not None:
+            self.__version = version
+
+    @property
+    def vertices(self) -> numpy.ndarray:
+        return self.__storage.array[self.__offset:self.__offset + 4]
+
+    @property
+    def bounds(self) -> Optional[BoundsType]:
+        """Bounds of control points, the curve lies inside their convex hull.
+
+        `None` for the curve without vertices.
+        """
+
+        if self.__bounds is None and len(self.vertices):
+            left, top = self.vertices.min(axis=0).tolist()
+            right, bottom = self.vertices.max(axis=0).tolist()
+
+            self.__bounds = left, top, right, bottom
+
+        return self.__bounds
+
+    @property
+    def points(self) -> Union[numpy.ndarray, List[pygame.Vector2]]:
+        """Sampled points, recalculated on the first access after changes.
+
+        Deferred curve returns the last set points.
+        """
+
+        if self.__changed and not self.__deferred and len(self.vertices) == 4:
+            self.__recalculate()
+            self.__changed = False
+
+        return self.__points
+
+    def level_points(self, resolution: float) -> numpy.ndarray:
+        """Points of level of detail with at least `resolution` steps.
+
+        Levels are sampled with power of two steps up to
+         `MAX_LEVEL_RESOLUTION` and cached until vertices change, so render
+         can pick coarse points for small curves on screen and fine ones for
+         zoomed in curves.
+        """
+
+        level = 1 << max(0, math.ceil(math.log2(max(resolution, 1))))
+        level = min(level, self.MAX_LEVEL_RESOLUTION)
+
+        points = self.__levels.get(level)
+        if points is None:
+            points = self.__levels[level] = evaluate_curve(self.vertices, level)
+
+        return points
+
+    @property
+    def length(self) -> float:
+        """Length of polyline of sampled points."""
+
+        if self.__length is None:
+            points = numpy.asarray(self.points, dtype=numpy.float64).reshape(-1, 2)
+            self.__length = float(numpy.linalg.norm(numpy.diff(points, axis=0), axis=1).sum())
+
+        return self.__length
+
+    @property
+    def arc_length(self) -> ArcLengthTable:
+        """Cumulative lengths along the curve, rebuilt on access after changes."""
+
+        if self.__arc_length is None:
+            self.__arc_length = ArcLengthTable(bunch_controls(self.vertices))
+
+        return self.__arc_length
+
+    def point_at_distance(self, distance: numpy.ndarray) -> numpy.ndarray:
+        """Points at `distance` along the curve from its start, `distance.shape + (2,)`."""
+
+        return evaluate_at(self.vertices, self.arc_length.t_at(distance))
+
+    def distance_at(self, t: numpy.ndarray) -> numpy.ndarray:
+        """Distances along the curve to parameters `t`."""
+
+        return self.arc_length.distance_at(t)
+
+    def points_at(self, t: numpy.ndarray) -> numpy.ndarray:
+        """Points of the curve at parameters `t` in [0, 1], `t.shape + (2,)`."""
+
+        return evaluate_at(self.vertices, t)
+
+    def frames_at(self, t: numpy.ndarray) -> CurveFrames:
+        """Points, derivatives, normals and curvature at parameters `t` in [0, 1]."""
+
+        return evaluate_frames(self.vertices, t)
+
+    def frames_at_distance(self, distance: numpy.ndarray) -> CurveFrames:
+        """Points, derivatives, normals and curvature at `distance` from the start."""
+
+        return evaluate_frames(self.vertices, self.arc_length.t_at(distance))
+
+    @property
+    def version(self) -> int:
+        """Number of changes of the curve, to match samples calculated elsewhere."""
+
+        return self.__version
+
+    @property
+    def offset(self) -> int:
+        """Index of the first vertex of the curve in storage."""
+
+        return self.__offset
+
+    def add_vertex(self, vertex: VertexType):
+        if len(self.vertices) < 4:
+            self.__storage.append(vertex)
+            self.__invalidate_vertices()
+
+    def select_point(self, index: int) -> numpy.ndarray:
+        self.__selected_index = index
+        self.__old_point_position = self.vertices[index].copy()
+
+        return self.vertices[index]
+
+    def move_point(self, position: VertexType):
+        """Move selected point to `position`."""
+
+        if self.__selected_index is not None:
+            self.vertices[self.__selected_index] = position
+            self.__invalidate_vertices()
+
+    def _vertices_changed(self):
+        """Vertices were changed in storage directly."""
+
+        self.__invalidate_vertices()
+
+    def save_point_position(self):
+        self.__selected_index = None
+        self.__old_point_position = None
+
+    def cancel_point_selection(self):
+        self.vertices[self.__selected_index] = self.__old_point_position
+
+        self.__selected_index = None
+        self.__old_point_position = None
+
+        self.__invalidate_vertices()
+
+    def _set_samples(self, points: numpy.ndarray, length: float, version: int) -> bool:
+        """Set points sampled elsewhere, if the curve isn't changed since `version`.
+
+        :return: Were points set or not.
+        """
+
+        if version != self.__version:
+            return False
+
+        self.__set_step(len(points) - 1)
+        self.__points = points
+        self.__length = length
+        self.__changed = False
+
+        return True
+
+    def __recalculate(self):
+        if profiler.enabled:
+            profiler.count("curves recalculated")
+
+        if self.__flatness is not None:
+            self.__set_step(int(flattening_resolution(self.vertices, self.__flatness)))
+
+        if self.vectorized:
+            self.__points = evaluate_curve(self.vertices, self.__curve_resolution)
+        else:
+            self.__recalculate_forward_differences()
+
+    def __recalculate_forward_differences(self):
+        self.__points = []
+
+        point, first_FD, second_FD, third_FD = self.__get_forward_differences()
+
+        # Compute points at each step
+        self.__points.append(pygame.Vector2(point.x, point.y))
+
+        for i in range(self.__curve_resolution):
+            point.x += first_FD.x
+            point.y += first_FD.y
+
+            first_FD.x += second_FD.x
+            first_FD.y += second_FD.y
+
+            second_FD.x += third_FD.x
+            second_FD.y += third_FD.y
+
+            self.__points.append(pygame.Vector2(point))
+
+    def __get_polynomial_coefs(self):
+        if self.__coefs is None:
+            self.__coefs = self.__calculate_polynomial_coefs()
+
+        return self.__coefs
+
+    def __calculate_polynomial_coefs(self):
+        vertices = self.vertices
+
+        # Compute polynomial coefficients from Bezier points
+        ax = -vertices[0][0] + 3 * vertices[1][0] + -3 * vertices[2][0] + vertices[3][0]
+        ay = -vertices[0][1] + 3 * vertices[1][1] + -3 * vertices[2][1] + vertices[3][1]
+
+        bx = 3 * vertices[0][0] + -6 * vertices[1][0] + 3 * vertices[2][0]
+        by = 3 * vertices[0][1] + -6 * vertices[1][1] + 3 * vertices[2][1]
+
+        cx = -3 * vertices[0][0] + 3 * vertices[1][0]
+        cy = -3 * vertices[0][1] + 3 * vertices[1][1]
+
+        dx = vertices[0][0]
+        dy = vertices[0][1]
+
+        return pygame.Vector2(ax, ay), pygame.Vector2(bx, by), \
+               pygame.Vector2(cx, cy), pygame.Vector2(dx, dy)
+
+    def __get_forward_differences(self):
+        a, b, c, d = self.__get_polynomial_coefs()
+
+        # Compute forward differences from Bezier points and "h"
+        pointX = d.x
+        pointY = d.y
+
+        step, step_2, step_3 = self.__step_powers
+
+        firstFDX = a.x * step_3 + b.x * step_2 + c.x * step
+        firstFDY = a.y * step_3 + b.y * step_2 + c.y * step
+
+        secondFDX = 6 * a.x * step_3 + 2 * b.x * step_2
+        secondFDY = 6 * a.y * step_3 + 2 * b.y * step_2
+
+        thirdFDX = 6 * a.x * step_3
+        thirdFDY = 6 * a.y * step_3
+
+        return pygame.Vector2(pointX, pointY), pygame.Vector2(firstFDX, firstFDY), \
+               pygame.Vector2(secondFDX, secondFDY), pygame.Vector2(thirdFDX, thirdFDY)
+
+    @property
+    def _step_size(self):
+        return self.__step_size
+
+    @property
+    def resolution(self) -> int:
+        """Number of steps the curve was sampled with."""
+
+        return self.__curve_resolution
+
+    def _set_resolution(self, value):
+        self.__set_step(value)
+        self.__flatness = None
+
+        self.__invalidate()
+
+    def _set_flatness(self, tolerance: Optional[float]):
+        """Choose resolution adaptively to keep points within `tolerance`.
+
+        Passing `None` keeps the current resolution fixed.
+        """
+
+        self.__flatness = tolerance
+
+        self.__invalidate()
+
+    def __invalidate(self):
+        """Points should be recalculated, after change of resolution."""
+
+        self.__changed = True
+        self.__version = next(self.__versions)
+        self.__length = None
+
+    def __invalidate_vertices(self):
+        """All derived from vertices should be recalculated."""
+
+        self.__invalidate()
+        self.__arc_length = None
+        self.__levels = {}
+        self.__bounds = None
+        self.__coefs = None
+
+        # Incomplete curve has no points, e.g. after undo of adding vertex.
+        if len(self.vertices) < 4:
+            self.__points = []
+
+    def __set_step(self, resolution: int):
+        self.__curve_resolution = resolution
+        self.__step_powers = step_powers(resolution)
+        self.__step_size = self.__step_powers[0]
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}> {str(self.vertices.tolist())} at <{id(self)}>"
+
+
+class CurveViews:
+    """List of curves of a bunch, which views are created on the first access.
+
+    Views of all curves of a large loaded track cost more than their vertices,
+     and most of them are never drawn or edited.
+    """
+
+    __slots__ = ("__views", "__create")
+
+    def __init__(self, create: Callable[[int], BezierCurve]):
+        """
+        :param create: Creates view of curve by its index.
+        """
+
+        self.__views: List[Optional[BezierCurve]] = []
+        self.__create = create
+
+    def append(self, curve: BezierCurve) -> None:
+        self.__views.append(curve)
+
+    def extend_lazy(self, count: int) -> None:
+        """Append `count` curves, which views are created on access."""
+
+        self.__views.extend([None] * count)
+
+    def pop(self) -> None:
+        """Drop the last curve."""
+
+        self.__views.pop()
+
+    def peek(self, index: int) -> Optional[BezierCurve]:
+        """View of curve `index`, if it is created already."""
+
+        return self.__views[index]
+
+    def __getitem__(self, index: int) -> BezierCurve:
+        view = self.__views[index]
+
+        if view is None:
+            index = range(len(self.__views))[index]
+            view = self.__views[index] = self.__create(index)
+
+        return view
+
+    def __iter__(self) -> Iterator[BezierCurve]:
+        for index in range(len(self.__views)):
+            yield self[index]
+
+    def __len__(self):
+        return len(self.__views)
+
+    def __repr__(self):
+        created = sum(view is not None for view in self.__views)
+        return f"<{self.__class__.__name__}> with {len(self.__views)}, {created} created"
@@ -0,0 +1,247 @@
+"""
+Vectorized evaluation of cubic bezier curves.
+
+All samples of a curve (or of many curves at once) are computed with a single
+ matrix product against the bernstein basis, instead of the forward differences
+ loop used by `BezierCurve`.
+"""
+
+import numpy
+
+from functools import lru_cache
+from typing import Sequence, Union, List, Optional, NamedTuple, Tuple
+
+
+# Maps control points on polynomial coefficients `a, b, c, d`, the same way as
+#  `BezierCurve.__get_polynomial_coefs` does.
+POLYNOMIAL_MATRIX = numpy.array([
+    [-1, 3, -3, 1],
+    [3, -6, 3, 0],
+    [-3, 3, 0, 0],
+    [1, 0, 0, 0],
+], dtype=numpy.float64)
+
+VerticesType = Union[numpy.ndarray, Sequence[Sequence[float]]]
+
+# Upper bound of steps for adaptive flattening of degenerate huge curves.
+MAX_RESOLUTION = 1024
+
+# Number of the last used resolutions, which tables are kept.
+TABLES_CACHE_SIZE = 64
+
+
+@lru_cache(maxsize=TABLES_CACHE_SIZE)
+def basis_matrix(resolution: int) -> numpy.ndarray:
+    """Basis of shape `(resolution + 1, 4)` for uniform steps of `t` in [0, 1].
+
+    Multiplying it on control points of shape `(4, 2)` gives curve points.
+    Matrix is shared by all callers with the same resolution, so it is
+     read-only.
+    """
+
+    t = numpy.linspace(0.0, 1.0, resolution + 1)
+    powers = numpy.stack([t ** 3, t ** 2, t, numpy.ones_like(t)], axis=1)
+
+    basis = powers @ POLYNOMIAL_MATRIX
+    basis.setflags(write=False)
+
+    return basis
+
+
+@lru_cache(maxsize=TABLES_CACHE_SIZE)
+def step_powers(resolution: int) -> Tuple[float, float, float]:
+    """Powers `h, h ** 2, h ** 3` of step `h` of `t` for forward differences."""
+
+    step = 1.0 / resolution
+
+    return step, step ** 2, step ** 3
+
+
+def evaluate_curve(vertices: VerticesType, resolution: int) -> numpy.ndarray:
+    """Points of one curve as contiguous array of shape `(resolution + 1, 2)`."""
+
+    controls = numpy.asarray(vertices, dtype=numpy.float64).reshape(4, 2)
+
+    return basis_matrix(resolution) @ controls
+
+
+def evaluate_curves(controls: numpy.ndarray, resolution: int) -> numpy.ndarray:
+    """Points of many curves at once.
+
+    :param controls: Control points of shape `(k, 4, 2)`.
+    :return: Array of shape `(k, resolution + 1, 2)`.
+    """
+
+    controls = numpy.asarray(controls, dtype=numpy.float64)
+
+    return numpy.matmul(basis_matrix(resolution), controls)
+
+
+class CurveFrames(NamedTuple):
+    points: numpy.ndarray  # Positions, `(..., 2)`.
+    derivatives: numpy.ndarray  # First derivatives by `t`, `(..., 2)`.
+    normals: numpy.ndarray  # Unit normals, left of direction of curve, `(..., 2)`.
+    curvature: numpy.ndarray  # Signed curvature, `(...)`.
+
+
+def polynomial_coefficients(controls: numpy.ndarray) -> numpy.ndarray:
+    """Coefficients `a, b, c, d` of `a * t ** 3 + b * t ** 2 + c * t + d`.
+
+    :param controls: Control points of shape `(..., 4, 2)`.
+    :return: Array of the same shape.
+    """
+
+    return numpy.matmul(POLYNOMIAL_MATRIX, numpy.asarray(controls, dtype=numpy.float64))
+
+
+def evaluate_at(vertices: VerticesType, t: numpy.ndarray) -> numpy.ndarray:
+    """Points of a bunch at global parameters `t`.
+
+    Integer part of `t` is index of curve and fractional one is parameter on
+     it, so `t` goes from 0 to number of curves along the whole bunch. Points
+     of `t` out of that range are the ends of the bunch.
+
+    :param vertices: Packed vertices of the bunch `(3k + 1, 2)`.
+    :return: Array of shape `t.shape + (2,)`.
+    """
+
+    t = numpy.asarray(t, dtype=numpy.float64)
+    (a, b, c, d), local = _coefficients_at(vertices, t)
+
+    points = ((a * local + b) * local + c) * local + d
+
+    return points.reshape(t.shape + (2,))
+
+
+def evaluate_frames(vertices: VerticesType, t: numpy.ndarray) -> CurveFrames:
+    """Points, derivatives, normals and curvature of a bunch at global parameters `t`.
+
+    All of them are evaluated in one pass over polynomial coefficients of
+     curves. Normals and curvature are zero, where derivative vanishes.
+    """
+
+    t = numpy.asarray(t, dtype=numpy.float64)
+    (a, b, c, d), local = _coefficients_at(vertices, t)
+
+    points = ((a * local + b) * local + c) * local + d
+    first = (3 * a * local + 2 * b) * local + c
+    second = 6 * a * local + 2 * b
+
+    speed = numpy.hypot(first[:, 0], first[:, 1])
+    moving = speed > 0
+    inverse = numpy.divide(1.0, speed, out=numpy.zeros_like(speed), where=moving)
+
+    normals = numpy.stack([-first[:, 1], first[:, 0]], axis=1) * inverse[:, None]
+    curvature = (first[:, 0] * second[:, 1] - first[:, 1] * second[:, 0]) * inverse ** 3
+
+    return CurveFrames(
+        points.reshape(t.shape + (2,)),
+        first.reshape(t.shape + (2,)),
+        normals.reshape(t.shape + (2,)),
+        curvature.reshape(t.shape),
+    )
+
+
+def _coefficients_at(vertices: VerticesType, t: numpy.ndarray):
+    """Coefficients of curves of every parameter `t` and parameters on them, `(m, 1)`."""
+
+    vertices = numpy.asarray(vertices, dtype=numpy.float64).reshape(-1, 2)
+
+    count = (len(vertices) - 1) // 3
+    if count < 1:
+        raise ValueError("Bunch has no complete curves.")
+
+    t = t.ravel()
+    curves = numpy.clip(numpy.floor(t), 0, count - 1).astype(numpy.int64)
+
+    coefficients = polynomial_coefficients(bunch_controls(vertices, curves))
+
+    # Parameters out of the bunch are clamped to its ends, not extrapolated.
+    local = numpy.clip(t - curves, 0.0, 1.0)
+
+    return coefficients.transpose(1, 0, 2), local[:, None]
+
+
+def bunch_controls(vertices: VerticesType, curves: Optional[Sequence[int]] = None) -> numpy.ndarray:
+    """Split packed vertices of a bunch `(3k + 1, 2)` on curves `(k, 4, 2)`.
+
+    Neighbouring curves share their endpoints, incomplete tail is dropped.
+
+    :param curves: Indices of curves to take, all complete curves if `None`.
+    """
+
+    vertices = numpy.asarray(vertices, dtype=numpy.float64).reshape(-1, 2)
+
+    if curves is None:
+        curves = numpy.arange(max(0, (len(vertices) - 1) // 3))
+
+    indices = 3 * numpy.asarray(curves, dtype=numpy.int64).reshape(-1, 1) + numpy.arange(4)
+
+    return vertices[indices]
+
+
+def evaluate_bunch(vertices: VerticesType, resolution: int) -> numpy.ndarray:
+    """Points of the whole bunch as one polyline of shape `(k * resolution + 1, 2)`.
+
+    Shared endpoints of neighbouring curves are emitted once.
+    """
+
+    points = evaluate_curves(bunch_controls(vertices), resolution)
+
+    if len(points) == 0:
+        return numpy.empty((0, 2), dtype=numpy.float64)
+
+    return numpy.concatenate([points[:, :-1].reshape(-1, 2), points[-1, -1:]])
+
+
+def flattening_resolution(
+        controls: numpy.ndarray,
+        tolerance: float
+) -> numpy.ndarray:
+    """Number of uniform steps to keep polyline within `tolerance` of the curve.
+
+    Uses Wang's formula: deviation of polyline from cubic curve is bounded by
+     `3/4 * max|P[i] - 2 * P[i + 1] + P[i + 2]| / n ** 2`.
+
+    :param controls: Control points of shape `(4, 2)` or `(k, 4, 2)`.
+    :return: Resolutions of shape `()` or `(k,)`.
+    """
+
+    controls = numpy.asarray(controls, dtype=numpy.float64)
+
+    second_differences = controls[..., :-2, :] - 2 * controls[..., 1:-1, :] + controls[..., 2:, :]
+    deviation = numpy.linalg.norm(second_differences, axis=-1).max(axis=-1)
+
+    resolution = numpy.ceil(numpy.sqrt(0.75 * deviation / tolerance))
+
+    return numpy.clip(resolution, 1, MAX_RESOLUTION).astype(numpy.int64)
+
+
+def flatten_curves(controls: numpy.ndarray, tolerance: float) -> List[numpy.ndarray]:
+    """Points of many curves, each one sampled with its own resolution.
+
+    Curves with equal resolution are evaluated together in one batch.
+    """
+
+    controls = numpy.asarray(controls, dtype=numpy.float64)
+    resolutions = flattening_resolution(controls, tolerance)
+
+    points = [None] * len(controls)
+
+    for resolution in numpy.unique(resolutions):
+        indices = numpy.flatnonzero(resolutions == resolution)
+        for index, curve_points in zip(indices, evaluate_curves(controls[indices], int(resolution))):
+            points[index] = curve_points
+
+    return points
+
+
+def flatten_bunch(vertices: VerticesType, tolerance: float) -> numpy.ndarray:
+    """Points of the whole bunch as one polyline flattened within `tolerance`."""
+
+    points = flatten_curves(bunch_controls(vertices), tolerance)
+
+    if not points:
+        return numpy.empty((0, 2), dtype=numpy.float64)
+
+    return numpy.concatenate([p[:-1] for p in points] + [points[-1][-1:]])
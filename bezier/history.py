@@ -0,0 +1,104 @@
+"""
+Undo and redo of edits of bunches.
+
+Every edit keeps only vertices it changed, with their values before and after
+ it, and number of vertices of the bunch, so undo and redo cost as much as the
+ edit itself and never copy the whole bunch.
+"""
+
+import numpy
+
+from collections import deque
+from typing import Deque, NamedTuple, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from bezier.curves import BezierCurvesBunch
+
+
+class VerticesEdit(NamedTuple):
+    bunch: "BezierCurvesBunch"
+    indices: numpy.ndarray  # Indices of changed vertices, `(m,)`.
+    before: numpy.ndarray  # Values before edit, `(m, 2)`, undefined for appended ones.
+    after: numpy.ndarray  # Values after edit, `(m, 2)`.
+    size_before: int  # Number of vertices before edit.
+    size_after: int
+
+    def undo(self):
+        self.bunch._restore(self.indices, self.before, self.size_before)
+
+    def redo(self):
+        self.bunch._restore(self.indices, self.after, self.size_after)
+
+
+class EditHistory:
+    """Bounded stacks of edits to undo and redo.
+
+    The oldest edits are evicted, when there are more than `max_edits` of them
+     or they keep more than `max_vertices` vertices together.
+    """
+
+    def __init__(self, max_edits: int = 1000, max_vertices: int = 1 << 20):
+        self.max_edits = max_edits
+        self.max_vertices = max_vertices
+
+        self.__undo: Deque[VerticesEdit] = deque()
+        self.__redo: Deque[VerticesEdit] = deque()
+        self.__vertices = 0
+
+    def __len__(self):
+        return len(self.__undo)
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self.__undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self.__redo)
+
+    def push(self, edit: VerticesEdit) -> None:
+        """Record new edit, edits undone before are dropped."""
+
+        while self.__redo:
+            self.__vertices -= len(self.__redo.pop().indices)
+
+        self.__undo.append(edit)
+        self.__vertices += len(edit.indices)
+
+        while self.__undo and (len(self.__undo) > self.max_edits or self.__vertices > self.max_vertices):
+            self.__vertices -= len(self.__undo.popleft().indices)
+
+    def undo(self) -> Optional[VerticesEdit]:
+        if not self.__undo:
+            return None
+
+        edit = self.__undo.pop()
+        edit.undo()
+        self.__redo.append(edit)
+
+        return edit
+
+    def redo(self) -> Optional[VerticesEdit]:
+        if not self.__redo:
+            return None
+
+        edit = self.__redo.pop()
+        edit.redo()
+        self.__undo.append(edit)
+
+        return edit
+
+    def forget(self, bunch: "BezierCurvesBunch") -> None:
+        """Drop edits of removed `bunch`."""
+
+        for stack in (self.__undo, self.__redo):
+            kept = [edit for edit in stack if edit.bunch is not bunch]
+            self.__vertices -= sum(len(edit.indices) for edit in stack) - sum(len(edit.indices) for edit in kept)
+
+            stack.clear()
+            stack.extend(kept)
+
+    def clear(self) -> None:
+        self.__undo.clear()
+        self.__redo.clear()
+        self.__vertices = 0
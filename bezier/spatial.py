@@ -0,0 +1,174 @@
+import math
+import numpy
+
+from collections import defaultdict
+from typing import Dict, Hashable, List, Set, Tuple
+
+
+BoundsType = Tuple[float, float, float, float]  # (left, top, right, bottom)
+CellType = Tuple[int, int]
+RangeType = Tuple[int, int, int, int]  # (x_from, y_from, x_to, y_to) of cells, inclusive
+
+
+class SpatialGrid:
+    """Uniform grid of axis aligned boxes keyed by any hashable.
+
+    Every entry is registered in all cells its box covers, so inserting,
+     removing and querying small boxes is O(1) on average.
+    """
+
+    __cells: Dict[CellType, Set[Hashable]]
+    __entries: Dict[Hashable, RangeType]
+
+    def __init__(self, cell_size: float = 64.0):
+        self.__cell_size = cell_size
+        self.__cells = defaultdict(set)
+        self.__entries = {}
+
+    @property
+    def cell_size(self) -> float:
+        return self.__cell_size
+
+    def insert(self, key: Hashable, bounds: BoundsType) -> None:
+        """Insert entry or move existing one to new `bounds`."""
+
+        self.remove(key)
+
+        cells = self.__get_cells_range(bounds)
+        for cell in self.__get_cells(cells):
+            self.__cells[cell].add(key)
+
+        self.__entries[key] = cells
+
+    def extend(self, keys: numpy.ndarray, bounds: numpy.ndarray) -> None:
+        """Insert many new entries at once, `keys` `(k,)` with `bounds` `(k, 4)`.
+
+        Cells of all boxes are found and grouped by numpy, so large grids are
+         filled without python loop over entries. Keys shouldn't be in the
+         grid yet.
+        """
+
+        keys = numpy.asarray(keys)
+        if not len(keys):
+            return
+
+        ranges = numpy.floor(numpy.asarray(bounds, dtype=numpy.float64) / self.__cell_size).astype(numpy.int64)
+        keys_list = keys.tolist()
+
+        self.__entries.update(zip(keys_list, zip(*(column.tolist() for column in ranges.T))))
+
+        widths = ranges[:, 2] - ranges[:, 0] + 1
+        heights = ranges[:, 3] - ranges[:, 1] + 1
+        counts = widths * heights
+
+        # Every box is spread on its cells, column by column.
+        owners = numpy.repeat(numpy.arange(len(keys)), counts)
+        local = numpy.arange(len(owners)) - numpy.repeat(numpy.cumsum(counts) - counts, counts)
+        xs = ranges[owners, 0] + local // heights[owners]
+        ys = ranges[owners, 1] + local % heights[owners]
+
+        # Entries of the same cell go one after another after sorting.
+        order = numpy.lexsort((ys, xs))
+        xs, ys, owners = xs[order], ys[order], owners[order]
+
+        starts = numpy.flatnonzero(numpy.r_[True, (xs[1:] != xs[:-1]) | (ys[1:] != ys[:-1])])
+        stops = [*starts[1:].tolist(), len(order)]
+        sorted_keys = keys[owners].tolist()
+
+        for x, y, start, stop in zip(xs[starts].tolist(), ys[starts].tolist(), starts.tolist(), stops):
+            self.__cells[(x, y)].update(sorted_keys[start:stop])
+
+    def remove(self, key: Hashable) -> bool:
+        if key not in self.__entries:
+            return False
+
+        for cell in self.__get_cells(self.__entries.pop(key)):
+            entries = self.__cells[cell]
+            entries.discard(key)
+
+            if not entries:
+                del self.__cells[cell]
+
+        return True
+
+    def query(self, bounds: BoundsType) -> Set[Hashable]:
+        """Keys of entries placed in cells which `bounds` covers.
+
+        Result is a superset of really intersected entries, caller should
+         check exact distances itself.
+        """
+
+        found = set()
+
+        for cell in self.__get_cells(self.__get_cells_range(bounds)):
+            entries = self.__cells.get(cell)
+            if entries:
+                found.update(entries)
+
+        return found
+
+    def count_cells(self, bounds: BoundsType) -> int:
+        """Number of cells `bounds` covers, to estimate cost of `query`."""
+
+        x_from, y_from, x_to, y_to = self.__get_cells_range(bounds)
+
+        return (x_to - x_from + 1) * (y_to - y_from + 1)
+
+    def __get_cells_range(self, bounds: BoundsType) -> RangeType:
+        left, top, right, bottom = bounds
+
+        return (
+            math.floor(left / self.__cell_size),
+            math.floor(top / self.__cell_size),
+            math.floor(right / self.__cell_size),
+            math.floor(bottom / self.__cell_size),
+        )
+
+    @staticmethod
+    def __get_cells(cells: RangeType) -> List[CellType]:
+        x_from, y_from, x_to, y_to = cells
+
+        return [
+            (x, y)
+            for x in range(x_from, x_to + 1)
+            for y in range(y_from, y_to + 1)
+        ]
+
+    def __contains__(self, key: Hashable):
+        return key in self.__entries
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}> with {len(self.__entries)} " \
+               f"in {len(self.__cells)} cells"
+
+
+def nearest_on_polyline(
+        points: numpy.ndarray,
+        position: Tuple[float, float]
+) -> Tuple[numpy.ndarray, float]:
+    """Nearest to `position` point on polyline and distance to it."""
+
+    points = numpy.asarray(points, dtype=numpy.float64)
+    position = numpy.asarray(position, dtype=numpy.float64)
+
+    if len(points) == 1:
+        return points[0], float(numpy.linalg.norm(points[0] - position))
+
+    starts = points[:-1]
+    segments = points[1:] - starts
+
+    lengths = numpy.einsum("ij,ij->i", segments, segments)
+    projections = numpy.einsum("ij,ij->i", position - starts, segments)
+    t = numpy.clip(
+        numpy.divide(projections, lengths, out=numpy.zeros_like(lengths), where=lengths > 0),
+        0.0, 1.0
+    )
+
+    nearest = starts + segments * t[:, None]
+    distances = numpy.linalg.norm(nearest - position, axis=1)
+    index = int(numpy.argmin(distances))
+
+    return nearest[index], float(distances[index])
@@ -0,0 +1,87 @@
+import numpy
+import pygame
+
+from typing import Union, Sequence, Tuple
+
+
+VertexType = Union[pygame.Vector2, Tuple[float, float], Sequence[float]]
+
+
+class VertexStorage:
+    """Growable packed array of vertices with shape `(n, 2)`.
+
+    Curves of one bunch are views over windows of that array, so neighbouring
+     curves share their endpoints without copying. Array is reallocated with
+     doubled capacity when full, so views should be taken through `array`
+     and not kept for long.
+
+    Read-only array, like vertices of mapped binary track, can be shared by
+     `share` without copying. It is copied by `make_writable`, which should be
+     called before the first change.
+    """
+
+    __slots__ = ("__array", "__size")
+
+    def __init__(self, capacity: int = 16):
+        self.__array = numpy.empty((max(1, capacity), 2), dtype=numpy.float64)
+        self.__size = 0
+
+    @property
+    def array(self) -> numpy.ndarray:
+        return self.__array[:self.__size]
+
+    def append(self, vertex: VertexType) -> int:
+        if self.__size == len(self.__array):
+            self.__grow(2 * len(self.__array))
+
+        self.__array[self.__size] = vertex[0], vertex[1]
+        self.__size += 1
+
+        return self.__size - 1
+
+    def extend(self, vertices: numpy.ndarray) -> None:
+        vertices = numpy.asarray(vertices, dtype=numpy.float64).reshape(-1, 2)
+
+        if self.__size + len(vertices) > len(self.__array):
+            self.__grow(max(2 * len(self.__array), self.__size + len(vertices)))
+
+        self.__array[self.__size:self.__size + len(vertices)] = vertices
+        self.__size += len(vertices)
+
+    def share(self, vertices: numpy.ndarray) -> None:
+        """Take `vertices` `(n, 2)` of float64 as contents of empty storage without copying."""
+
+        if self.__size:
+            raise ValueError(f"Only empty storage can share vertices, {self} isn't.")
+
+        self.__array = vertices
+        self.__size = len(vertices)
+
+    def make_writable(self) -> None:
+        """Copy shared read-only vertices, to change them."""
+
+        if not self.__array.flags.writeable:
+            self.__grow(max(1, len(self.__array)))
+
+    def truncate(self, size: int) -> None:
+        """Drop vertices after the first `size` of them."""
+
+        self.__size = min(self.__size, max(0, size))
+
+    def __grow(self, capacity: int):
+        array = numpy.empty((capacity, 2), dtype=numpy.float64)
+        array[:self.__size] = self.__array[:self.__size]
+
+        self.__array = array
+
+    def __getitem__(self, index):
+        return self.array[index]
+
+    def __setitem__(self, index, value):
+        self.array[index] = value
+
+    def __len__(self):
+        return self.__size
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}> with {self.__size} of {len(self.__array)}"
@@ -0,0 +1,180 @@
+import pygame
+import time
+
+from typing import List, Dict, Optional
+
+from render.camera import Camera
+from render.colors import gray, green
+from render.hud import Hud, HudWidget
+from render.layers import BunchLayer
+from render.text import TextCache
+from utils.profiler import profiler
+from utils.types import AppStateType, ABCBezierCurvesBunch
+
+
+class AppRender:
+    """Retained mode render of application.
+
+    Curves of every bunch are cached in `BunchLayer`, and only changed areas
+     of the screen are composed and pushed to display each frame, so frames
+     without changes cost almost nothing. Texts are drawn by `Hud` widgets.
+    """
+
+    # Too many small areas are slower to push than their union.
+    MAX_DIRTY_RECTS = 32
+
+    # Top left corner and line height of profiler overlay.
+    PROFILER_POSITION = 780, 10
+    PROFILER_LINE_HEIGHT = 16
+
+    STATUS_POSITION = 10, 748
+
+    # Seconds between updates of FPS in status line.
+    FPS_INTERVAL = 0.5
+
+    def __init__(self, state: AppStateType, camera: Optional[Camera] = None):
+        self.screen = pygame.display.set_mode((1024, 768))
+        self.font = pygame.font.SysFont('mono', 12, bold=True)
+        self.app_state = state
+        self.camera = camera or Camera()
+
+        self.__layers: Dict[ABCBezierCurvesBunch, BunchLayer] = {}
+        self.__ordered_layers: List[BunchLayer] = []
+        self.__highlight: Optional[pygame.Rect] = None
+        self.__profiler_lines = 0
+        self.__redraw_all = True
+
+        self.__help_text = ""
+        self.__vertices = 0
+        self.__fps = 0.0
+        self.__frames = 0
+        self.__frames_start = time.perf_counter()
+
+        self.text_cache = TextCache(self.font)
+        self.hud = Hud(self.text_cache)
+
+        self.hud.add(HudWidget((10, 10), lambda: self.app_state["mode"] or ""))
+        self.hud.add(HudWidget((10, 30), lambda: str(self.app_state["selected_point"])))
+        self.hud.add(HudWidget((10, 60), lambda: self.__help_text))
+        self.hud.add(HudWidget(self.STATUS_POSITION, self.__get_status))
+
+    def update(self, curves_bunch: List[ABCBezierCurvesBunch], text):
+        viewport = self.screen.get_rect()
+
+        self.__help_text = text
+        self.__update_status(curves_bunch)
+
+        dirty = [
+            *self.__update_layers(curves_bunch, viewport),
+            *self.__update_highlight(),
+            *self.hud.update(),
+            *self.__update_profiler(),
+        ]
+
+        if self.__redraw_all:
+            dirty = [viewport]
+            self.__redraw_all = False
+
+        dirty = [rect.clip(viewport) for rect in dirty]
+        dirty = [rect for rect in dirty if rect.width and rect.height]
+
+        if not dirty:
+            return
+
+        if len(dirty) > self.MAX_DIRTY_RECTS:
+            dirty = [dirty[0].unionall(dirty[1:])]
+
+        for rect in dirty:
+            self.__compose(rect)
+
+        pygame.display.update(dirty)
+
+    def __compose(self, area: pygame.Rect):
+        self.screen.set_clip(area)
+
+        ### Draw stuff
+        self.screen.fill(gray, area)
+
+        ### Highlight selected point
+        if self.__highlight and self.__highlight.colliderect(area):
+            pygame.draw.circle(self.screen, green, self.__highlight.center, 10)
+
+        for layer in self.__ordered_layers:
+            if layer.rect.colliderect(area):
+                self.screen.blit(layer.surface, layer.rect)
+
+        self.hud.draw(self.screen, area)
+
+        self.screen.set_clip(None)
+
+    def __update_layers(
+            self,
+            curves_bunch: List[ABCBezierCurvesBunch],
+            viewport: pygame.Rect
+    ) -> List[pygame.Rect]:
+        dirty = []
+
+        removed = set(self.__layers) - set(curves_bunch)
+        for bunch in removed:
+            layer = self.__layers.pop(bunch)
+            if layer.rect:
+                dirty.append(layer.rect)
+
+        self.__ordered_layers = []
+        for bunch in curves_bunch:
+            if bunch not in self.__layers:
+                self.__layers[bunch] = BunchLayer(bunch)
+
+            layer = self.__layers[bunch]
+            dirty.extend(layer.update(viewport, self.camera))
+
+            if layer.surface is not None:
+                self.__ordered_layers.append(layer)
+
+        return dirty
+
+    def __update_highlight(self) -> List[pygame.Rect]:
+        selected = self.app_state["selected_point"]
+
+        if selected is None:
+            rect = None
+        else:
+            x, y = self.camera.to_screen(selected).tolist()
+
+            rect = pygame.Rect(0, 0, 22, 22)
+            rect.center = int(x), int(y)
+
+        if rect == self.__highlight:
+            return []
+
+        dirty = [r for r in (self.__highlight, rect) if r]
+        self.__highlight = rect
+
+        return dirty
+
+    def __update_profiler(self) -> List[pygame.Rect]:
+        lines = profiler.lines() if profiler.enabled else ()
+        x, y = self.PROFILER_POSITION
+
+        dirty = []
+        for i in range(max(len(lines), self.__profiler_lines)):
+            text = lines[i] if i < len(lines) else ""
+            dirty.extend(self.hud.set_text((x, y + i * self.PROFILER_LINE_HEIGHT), text))
+
+        self.__profiler_lines = len(lines)
+
+        return dirty
+
+    def __update_status(self, curves_bunch: List[ABCBezierCurvesBunch]):
+        now = time.perf_counter()
+
+        self.__frames += 1
+        if now - self.__frames_start >= self.FPS_INTERVAL:
+            self.__fps = self.__frames / (now - self.__frames_start)
+            self.__frames = 0
+            self.__frames_start = now
+
+        self.__vertices = sum(len(bunch.vertices) for bunch in curves_bunch)
+
+    def __get_status(self) -> str:
+        return f"FPS: {self.__fps:.0f}   Vertices: {self.__vertices}   Zoom: {self.camera.zoom:.3g}"
@@ -0,0 +1,79 @@
+import numpy
+
+from typing import Tuple
+
+from bezier.spatial import BoundsType
+
+
+class Camera:
+    """Pan and zoom of the view.
+
+    Curves live in world coordinates, screen point of world one is
+     `(world - position) * zoom`, so `position` is world point at the top
+     left corner of the screen.
+    """
+
+    MIN_ZOOM = 1e-5
+    MAX_ZOOM = 100.0
+
+    def __init__(self, position: Tuple[float, float] = (0.0, 0.0), zoom: float = 1.0):
+        self.__position = numpy.array(position, dtype=numpy.float64)
+        self.__zoom = zoom
+
+    @property
+    def position(self) -> Tuple[float, float]:
+        return tuple(self.__position.tolist())
+
+    @property
+    def zoom(self) -> float:
+        return self.__zoom
+
+    @property
+    def state(self) -> Tuple[float, float, float]:
+        """Everything the transform depends on, to find out its changes."""
+
+        return (*self.position, self.__zoom)
+
+    def to_screen(self, points) -> numpy.ndarray:
+        return (numpy.asarray(points, dtype=numpy.float64) - self.__position) * self.__zoom
+
+    def to_world(self, points) -> numpy.ndarray:
+        return numpy.asarray(points, dtype=numpy.float64) / self.__zoom + self.__position
+
+    def to_screen_bounds(self, bounds: BoundsType) -> BoundsType:
+        left, top = self.to_screen(bounds[:2]).tolist()
+        right, bottom = self.to_screen(bounds[2:]).tolist()
+
+        return left, top, right, bottom
+
+    def to_world_bounds(self, bounds: BoundsType) -> BoundsType:
+        left, top = self.to_world(bounds[:2]).tolist()
+        right, bottom = self.to_world(bounds[2:]).tolist()
+
+        return left, top, right, bottom
+
+    def pan(self, offset: Tuple[float, float]):
+        """Move the view by `offset` in screen pixels."""
+
+        self.__position -= numpy.asarray(offset, dtype=numpy.float64) / self.__zoom
+
+    def zoom_at(self, factor: float, anchor: Tuple[float, float]):
+        """Scale the view by `factor`, keeping world point under screen `anchor`."""
+
+        anchored = self.to_world(anchor)
+
+        self.__zoom = min(max(self.__zoom * factor, self.MIN_ZOOM), self.MAX_ZOOM)
+        self.__position = anchored - numpy.asarray(anchor, dtype=numpy.float64) / self.__zoom
+
+    def fit(self, bounds: BoundsType, size: Tuple[int, int], margin: int = 20):
+        """Show whole world `bounds` in the screen of `size`."""
+
+        left, top, right, bottom = bounds
+        width, height = size
+
+        scale_x = (width - 2 * margin) / max(right - left, 1e-9)
+        scale_y = (height - 2 * margin) / max(bottom - top, 1e-9)
+        self.__zoom = min(max(min(scale_x, scale_y), self.MIN_ZOOM), self.MAX_ZOOM)
+
+        center = numpy.array([(left + right) / 2, (top + bottom) / 2])
+        self.__position = center - numpy.array([width, height]) / 2 / self.__zoom
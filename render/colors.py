@@ -0,0 +1,11 @@
+import pygame
+
+
+gray = pygame.Color(100, 100, 100)
+lightgray = pygame.Color(200, 200, 200)
+red = pygame.Color(255, 0, 0)
+green = pygame.Color(0, 255, 0)
+blue = pygame.Color(0, 0, 255)
+white = pygame.Color(255, 255, 255)
+black = pygame.Color(0, 0, 0)
+transparent = pygame.Color(0, 0, 0, 0)
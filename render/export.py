@@ -0,0 +1,243 @@
+"""
+Offscreen export of curves to images of any size.
+
+PNG is drawn by `BunchLayer` in strips across the whole width of the image,
+ every strip is encoded and written before the next one is drawn, so only one
+ strip is held in memory. SVG paths are written from control points as cubic
+ segments, without sampling.
+
+Usage:
+    python -m render.export trek.json --png trek.png --size 16384 16384
+    python -m render.export trek.json --svg trek.svg --controls
+"""
+
+import argparse
+import numpy
+import pygame
+import struct
+import sys
+import zlib
+
+from typing import BinaryIO, List, Optional, Sequence, TextIO, Tuple
+
+from bezier import BezierCurvesBunch
+from bezier.spatial import BoundsType
+from render.camera import Camera
+from render.colors import blue, gray, lightgray, red
+from render.layers import BunchLayer, MARKER_RADIUS
+from tracks.io import iter_track
+from utils.types import ABCBezierCurvesBunch
+
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Rows of the image drawn at once, memory of a strip is about
+#  `width * STRIP_HEIGHT * 12` bytes with layers and encoding.
+STRIP_HEIGHT = 256
+
+MARGIN = 20
+
+# Width of lines in pixels of the image at any scale, like in the app.
+SVG_STROKE = 'vector-effect="non-scaling-stroke" stroke-linejoin="round"'
+
+
+class PngWriter:
+    """Encoder of 8-bit RGB PNG written to `file` by rows from the top.
+
+    Rows are filtered by `Sub` filter, which suits flat background and lines,
+     and compressed into `IDAT` chunks as soon as zlib gives them out.
+    """
+
+    def __init__(self, file: BinaryIO, size: Tuple[int, int], level: int = 6):
+        self.__file = file
+        self.__width, self.__height = size
+        self.__rows = 0
+        self.__compressor = zlib.compressobj(level)
+
+        self.__file.write(PNG_SIGNATURE)
+        self.__write_chunk(b"IHDR", struct.pack(">IIBBBBB", self.__width, self.__height, 8, 2, 0, 0, 0))
+
+    def write(self, rows: numpy.ndarray):
+        """Append `rows` of pixels, `(h, width, 3)` of `uint8`."""
+
+        if rows.shape[1:] != (self.__width, 3) or self.__rows + len(rows) > self.__height:
+            raise ValueError(f"Rows of shape {rows.shape} don't fit image of {self.__width}x{self.__height}.")
+
+        rows = rows.reshape(len(rows), -1)
+
+        filtered = numpy.empty((len(rows), rows.shape[1] + 1), dtype=numpy.uint8)
+        filtered[:, 0] = 1  # `Sub`, difference with the same channel of the left pixel.
+        filtered[:, 1:] = rows
+        filtered[:, 4:] -= rows[:, :-3]
+
+        compressed = self.__compressor.compress(filtered.data)
+        if compressed:
+            self.__write_chunk(b"IDAT", compressed)
+
+        self.__rows += len(rows)
+
+    def close(self):
+        if self.__rows != self.__height:
+            raise ValueError(f"Only {self.__rows} of {self.__height} rows are written.")
+
+        self.__write_chunk(b"IDAT", self.__compressor.flush())
+        self.__write_chunk(b"IEND", b"")
+
+    def __write_chunk(self, kind: bytes, data: bytes):
+        self.__file.write(struct.pack(">I", len(data)) + kind)
+        self.__file.write(data)
+        self.__file.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(kind))))
+
+
+def track_bounds(bunches: Sequence[ABCBezierCurvesBunch]) -> Optional[BoundsType]:
+    """Bounds of vertices of all bunches, curves never go beyond them."""
+
+    vertices = [bunch.vertices for bunch in bunches if len(bunch.vertices)]
+    if not vertices:
+        return None
+
+    vertices = numpy.concatenate(vertices)
+    left, top = vertices.min(axis=0).tolist()
+    right, bottom = vertices.max(axis=0).tolist()
+
+    return left, top, right, bottom
+
+
+def export_png(
+        bunches: Sequence[ABCBezierCurvesBunch],
+        file: BinaryIO,
+        size: Tuple[int, int],
+        bounds: Optional[BoundsType] = None,
+        background: pygame.Color = gray
+):
+    """Draw bunches fitted into image of `size` like the app does.
+
+    :param bounds: World area to show, all curves if `None`.
+    """
+
+    width, height = size
+
+    camera = Camera()
+    camera.fit(bounds or track_bounds(bunches) or (0, 0, width, height), size, MARGIN)
+
+    # Changes of curves are left for the app render.
+    layers = [BunchLayer(bunch, tracked=False) for bunch in bunches]
+    strip = pygame.Surface((width, min(STRIP_HEIGHT, height)))
+
+    writer = PngWriter(file, size)
+
+    for top in range(0, height, strip.get_height()):
+        viewport = pygame.Rect(0, top, width, min(strip.get_height(), height - top))
+
+        ### Draw stuff
+        strip.fill(background)
+
+        for layer in layers:
+            layer.update(viewport, camera)
+            strip.blit(layer.surface, layer.rect.move(0, -top))
+
+        pixels = numpy.frombuffer(pygame.image.tobytes(strip, "RGB"), dtype=numpy.uint8)
+        writer.write(pixels.reshape(-1, width, 3)[:viewport.height])
+
+    writer.close()
+
+
+def export_svg(
+        bunches: Sequence[ABCBezierCurvesBunch],
+        file: TextIO,
+        bounds: Optional[BoundsType] = None,
+        controls: bool = False,
+        precision: int = 2
+):
+    """Write bunches as SVG paths of cubic segments in world coordinates.
+
+    :param bounds: World area to show, all curves if `None`.
+    :param controls: Draw control polygons and control points too.
+    :param precision: Digits after point of coordinates.
+    """
+
+    left, top, right, bottom = bounds or track_bounds(bunches) or (0, 0, 0, 0)
+    left, top = left - MARGIN, top - MARGIN
+    width, height = right - left + MARGIN, bottom - top + MARGIN
+
+    number = f"%.{precision}f"
+
+    file.write(
+        f'<svg xmlns="http://www.w3.org/2000/svg" '
+        f'viewBox="{left:g} {top:g} {width:g} {height:g}" width="{width:g}" height="{height:g}">\n'
+    )
+    file.write(f'<rect x="{left:g}" y="{top:g}" width="{width:g}" height="{height:g}" fill="{_svg_color(gray)}"/>\n')
+
+    for bunch in bunches:
+        vertices = numpy.asarray(bunch.vertices, dtype=numpy.float64).reshape(-1, 2)
+        curves = (len(vertices) - 1) // 3
+
+        if controls and len(vertices):
+            file.write(f'<polyline fill="none" stroke="{_svg_color(lightgray)}" {SVG_STROKE} stroke-width="1" points="\n')
+            numpy.savetxt(file, vertices, fmt=f"{number},{number}")
+            file.write('"/>\n')
+
+        if curves > 0:
+            # Neighbouring curves share end points, every curve adds one cubic
+            #  segment from the end of the previous one.
+            file.write(f'<path fill="none" stroke="{_svg_color(red)}" {SVG_STROKE} stroke-width="2" d="\n')
+            file.write(f"M {number} {number}\n" % tuple(vertices[0]))
+            numpy.savetxt(file, vertices[1:3 * curves + 1].reshape(-1, 6), fmt=" ".join(["C", *[number] * 6]))
+            file.write('"/>\n')
+
+        if controls:
+            for x, y in vertices.tolist():
+                file.write(f'<circle cx="{number}" cy="{number}" r="{MARKER_RADIUS}" fill="{_svg_color(blue)}"/>\n' % (x, y))
+
+    file.write("</svg>\n")
+
+
+def _svg_color(color: pygame.Color) -> str:
+    return f"rgb({color.r},{color.g},{color.b})"
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m render.export", description=__doc__.split("\n\n")[0])
+
+    parser.add_argument("track", help="Path to saved track.")
+    parser.add_argument("--png", help="Output PNG file.")
+    parser.add_argument("--svg", help="Output SVG file.")
+    parser.add_argument(
+        "--size", type=int, nargs=2, default=(4096, 3072), metavar=("WIDTH", "HEIGHT"),
+        help="Size of PNG in pixels, curves are fitted into it."
+    )
+    parser.add_argument(
+        "--flatness", type=float, default=0.5,
+        help="Max deviation in pixels of drawn polylines from curves in scale 1:1."
+    )
+    parser.add_argument("--controls", action="store_true", help="Draw control points in SVG.")
+
+    args = parser.parse_args(argv)
+
+    if not args.png and not args.svg:
+        parser.error("At least one of --png and --svg is required.")
+
+    return args
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    bunches: List[BezierCurvesBunch] = [
+        BezierCurvesBunch.from_vertices(vertices, flatness=args.flatness)
+        for vertices in iter_track(args.track)
+    ]
+
+    if args.png:
+        with open(args.png, "wb") as file:
+            export_png(bunches, file, tuple(args.size))
+
+    if args.svg:
+        with open(args.svg, "w") as file:
+            export_svg(bunches, file, controls=args.controls)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
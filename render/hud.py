@@ -0,0 +1,80 @@
+import pygame
+
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+from render.colors import white
+from render.text import TextCache
+
+
+PositionType = Tuple[int, int]
+
+
+class HudWidget(NamedTuple):
+    """Line of text at fixed position, taken from `text` every frame."""
+
+    position: PositionType
+    text: Callable[[], str]
+    color: pygame.Color = white
+
+
+class Hud:
+    """Text lines over the curves.
+
+    Texts of widgets are taken every frame, but surfaces are taken from
+     `TextCache` and areas are reported dirty only for changed lines.
+    """
+
+    def __init__(self, cache: TextCache):
+        self.cache = cache
+        self.widgets: List[HudWidget] = []
+
+        # Text and colour, surface and area of every line by positions.
+        self.__lines: Dict[PositionType, Tuple[Tuple[str, tuple], pygame.Surface, pygame.Rect]] = {}
+
+    def add(self, widget: HudWidget) -> HudWidget:
+        self.widgets.append(widget)
+        return widget
+
+    def remove(self, widget: HudWidget) -> List[pygame.Rect]:
+        self.widgets.remove(widget)
+        return self.set_text(widget.position, "")
+
+    def update(self) -> List[pygame.Rect]:
+        """Take texts of widgets.
+
+        :return: Changed areas of the screen.
+        """
+
+        dirty = []
+        for widget in self.widgets:
+            dirty.extend(self.set_text(widget.position, widget.text(), widget.color))
+
+        return dirty
+
+    def set_text(self, position: PositionType, text: str, color: pygame.Color = white) -> List[pygame.Rect]:
+        """Put `text` at `position` directly, empty text removes the line.
+
+        :return: Changed areas of the screen.
+        """
+
+        key = text, tuple(color)
+        old = self.__lines.get(position)
+
+        if old and old[0] == key:
+            return []
+
+        dirty = [old[2]] if old else []
+
+        if text:
+            surface = self.cache.render(text, color)
+            self.__lines[position] = key, surface, surface.get_rect(topleft=position)
+            dirty.append(self.__lines[position][2])
+        else:
+            self.__lines.pop(position, None)
+
+        return dirty
+
+    def draw(self, surface: pygame.Surface, area: pygame.Rect):
+        for _, text_surface, rect in self.__lines.values():
+            if rect.colliderect(area):
+                surface.blit(text_surface, rect)
@@ -0,0 +1,373 @@
+import math
+import numpy
+import pygame
+
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from bezier.spatial import SpatialGrid
+from render.camera import Camera
+from render.colors import black, blue, lightgray, red, transparent
+from utils.profiler import profiler
+from utils.types import ABCBezierCurve, ABCBezierCurvesBunch
+
+
+# Control point markers and curve line go beyond control polygon of a curve.
+MARGIN = 6
+
+MARKER_RADIUS = 4
+
+MAX_REDRAW_RECTS = 32
+
+# Curves and groups of consecutive curves smaller than that in pixels are
+#  drawn as chords between their ends, without control points.
+GROUP_SIZE = 4
+
+# Min length in pixels of segments of curves, finer steps aren't visible.
+SEGMENT_PIXELS = 2
+
+
+class BunchLayer:
+    """Rasterised curves of one bunch cached on off-screen surface.
+
+    Only curves visible in viewport are drawn. After that only curves reported
+     by `take_changed_curves` of the bunch are redrawn, and only in areas they
+     covered before and cover now.
+
+    Curves are drawn through `Camera`, and the layer is rebuilt when it moves.
+     Small on screen curves are drawn by groups, see `GROUP_SIZE`, so far
+     zoomed out track costs about as many segments as pixels it covers. Others
+     are drawn with their sampled points, or level of detail points fitting
+     their size on screen.
+    """
+
+    def __init__(self, bunch: ABCBezierCurvesBunch, tracked: bool = True):
+        """
+        :param tracked: Take changed curves from the bunch and redraw them.
+            Untracked layer is only rebuilt, so it can draw the bunch aside of
+            the app render without stealing its changes.
+        """
+
+        self.bunch = bunch
+        self.rect: Optional[pygame.Rect] = None
+        self.surface: Optional[pygame.Surface] = None
+
+        self.__tracked = tracked
+        self.__viewport: Optional[pygame.Rect] = None
+        self.__camera = Camera()
+        self.__camera_state = None
+        self.__curves_rects: Dict[int, pygame.Rect] = {}
+        self.__curves_grid = SpatialGrid()
+
+        # Polylines through ends of groups of small curves and their areas.
+        self.__groups: List[numpy.ndarray] = []
+        self.__groups_rects: List[pygame.Rect] = []
+        self.__grouped = numpy.empty((0, 2), dtype=numpy.int64)  # Ranges `[start, stop)` of grouped curves.
+
+        self.__points_buffer = numpy.empty((0, 2), dtype=numpy.float64)
+
+    def update(self, viewport: pygame.Rect, camera: Optional[Camera] = None) -> List[pygame.Rect]:
+        """Redraw changed curves.
+
+        :return: Changed areas of the screen.
+        """
+
+        changed = self.bunch.take_changed_curves() if self.__tracked else []
+        camera = camera or self.__camera
+
+        if (
+                self.surface is None
+                or viewport != self.__viewport
+                or camera.state != self.__camera_state
+                or self.__is_grouped(changed)
+        ):
+            return self.__rebuild(viewport, camera)
+
+        if not changed:
+            return []
+
+        dirty = self.__update_curves_rects(changed, viewport)
+        if not dirty:
+            return []
+
+        visible = [rect.clip(viewport) for rect in dirty]
+        visible = [rect for rect in visible if rect.width and rect.height]
+
+        if not all(self.rect.contains(rect) for rect in visible):
+            return self.__reallocate(viewport)
+
+        # Every area costs a query and a pass of drawing, many of them are
+        #  slower to redraw than their union.
+        if len(visible) > MAX_REDRAW_RECTS:
+            visible = [visible[0].unionall(visible[1:])]
+
+        for rect in visible:
+            self.__redraw(rect)
+
+        return visible
+
+    def __rebuild(self, viewport: pygame.Rect, camera: Camera) -> List[pygame.Rect]:
+        self.__viewport = viewport.copy()
+        self.__camera = camera
+        self.__camera_state = camera.state
+
+        self.__curves_rects = {}
+        self.__curves_grid = SpatialGrid()
+
+        bounds = camera.to_world_bounds((
+            viewport.left - MARGIN, viewport.top - MARGIN,
+            viewport.right + MARGIN, viewport.bottom + MARGIN
+        ))
+
+        detailed, grouped = [], []
+        for curves in self.bunch.find_curves_groups(bounds, GROUP_SIZE / camera.zoom):
+            if len(curves) == 1 and self.__is_detailed(self.bunch.curves[curves.start]):
+                detailed.append(curves.start)
+            else:
+                grouped.append(curves)
+
+        self.__set_groups(grouped)
+        self.__update_curves_rects(detailed, viewport)
+
+        return self.__reallocate(viewport)
+
+    def __is_detailed(self, curve: ABCBezierCurve) -> bool:
+        # Incomplete curves are being edited, their control points are drawn.
+        if len(curve.vertices) < 4:
+            return True
+
+        left, top, right, bottom = curve.bounds
+        return max(right - left, bottom - top) * self.__camera.zoom >= GROUP_SIZE
+
+    def __set_groups(self, grouped: Sequence[range]):
+        """Join consecutive groups of curves to polylines through their ends."""
+
+        lines = []
+        for curves in grouped:
+            if lines and lines[-1][-1] == curves.start:
+                lines[-1].append(curves.stop)
+            else:
+                lines.append([curves.start, curves.stop])
+
+        last = len(self.bunch.vertices) - 1
+
+        self.__groups = [
+            self.__camera.to_screen(self.bunch.vertices[numpy.minimum(3 * numpy.array(line), last)])
+            for line in lines
+        ]
+        self.__groups_rects = [self.__get_points_rect(points) for points in self.__groups]
+        self.__grouped = numpy.array([(curves.start, curves.stop) for curves in grouped], dtype=numpy.int64).reshape(-1, 2)
+
+    def __is_grouped(self, indices: Iterable[int]) -> bool:
+        if not len(self.__grouped) or not indices:
+            return False
+
+        indices = numpy.fromiter(indices, dtype=numpy.int64)
+        groups = numpy.searchsorted(self.__grouped[:, 0], indices, side="right") - 1
+
+        return bool(numpy.any((groups >= 0) & (indices < self.__grouped[groups, 1])))
+
+    def __update_curves_rects(
+            self,
+            indices: Iterable[int],
+            viewport: pygame.Rect
+    ) -> List[pygame.Rect]:
+        dirty = []
+
+        for index in indices:
+            old = self.__curves_rects.pop(index, None)
+
+            # Removed curves are reported as changed too.
+            curves = self.bunch.curves
+            new = self.__get_curve_rect(curves[index], viewport) if index < len(curves) else None
+
+            if new:
+                self.__curves_rects[index] = new
+                self.__curves_grid.insert(index, (new.left, new.top, new.right, new.bottom))
+            else:
+                self.__curves_grid.remove(index)
+
+            dirty.extend(rect for rect in (old, new) if rect)
+
+        return dirty
+
+    def __reallocate(self, viewport: pygame.Rect) -> List[pygame.Rect]:
+        old = self.rect
+
+        rects = [*self.__curves_rects.values(), *self.__groups_rects]
+        self.rect = rects[0].unionall(rects[1:]).clip(viewport) if rects else pygame.Rect(0, 0, 0, 0)
+
+        self.surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        self.__redraw(self.rect)
+
+        return [rect for rect in (old, self.rect) if rect]
+
+    def __redraw(self, area: pygame.Rect):
+        local = area.move(-self.rect.x, -self.rect.y)
+
+        self.surface.set_clip(local)
+        self.surface.fill(transparent, local)
+
+        candidates = self.__curves_grid.query((area.left, area.top, area.right, area.bottom))
+        offset = numpy.array(self.rect.topleft, dtype=numpy.float64)
+
+        ### Draw groups of small curves
+        for points, rect in zip(self.__groups, self.__groups_rects):
+            if rect.colliderect(area):
+                pygame.draw.lines(self.surface, red, False, points - offset, 2)
+
+                if profiler.enabled:
+                    profiler.count("points drawn", len(points))
+
+        self.__draw_curves(
+            [index for index in sorted(candidates) if self.__curves_rects[index].colliderect(area)],
+            offset
+        )
+
+        self.surface.set_clip(None)
+
+    def __get_curve_rect(self, curve: ABCBezierCurve, viewport: pygame.Rect) -> Optional[pygame.Rect]:
+        """Area of `curve` on the screen clipped by `viewport`, `None` if it is off-screen.
+
+        Zoomed in curve may be far larger than the screen, and its whole area
+         would take huge number of cells of the grid.
+        """
+
+        if curve.bounds is None:
+            return None
+
+        left, top, right, bottom = self.__camera.to_screen_bounds(curve.bounds)
+        left, top = math.floor(left) - MARGIN, math.floor(top) - MARGIN
+        right, bottom = math.ceil(right) + MARGIN, math.ceil(bottom) + MARGIN
+
+        if right < viewport.left or left >= viewport.right or bottom < viewport.top or top >= viewport.bottom:
+            return None
+
+        left, top = max(left, viewport.left), max(top, viewport.top)
+        right, bottom = min(right, viewport.right - 1), min(bottom, viewport.bottom - 1)
+
+        return pygame.Rect(left, top, right - left + 1, bottom - top + 1)
+
+    @staticmethod
+    def __get_points_rect(points: numpy.ndarray) -> pygame.Rect:
+        left, top = numpy.floor(points.min(axis=0)).astype(int).tolist()
+        right, bottom = numpy.ceil(points.max(axis=0)).astype(int).tolist()
+
+        return pygame.Rect(left - 1, top - 1, right - left + 3, bottom - top + 3)
+
+    def __draw_curves(self, indices: Sequence[int], offset: numpy.ndarray):
+        """Draw curves by runs of consecutive ones, one polyline per colour and run.
+
+        Points of all runs are gathered into reused buffer and transformed at
+         once, control points are stamped from one sprite by single `blits`.
+        """
+
+        curves = self.bunch.curves
+        vertices = self.bunch.vertices
+
+        runs: List[List[int]] = []  # Curves `[start, stop)` and points `[start, stop)` in buffer.
+        levels = []
+        count = 0
+
+        for index in indices:
+            curve = curves[index]
+            points = self.__get_level_points(curve, self.__camera) if len(curve.vertices) == 4 else ()
+            if not len(points):
+                continue
+
+            # Neighbouring curves share end points.
+            if runs and runs[-1][1] == index:
+                runs[-1][1] = index + 1
+                points = points[1:]
+            else:
+                runs.append([index, index + 1, count, count])
+
+            levels.append(points)
+            count += len(points)
+            runs[-1][3] = count
+
+        ### Draw control points
+        markers = numpy.unique((3 * numpy.asarray(indices, dtype=numpy.int64)).reshape(-1, 1) + numpy.arange(4))
+        markers = markers[markers < len(vertices)]
+        positions = (self.__camera.to_screen(vertices[markers]) - offset).astype(int) - MARKER_RADIUS
+
+        sprite = marker_sprite()
+        self.surface.blits([(sprite, position) for position in positions.tolist()], doreturn=False)
+
+        if not runs:
+            return
+
+        buffer = self.__get_points_buffer(count)
+        numpy.concatenate(levels, out=buffer)
+
+        buffer -= self.__camera.position
+        buffer *= self.__camera.zoom
+        buffer -= offset
+
+        for curves_start, curves_stop, points_start, points_stop in runs:
+            polygon = self.__camera.to_screen(vertices[3 * curves_start:3 * curves_stop + 1]) - offset
+
+            ### Draw control "lines"
+            pygame.draw.lines(self.surface, lightgray, False, polygon)
+            ### Draw bezier curves
+            pygame.draw.lines(self.surface, red, False, buffer[points_start:points_stop], 2)
+
+        if profiler.enabled:
+            profiler.count("points drawn", count)
+
+    def __get_points_buffer(self, count: int) -> numpy.ndarray:
+        """View of `count` points of buffer, which grows twice when needed."""
+
+        if len(self.__points_buffer) < count:
+            self.__points_buffer = numpy.empty((max(count, 2 * len(self.__points_buffer)), 2), dtype=numpy.float64)
+
+        return self.__points_buffer[:count]
+
+    @staticmethod
+    def __get_level_points(curve: ABCBezierCurve, camera: Camera) -> numpy.ndarray:
+        """Sampled points of `curve` while they are fine enough, level of detail points otherwise.
+
+        Points are sampled, e.g. in background, within flatness in pixels at
+         scale 1:1, so they stay within it on the screen at any zoom out.
+         They are replaced by coarser level, only when they are denser than
+         `SEGMENT_PIXELS` on the screen.
+
+        Levels are calculated here, in the render: for zoomed in view and for
+         coarse levels of zoomed out one. Their cost is bounded, every level
+         has at most `size / SEGMENT_PIXELS` steps for size of the curve on
+         the screen, at most `MAX_LEVEL_RESOLUTION`, and is cached by the
+         curve until it changes.
+        """
+
+        left, top, right, bottom = curve.bounds
+        size = max(right - left, bottom - top) * camera.zoom
+
+        if camera.zoom <= 1:
+            points = numpy.asarray(curve.points, dtype=numpy.float64).reshape(-1, 2)
+
+            # Deferred curves have no points until they are sampled.
+            if len(points) and (camera.zoom == 1 or len(points) - 1 <= size / SEGMENT_PIXELS):
+                return points
+
+        # Deviation of sampled points from the curve falls as square of
+        #  resolution, so it stays the same on screen with `sqrt(zoom)` times
+        #  more steps. Steps shorter than `SEGMENT_PIXELS` aren't needed.
+        resolution = min(curve.resolution * math.sqrt(camera.zoom), size / SEGMENT_PIXELS)
+
+        return curve.level_points(resolution)
+
+
+@lru_cache(maxsize=None)
+def marker_sprite() -> pygame.Surface:
+    """Control point marker, stamped instead of drawing every circle."""
+
+    size = 2 * MARKER_RADIUS + 1
+
+    sprite = pygame.Surface((size, size))
+    sprite.fill(black)
+    pygame.draw.circle(sprite, blue, (MARKER_RADIUS, MARKER_RADIUS), MARKER_RADIUS)
+
+    # Colour key is blitted faster than alpha of every pixel, RLE faster still.
+    sprite.set_colorkey(black, pygame.RLEACCEL)
+
+    return sprite
@@ -0,0 +1,44 @@
+import pygame
+
+from collections import OrderedDict
+from typing import Tuple
+
+from render.colors import white
+
+
+class TextCache:
+    """Rendered text surfaces by text and colour, the least recently used
+     ones are evicted.
+
+    Rendering of text is the slowest part of a frame with a few changes, and
+     the same strings come again and again: modes, hints, values of counters.
+    """
+
+    def __init__(self, font: pygame.font.Font, max_size: int = 256):
+        self.font = font
+        self.max_size = max_size
+
+        self.__surfaces: "OrderedDict[Tuple[str, Tuple[int, ...]], pygame.Surface]" = OrderedDict()
+
+    def __len__(self):
+        return len(self.__surfaces)
+
+    def render(self, text: str, color: pygame.Color = white) -> pygame.Surface:
+        """Surface of `text`, shouldn't be drawn on, it's shared."""
+
+        key = text, tuple(color)
+
+        surface = self.__surfaces.get(key)
+        if surface is not None:
+            self.__surfaces.move_to_end(key)
+            return surface
+
+        surface = self.__surfaces[key] = self.font.render(text, True, color)
+
+        if len(self.__surfaces) > self.max_size:
+            self.__surfaces.popitem(last=False)
+
+        return surface
+
+    def clear(self):
+        self.__surfaces.clear()
@@ -0,0 +1,5 @@
+import os
+
+# Render tests draw offscreen, and pygame greets in stdout on import.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
@@ -0,0 +1,92 @@
+import numpy
+import pygame
+import pytest
+
+from app import App
+
+
+@pytest.fixture
+def app():
+    app = App()
+    app.state["mode"] = app.MODE_NORMAL
+
+    yield app
+
+    app.sampling.close()
+    pygame.quit()
+
+
+def click(app: App, position):
+    app._add_point_to_temp_curve(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=position, button=1))
+
+
+def press(app: App, callback, key: int, mod: int = 0):
+    callback(pygame.event.Event(pygame.KEYDOWN, key=key, mod=mod))
+
+
+def test_undo_leaves_curve_completion(app):
+    press(app, app._add_curve, pygame.K_a)
+    for i in range(4):
+        click(app, (10 * i, 5 * i))
+
+    assert app.state["mode"] == app.MODE_CURVE_COMPLETION
+
+    press(app, app._undo, pygame.K_z, pygame.KMOD_CTRL)
+    assert app.state["mode"] == app.MODE_CURVE_CREATING
+    assert app._enter_event_id is None
+
+    press(app, app._redo, pygame.K_y, pygame.KMOD_CTRL)
+    assert app.state["mode"] == app.MODE_CURVE_COMPLETION
+
+    press(app, app._complete_curve, pygame.K_RETURN)
+    assert len(app._curves) == 1
+    assert len(app._curves[0].vertices) == 4
+
+
+def test_new_curve_drops_edits_of_not_finished_one(app):
+    press(app, app._add_curve, pygame.K_a)
+    for i in range(4):
+        click(app, (10 * i, 5 * i))
+
+    press(app, app._add_curve, pygame.K_a)
+    click(app, (100, 100))
+
+    assert len(app.history) == 1
+    assert app._enter_event_id is None
+
+    press(app, app._undo, pygame.K_z, pygame.KMOD_CTRL)
+    assert len(app._temp_curve.vertices) == 0
+    assert not app.history.can_undo
+
+
+def test_interrupted_curve_drops_enter(app):
+    press(app, app._add_curve, pygame.K_a)
+    for i in range(4):
+        click(app, (10 * i, 5 * i))
+
+    press(app, app._interrupt_adding_curve, pygame.K_ESCAPE)
+
+    assert app._temp_curve is None
+    assert app._enter_event_id is None
+    assert not app.history.can_undo
+
+
+def test_open_the_last_saved_track(app, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    press(app, app._add_curve, pygame.K_a)
+    for i in range(4):
+        click(app, (10 * i, 5 * i))
+    press(app, app._complete_curve, pygame.K_RETURN)
+
+    press(app, app.save, pygame.K_s)
+    press(app, app.save_binary, pygame.K_b)
+    expected = app._curves[0].vertices.copy()
+
+    press(app, app.open, pygame.K_o)
+
+    assert len(app._curves) == 1
+    numpy.testing.assert_array_equal(app._curves[0].vertices, expected)
+
+    # Binary track is saved the last, its vertices are mapped.
+    assert not app._curves[0].vertices.flags.writeable
@@ -0,0 +1,66 @@
+import numpy
+
+from bezier import ArcLengthTable, BezierCurvesBunch, bunch_controls
+
+
+VERTICES = numpy.array([
+    (0.0, 0.0), (40.0, 120.0), (130.0, -70.0), (200.0, 50.0),
+    (270.0, 170.0), (300.0, 0.0), (380.0, 20.0),
+])
+
+
+def test_length_of_line():
+    table = ArcLengthTable(bunch_controls([(0, 0), (1, 1), (2, 2), (3, 3), (3, 5), (3, 7), (3, 9)]))
+
+    assert len(table) == 2
+    numpy.testing.assert_allclose(table.lengths, [3 * 2 ** 0.5, 6.0])
+    numpy.testing.assert_allclose(table.length, 3 * 2 ** 0.5 + 6.0)
+
+    # Line with uniform control points has constant speed.
+    numpy.testing.assert_allclose(table.distance_at([0.5, 1.5]), [1.5 * 2 ** 0.5, 3 * 2 ** 0.5 + 3.0])
+
+
+def test_length_converges_to_curve_length():
+    controls = bunch_controls(VERTICES)
+
+    reference = ArcLengthTable(controls, steps=4096).length
+    numpy.testing.assert_allclose(ArcLengthTable(controls).length, reference, rtol=1e-3)
+
+
+def test_t_at_is_inverse_of_distance_at():
+    table = ArcLengthTable(bunch_controls(VERTICES))
+
+    t = numpy.linspace(0.0, 2.0, 101)
+    numpy.testing.assert_allclose(table.t_at(table.distance_at(t)), t, atol=1e-12)
+
+    # Distances out of the bunch are clamped to its ends.
+    numpy.testing.assert_allclose(table.t_at([-1.0, table.length + 1.0]), [0.0, 2.0])
+
+
+def test_points_at_distance_are_uniform():
+    bunch = BezierCurvesBunch.from_vertices(VERTICES)
+
+    points = bunch.point_at_distance(numpy.linspace(0.0, bunch.arc_length.length, 201))
+    chords = numpy.hypot(*numpy.diff(points, axis=0).T)
+
+    # Parameter is interpolated linearly within chords of the table.
+    numpy.testing.assert_allclose(chords, chords.mean(), rtol=0.1)
+    numpy.testing.assert_allclose(points[[0, -1]], VERTICES[[0, -1]])
+
+
+def test_bunch_table_follows_edits():
+    bunch = BezierCurvesBunch.from_vertices(VERTICES)
+    length = bunch.arc_length.length
+
+    bunch.select_point(5)
+    bunch.move_point((300.0, 300.0))
+    bunch.save_point_position()
+
+    expected = ArcLengthTable(bunch_controls(bunch.vertices))
+    assert bunch.arc_length.length != length
+    numpy.testing.assert_allclose(bunch.arc_length.lengths, expected.lengths)
+
+    bunch.add_vertex((400.0, 0.0))
+    bunch.add_vertex((420.0, 40.0))
+    bunch.add_vertex((500.0, 40.0))
+    assert len(bunch.arc_length) == 3
@@ -0,0 +1,26 @@
+import time
+
+from benchmarks.runner import compare, measure
+
+
+def test_measure_leaves_out_calibration():
+    calls = []
+
+    def target():
+        # The first call is cold, like building of caches.
+        time.sleep(0.05 if not calls else 0.0001)
+        calls.append(None)
+
+    result = measure(target, repeat=3, min_time=0.001)
+
+    assert result["median"] < 0.01
+    assert len(calls) > result["loops"] * result["repeat"]
+
+
+def test_compare():
+    baseline = {"a": {"min": 1.0}, "b": {"min": 1.0}, "c": {"min": 1.0}, "gone": {"min": 1.0}}
+    results = {"a": {"min": 1.05}, "b": {"min": 1.5}, "c": {"min": 0.5}, "new": {"min": 1.0}}
+
+    statuses = {c.name: c.status for c in compare(results, baseline, threshold=0.1)}
+
+    assert statuses == {"a": "ok", "b": "regression", "c": "improvement", "gone": "missing", "new": "new"}
@@ -0,0 +1,68 @@
+import numpy
+
+from bezier.bvh import BoundsTree
+
+
+EVERYTHING = (-numpy.inf, -numpy.inf, numpy.inf, numpy.inf)
+
+
+def random_boxes(count: int, seed: int = 0) -> numpy.ndarray:
+    rng = numpy.random.default_rng(seed)
+
+    corners = rng.uniform(-500, 500, (count, 2))
+    return numpy.concatenate([corners, corners + rng.uniform(0, 200, (count, 2))], axis=1)
+
+
+def expand(ranges) -> list:
+    return [index for start, stop in ranges for index in range(start, stop)]
+
+
+def intersected(boxes: numpy.ndarray, query) -> list:
+    left, top, right, bottom = query
+
+    return numpy.flatnonzero(
+        (boxes[:, 0] <= right) & (boxes[:, 2] >= left) & (boxes[:, 1] <= bottom) & (boxes[:, 3] >= top)
+    ).tolist()
+
+
+def test_query_is_the_same_as_scan():
+    boxes = random_boxes(300)
+    tree = BoundsTree(boxes)
+
+    for query in random_boxes(100, seed=1).tolist():
+        assert expand(tree.query(query)) == intersected(boxes, query)
+
+
+def test_update_appends_and_moves_leaves():
+    boxes = random_boxes(5)
+    tree = BoundsTree(boxes[:3])
+
+    tree.update(3, tuple(boxes[3]))
+    tree.update(4, tuple(boxes[4]))
+    tree.update(0, (1000.0, 1000.0, 1001.0, 1001.0))
+
+    boxes[0] = 1000.0, 1000.0, 1001.0, 1001.0
+
+    assert len(tree) == 5
+    assert tree.bounds == tuple(boxes[:, :2].min(axis=0).tolist() + boxes[:, 2:].max(axis=0).tolist())
+    for query in random_boxes(50, seed=2).tolist():
+        assert expand(tree.query(query)) == intersected(boxes, query)
+
+
+def test_cut_covers_all_leaves_in_order():
+    tree = BoundsTree(random_boxes(100))
+
+    ranges = tree.cut(EVERYTHING, 300.0)
+
+    assert expand(ranges) == list(range(100))
+
+
+def test_truncate():
+    boxes = random_boxes(13)
+    tree = BoundsTree(boxes)
+
+    tree.truncate(5)
+
+    assert len(tree) == 5
+    assert tree.bounds == BoundsTree(boxes[:5]).bounds
+    assert tree.query(EVERYTHING) == [(0, 5)]
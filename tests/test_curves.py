@@ -0,0 +1,59 @@
+import numpy
+import pytest
+
+from bezier import BezierCurve, BezierCurvesBunch
+
+
+def test_curve_views_are_created_on_access():
+    bunch = BezierCurvesBunch.from_vertices(numpy.arange(62.0).reshape(31, 2))
+
+    assert len(bunch.curves) == 10
+    assert bunch.curves.peek(5) is None
+
+    curve = bunch.curves[5]
+    assert bunch.curves.peek(5) is curve
+    assert bunch.curves[-1].offset == 27
+    numpy.testing.assert_array_equal(curve.vertices, bunch.vertices[15:19])
+
+
+def test_samples_wait_for_views():
+    bunch = BezierCurvesBunch.from_vertices(numpy.arange(62.0).reshape(31, 2), deferred=True)
+
+    indices = bunch.take_unsampled_curves()
+    versions, resolutions = bunch.curves_state(indices)
+    points = [numpy.full((3, 2), float(index)) for index in indices]
+
+    assert bunch.apply_samples(indices, versions, points, [1.0] * len(indices))
+    assert bunch.curves.peek(4) is None
+
+    # State of waiting curves doesn't take their samples.
+    numpy.testing.assert_array_equal(bunch.curves_state(indices)[0], versions)
+    numpy.testing.assert_array_equal(bunch.curves[4].points, points[4])
+
+
+@pytest.mark.parametrize("resolution", [1, 2, 3, 10, 30, 100])
+def test_vectorized_points_match_forward_differences(monkeypatch, resolution):
+    vertices = [(0.0, 0.0), (40.0, 120.0), (130.0, -70.0), (200.0, 50.0)]
+
+    vectorized = BezierCurve(vertices, resolution).points
+
+    monkeypatch.setattr(BezierCurve, "vectorized", False)
+    forward = BezierCurve(vertices, resolution).points
+
+    assert len(vectorized) == len(forward) == resolution + 1
+    numpy.testing.assert_allclose(vectorized, numpy.array([tuple(point) for point in forward]), atol=1e-9)
+
+
+def test_flatness_is_switched_off():
+    bunch = BezierCurvesBunch.from_vertices(
+        [(0.0, 0.0), (400.0, 1200.0), (1300.0, -700.0), (2000.0, 500.0)]
+    )
+
+    bunch.set_flatness(0.1)
+    assert len(bunch.curves[-1].points) > BezierCurve.DEFAULT_RESOLUTION + 1
+
+    bunch.set_flatness(None)
+    assert bunch.flatness is None
+    for curve in bunch.curves:
+        assert len(curve.points) == BezierCurve.DEFAULT_RESOLUTION + 1
+        assert curve.resolution == BezierCurve.DEFAULT_RESOLUTION
@@ -0,0 +1,54 @@
+import numpy
+import pytest
+
+from bezier import BezierCurve, BezierCurvesBunch, evaluate_at, evaluate_frames
+
+
+VERTICES = numpy.array([
+    (0.0, 0.0), (40.0, 120.0), (130.0, -70.0), (200.0, 50.0),
+    (270.0, 170.0), (300.0, 0.0), (380.0, 20.0),
+])
+
+
+def test_points_at_match_sampled_points():
+    bunch = BezierCurvesBunch.from_vertices(VERTICES)
+    t = numpy.linspace(0.0, 2.0, 61)
+
+    points = bunch.points_at(t)
+    expected = numpy.concatenate([bunch.curves[0].points[:-1], bunch.curves[1].points])
+
+    numpy.testing.assert_allclose(points, expected, atol=1e-9)
+
+
+def test_t_out_of_bunch_is_clamped():
+    points = evaluate_at(VERTICES, numpy.array([-1.0, 0.0, 2.0, 3.5]))
+
+    numpy.testing.assert_allclose(points, VERTICES[[0, 0, -1, -1]])
+
+    frames = evaluate_frames(VERTICES, numpy.array([-1.0, 3.5]))
+    numpy.testing.assert_allclose(frames.points, VERTICES[[0, -1]])
+
+
+def test_frames_of_curve():
+    curve = BezierCurve(VERTICES[:4].tolist())
+    t = numpy.linspace(0.0, 1.0, 11)
+
+    frames = curve.frames_at(t)
+
+    # Derivative of the curve by finite differences.
+    step = 1e-6
+    numeric = (curve.points_at(numpy.clip(t + step, 0, 1)) - curve.points_at(numpy.clip(t - step, 0, 1)))
+    numeric /= (numpy.clip(t + step, 0, 1) - numpy.clip(t - step, 0, 1))[:, None]
+    numpy.testing.assert_allclose(frames.derivatives, numeric, rtol=1e-4, atol=1e-3)
+
+    numpy.testing.assert_allclose(numpy.hypot(*frames.normals.T), 1.0)
+    numpy.testing.assert_allclose(numpy.einsum("ij,ij->i", frames.normals, frames.derivatives), 0.0, atol=1e-9)
+
+    # Curvature of a straight line is zero.
+    line = BezierCurve([(0, 0), (1, 1), (2, 2), (3, 3)])
+    numpy.testing.assert_allclose(line.frames_at(t).curvature, 0.0, atol=1e-12)
+
+
+def test_evaluation_needs_complete_curve():
+    with pytest.raises(ValueError):
+        evaluate_at(VERTICES[:3], numpy.array([0.5]))
@@ -0,0 +1,77 @@
+import random
+
+import pygame
+
+from app.events.store import SubscriptionsStore
+from app.events.subscriptions import EventSubscription
+
+
+def subscribe(store: SubscriptionsStore, event_type: int, conditions=None) -> EventSubscription:
+    subscription = EventSubscription(lambda *args: None, event_type, conditions=conditions)
+    store.add(subscription)
+
+    return subscription
+
+
+def matched(store: SubscriptionsStore, event) -> list:
+    return [s for s, check in store.match(event) if not check or s.check_conditions(event)]
+
+
+def scanned(subscriptions: list, event) -> list:
+    return [s for s in subscriptions if s.event_type == event.type and s.check_conditions(event)]
+
+
+def test_match_is_the_same_as_scan():
+    random.seed(3)
+
+    store = SubscriptionsStore()
+    conditions = [
+        None,
+        {"key": pygame.K_a},
+        {"key": pygame.K_b},
+        {"key": [pygame.K_a, pygame.K_c]},
+        {"key": pygame.K_a, "mod": pygame.KMOD_CTRL},
+        {"mod": pygame.KMOD_CTRL},
+    ]
+    subscriptions = [
+        subscribe(store, random.choice([pygame.KEYDOWN, pygame.KEYUP]), random.choice(conditions))
+        for _ in range(50)
+    ]
+
+    for key in (pygame.K_a, pygame.K_b, pygame.K_c, pygame.K_d):
+        for mod in (pygame.KMOD_NONE, pygame.KMOD_CTRL):
+            for event_type in (pygame.KEYDOWN, pygame.KEYUP):
+                event = pygame.event.Event(event_type, key=key, mod=mod)
+                assert matched(store, event) == scanned(subscriptions, event)
+
+    event = pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1)
+    assert matched(store, event) == []
+
+
+def test_match_keeps_order_of_subscribing():
+    store = SubscriptionsStore()
+
+    first = subscribe(store, pygame.KEYDOWN, {"key": pygame.K_a})
+    second = subscribe(store, pygame.KEYDOWN)
+    third = subscribe(store, pygame.KEYDOWN, {"key": [pygame.K_b, pygame.K_a]})
+
+    event = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a)
+    assert [s for s, _ in store.match(event)] == [first, second, third]
+
+
+def test_changes_of_subscriptions_rebuild_match():
+    store = SubscriptionsStore()
+    event = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a)
+
+    first = subscribe(store, pygame.KEYDOWN, {"key": pygame.K_a})
+    assert matched(store, event) == [first]
+
+    second = subscribe(store, pygame.KEYDOWN)
+    assert matched(store, event) == [first, second]
+
+    assert store.remove(first.id)
+    assert matched(store, event) == [second]
+
+    assert store.remove(second.id)
+    assert not store.remove(second.id)
+    assert matched(store, event) == []
@@ -0,0 +1,99 @@
+import io
+import numpy
+import pygame
+import pytest
+
+from bezier import BezierCurvesBunch
+from render.colors import gray
+from render.export import PngWriter, export_png, export_svg
+
+
+def decode_png(data: bytes) -> numpy.ndarray:
+    """Pixels of PNG decoded by pygame, `(height, width, 3)`."""
+
+    image = pygame.image.load(io.BytesIO(data), "image.png")
+    width, height = image.get_size()
+
+    return numpy.frombuffer(pygame.image.tobytes(image, "RGB"), dtype=numpy.uint8).reshape(height, width, 3)
+
+
+@pytest.mark.parametrize("strips", [[7], [3, 4], [1] * 7])
+def test_png_writer_is_decoded(strips):
+    pixels = numpy.random.default_rng(0).integers(0, 256, (7, 13, 3), dtype=numpy.uint8)
+
+    file = io.BytesIO()
+    writer = PngWriter(file, (13, 7))
+
+    top = 0
+    for height in strips:
+        writer.write(pixels[top:top + height])
+        top += height
+
+    writer.close()
+
+    numpy.testing.assert_array_equal(decode_png(file.getvalue()), pixels)
+
+
+def test_png_writer_checks_rows():
+    writer = PngWriter(io.BytesIO(), (4, 2))
+
+    with pytest.raises(ValueError):
+        writer.write(numpy.zeros((1, 5, 3), dtype=numpy.uint8))
+
+    writer.write(numpy.zeros((1, 4, 3), dtype=numpy.uint8))
+
+    with pytest.raises(ValueError):
+        writer.write(numpy.zeros((2, 4, 3), dtype=numpy.uint8))
+
+    with pytest.raises(ValueError):
+        writer.close()
+
+
+def test_export_png_draws_curves():
+    vertices = numpy.random.default_rng(0).uniform(0, 1000, (31, 2))
+    bunch = BezierCurvesBunch.from_vertices(vertices, flatness=0.5)
+
+    file = io.BytesIO()
+    export_png([bunch], file, (300, 600))
+
+    pixels = decode_png(file.getvalue())
+
+    assert pixels.shape == (600, 300, 3)
+    assert (pixels != (gray.r, gray.g, gray.b)).any(axis=2).sum() > 1000
+
+    # Export draws aside of the app render and leaves changes of curves to it.
+    assert bunch.take_changed_curves()
+
+
+def test_export_svg_writes_cubic_segments():
+    vertices = numpy.arange(14.0).reshape(7, 2)
+    bunch = BezierCurvesBunch.from_vertices(vertices)
+
+    file = io.StringIO()
+    export_svg([bunch], file, controls=True)
+    svg = file.getvalue()
+
+    assert svg.startswith("<svg")
+    assert svg.count("\nC ") == 2
+    assert svg.count("<circle") == 7
+
+
+def test_export_of_empty_bunches():
+    # Bunch of new curve is empty right after it is started in the app.
+    bunches = [BezierCurvesBunch(), BezierCurvesBunch.from_vertices(numpy.arange(14.0).reshape(7, 2))]
+
+    file = io.StringIO()
+    export_svg(bunches, file, controls=True)
+    assert file.getvalue().count("\nC ") == 2
+
+    file = io.StringIO()
+    export_svg([BezierCurvesBunch()], file)
+    assert "<path" not in file.getvalue()
+
+    file = io.BytesIO()
+    export_png(bunches, file, (64, 48))
+    assert decode_png(file.getvalue()).shape == (48, 64, 3)
+
+    file = io.BytesIO()
+    export_png([BezierCurvesBunch()], file, (64, 48))
+    assert decode_png(file.getvalue()).shape == (48, 64, 3)
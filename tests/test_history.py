@@ -0,0 +1,150 @@
+import numpy
+import pytest
+
+from bezier import BezierCurvesBunch, EditHistory
+
+
+def assert_same_bunch(bunch: BezierCurvesBunch, expected: numpy.ndarray):
+    """Bunch restored by history is the same as built from `expected` vertices at once."""
+
+    reference = BezierCurvesBunch.from_vertices(expected)
+
+    numpy.testing.assert_array_equal(bunch.vertices, reference.vertices)
+
+    assert len(bunch.curves) == len(reference.curves)
+    for curve, reference_curve in zip(bunch.curves, reference.curves):
+        numpy.testing.assert_array_equal(curve.vertices, reference_curve.vertices)
+        numpy.testing.assert_allclose(
+            numpy.asarray(curve.points, dtype=numpy.float64).reshape(-1, 2),
+            numpy.asarray(reference_curve.points, dtype=numpy.float64).reshape(-1, 2)
+        )
+
+    if len(expected) < 4:
+        return
+
+    assert bunch.bounds == reference.bounds
+    assert bunch.find_curves(reference.bounds) == reference.find_curves(reference.bounds)
+
+    for vertex in expected.tolist():
+        found = bunch.find_vertex(vertex, 1.0)
+        assert found is not None
+        numpy.testing.assert_array_equal(bunch.vertices[found], vertex)
+
+    for index in range(len(expected) // 3):
+        curve = reference.curves[index]
+        if len(curve.points):
+            point = tuple(curve.points[len(curve.points) // 2])
+            assert bunch.find_point_on_curve(point, 1.0) is not None
+
+
+@pytest.fixture
+def vertices():
+    return numpy.random.default_rng(0).uniform(0, 1000, (40, 2))
+
+
+def test_undo_redo_of_added_vertices(vertices):
+    history = EditHistory()
+    bunch = BezierCurvesBunch(history=history)
+
+    for vertex in vertices[:20]:
+        bunch.add_vertex(vertex)
+
+    # Indexes are built before truncation, undo should keep them right.
+    bunch.find_vertex((0, 0), 1.0)
+    bunch.bounds
+
+    for vertex in vertices[20:]:
+        bunch.add_vertex(vertex)
+
+    for size in range(39, 3, -1):
+        history.undo()
+        assert_same_bunch(bunch, vertices[:size])
+
+        # Removed vertex is out of index.
+        assert bunch.find_vertex(vertices[size], 1.0) is None
+
+    for size in range(5, 41):
+        history.redo()
+        assert_same_bunch(bunch, vertices[:size])
+
+
+def test_undo_redo_of_moved_vertices(vertices):
+    history = EditHistory()
+    bunch = BezierCurvesBunch.from_vertices(vertices[:31], history=history)
+
+    expected = [vertices[:31].copy()]
+    for index, offset in ((0, (5, 0)), (3, (0, -7)), (15, (2, 2)), (30, (-1, 4)), (3, (3, 3))):
+        bunch.select_point(index)
+        bunch.move_point(bunch.vertices[index] + offset)
+        bunch.save_point_position()
+
+        state = expected[-1].copy()
+        state[index] += offset
+        expected.append(state)
+
+    assert len(history) == 5
+    assert_same_bunch(bunch, expected[-1])
+
+    for state in reversed(expected[:-1]):
+        history.undo()
+        assert_same_bunch(bunch, state)
+
+    for state in expected[1:]:
+        history.redo()
+        assert_same_bunch(bunch, state)
+
+
+def test_cancelled_move_is_not_recorded(vertices):
+    history = EditHistory()
+    bunch = BezierCurvesBunch.from_vertices(vertices[:7], history=history)
+
+    bunch.select_point(3)
+    bunch.move_point((0, 0))
+    bunch.cancel_point_selection()
+
+    assert not history.can_undo
+    assert_same_bunch(bunch, vertices[:7])
+
+
+def test_new_edit_drops_undone(vertices):
+    history = EditHistory()
+    bunch = BezierCurvesBunch(history=history)
+
+    for vertex in vertices[:10]:
+        bunch.add_vertex(vertex)
+
+    history.undo()
+    history.undo()
+    bunch.add_vertex(vertices[20])
+
+    assert not history.can_redo
+    assert_same_bunch(bunch, numpy.concatenate([vertices[:8], vertices[20:21]]))
+
+
+def test_undo_to_empty_bunch(vertices):
+    history = EditHistory()
+    bunch = BezierCurvesBunch(history=history)
+
+    for vertex in vertices[:7]:
+        bunch.add_vertex(vertex)
+
+    while history.undo():
+        pass
+
+    assert len(bunch.vertices) == 0
+    assert len(bunch.curves) == 1
+
+    for vertex in vertices[:7]:
+        bunch.add_vertex(vertex)
+
+    assert_same_bunch(bunch, vertices[:7])
+
+
+def test_history_is_bounded():
+    history = EditHistory(max_edits=3)
+    bunch = BezierCurvesBunch(history=history)
+
+    for vertex in numpy.arange(10.0).reshape(5, 2):
+        bunch.add_vertex(vertex)
+
+    assert len(history) == 3
@@ -0,0 +1,175 @@
+import json
+import numpy
+import pytest
+import struct
+
+from bezier import BezierCurvesBunch
+from tracks.io import dump_binary, dump_json, is_binary, iter_json, load_binary, load_json, load_track
+
+
+@pytest.fixture
+def track():
+    rng = numpy.random.default_rng(0)
+
+    return [rng.normal(0, 100, (count, 2)) for count in (7, 1, 0, 4, 301)]
+
+
+def test_binary_round_trip(track, tmp_path):
+    path = str(tmp_path / "track.bin")
+    dump_binary(track, path)
+
+    loaded = load_binary(path)
+
+    assert is_binary(path)
+    assert len(loaded) == len(track)
+    for vertices, expected in zip(loaded, track):
+        assert vertices.shape == expected.shape
+        numpy.testing.assert_array_equal(vertices, expected)
+
+
+def test_binary_round_trip_of_single_floats(track, tmp_path):
+    path = str(tmp_path / "track.bin")
+    dump_binary(track, path, float_size=4)
+
+    for vertices, expected in zip(load_binary(path), track):
+        assert vertices.dtype == numpy.float32
+        numpy.testing.assert_array_equal(vertices, expected.astype(numpy.float32))
+
+
+def test_binary_vertices_are_read_only_views(track, tmp_path):
+    path = str(tmp_path / "track.bin")
+    dump_binary(track, path)
+
+    vertices = load_binary(path)[0]
+
+    with pytest.raises(ValueError):
+        vertices[0] = 0, 0
+
+
+def test_empty_binary_track(tmp_path):
+    path = str(tmp_path / "track.bin")
+    dump_binary([], path)
+
+    assert load_binary(path) == []
+
+
+@pytest.mark.parametrize("size", [0, 5, 23, 24, 40, 64, 100])
+def test_truncated_binary_track(track, tmp_path, size):
+    path = tmp_path / "track.bin"
+    dump_binary(track, str(path))
+    path.write_bytes(path.read_bytes()[:size])
+
+    with pytest.raises(ValueError):
+        load_binary(str(path))
+
+
+def test_not_binary_track(tmp_path):
+    path = tmp_path / "track.bin"
+    path.write_bytes(b"NOTTRACK" + bytes(64))
+
+    with pytest.raises(ValueError, match="not a binary track"):
+        load_binary(str(path))
+
+
+@pytest.mark.parametrize("offsets", [[1, 3, 4], [0, 3, 2], [0, 5, 4]])
+def test_malformed_binary_offsets(tmp_path, offsets):
+    path = tmp_path / "track.bin"
+    dump_binary([numpy.ones((3, 2)), numpy.ones((1, 2))], str(path))
+
+    data = bytearray(path.read_bytes())
+    struct.pack_into("<3Q", data, 24, *offsets)
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(ValueError):
+        load_binary(str(path))
+
+
+def test_binary_track_is_saved_over_mapped_one(track, tmp_path):
+    path = str(tmp_path / "track.bin")
+    dump_binary(track, path)
+
+    loaded = load_binary(path)
+    dump_binary([vertices + 1 for vertices in track], path)
+
+    # Mapped vertices of replaced file stay readable and unchanged.
+    numpy.testing.assert_array_equal(loaded[-1], track[-1])
+    numpy.testing.assert_array_equal(load_binary(path)[-1], track[-1] + 1)
+
+
+def test_bunch_shares_mapped_vertices_until_edit(track, tmp_path):
+    path = str(tmp_path / "track.bin")
+    dump_binary(track, path)
+
+    mapped = load_binary(path)[-1]
+    bunch = BezierCurvesBunch.from_vertices(mapped)
+
+    assert numpy.shares_memory(bunch.vertices, mapped)
+
+    bunch.select_point(3)
+    bunch.move_point((0.0, 0.0))
+    bunch.save_point_position()
+
+    assert not numpy.shares_memory(bunch.vertices, mapped)
+    numpy.testing.assert_array_equal(bunch.vertices[3], (0.0, 0.0))
+    numpy.testing.assert_array_equal(mapped, track[-1])
+    numpy.testing.assert_array_equal(bunch.vertices[4:], track[-1][4:])
+
+
+def test_bunch_adds_vertex_to_mapped_vertices(track, tmp_path):
+    path = str(tmp_path / "track.bin")
+    dump_binary(track, path)
+
+    bunch = BezierCurvesBunch.from_vertices(load_binary(path)[0])
+    bunch.add_vertex((1.0, 2.0))
+
+    numpy.testing.assert_array_equal(bunch.vertices, numpy.concatenate([track[0], [(1.0, 2.0)]]))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 16])
+def test_json_round_trip(track, tmp_path, chunk_size):
+    path = str(tmp_path / "track.json")
+    dump_json(track, path)
+
+    loaded = list(iter_json(path, chunk_size))
+
+    assert len(loaded) == len(track)
+    for vertices, expected in zip(loaded, track):
+        assert vertices.shape == expected.shape
+        numpy.testing.assert_array_equal(vertices, expected)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 1 << 16])
+def test_json_bunches_with_other_keys(track, tmp_path, chunk_size):
+    data = {
+        "name": "track",
+        "curves": [
+            {"vertices": track[0].tolist(), "color": [1, 2], "meta": {"vertices": [[]]}},
+            {"id": 3, "vertices": track[3].tolist()},
+        ]
+    }
+
+    path = tmp_path / "track.json"
+    path.write_text(json.dumps(data, separators=(",", ":")))
+
+    loaded = list(iter_json(str(path), chunk_size))
+
+    assert len(loaded) == 2
+    numpy.testing.assert_array_equal(loaded[0], track[0])
+    numpy.testing.assert_array_equal(loaded[1], track[3])
+
+
+def test_json_ends_inside_of_vertices(tmp_path):
+    path = tmp_path / "track.json"
+    path.write_text('{"curves": [{"vertices": [[1, 2], [3')
+
+    with pytest.raises(ValueError):
+        load_json(str(path))
+
+
+def test_load_track_detects_format(track, tmp_path):
+    dump_json(track, str(tmp_path / "track.json"))
+    dump_binary(track, str(tmp_path / "track.bin"))
+
+    for name in ("track.json", "track.bin"):
+        for vertices, expected in zip(load_track(str(tmp_path / name)), track):
+            numpy.testing.assert_array_equal(vertices, expected)
@@ -0,0 +1,54 @@
+import numpy
+import pygame
+import pytest
+
+from bezier import BezierCurvesBunch
+from render.camera import Camera
+from render.layers import BunchLayer
+
+
+@pytest.fixture
+def bunch():
+    pygame.display.init()
+    yield BezierCurvesBunch.from_vertices(numpy.random.default_rng(0).uniform(0, 1000, (301, 2)), flatness=0.5)
+    pygame.display.quit()
+
+
+def test_camera_zooms_at_anchor():
+    camera = Camera()
+    anchor = (300.0, 200.0)
+    world = camera.to_world(anchor)
+
+    camera.zoom_at(4.0, anchor)
+
+    assert camera.zoom == 4.0
+    numpy.testing.assert_allclose(camera.to_screen(world), anchor)
+    numpy.testing.assert_allclose(camera.to_world(camera.to_screen((12.0, 34.0))), (12.0, 34.0))
+
+
+def test_camera_zoom_is_limited():
+    camera = Camera()
+
+    camera.zoom_at(1e9, (0, 0))
+    assert camera.zoom == Camera.MAX_ZOOM
+
+    camera.zoom_at(1e-18, (0, 0))
+    assert camera.zoom == Camera.MIN_ZOOM
+
+
+@pytest.mark.parametrize("zoom", [1e-3, 0.5, 1.0, 50.0, Camera.MAX_ZOOM])
+def test_layer_stays_in_viewport(bunch, zoom):
+    viewport = pygame.Rect(0, 0, 320, 240)
+    camera = Camera()
+    camera.zoom_at(zoom, viewport.center)
+
+    layer = BunchLayer(bunch)
+    layer.update(viewport, camera)
+
+    assert viewport.contains(layer.rect)
+
+    bunch.select_point(150)
+    bunch.move_point(bunch.vertices[150] + (1.0, 1.0))
+
+    for rect in layer.update(viewport, camera):
+        assert viewport.contains(rect)
@@ -0,0 +1,107 @@
+import numpy
+
+from bezier import BezierCurvesBunch
+from bezier.spatial import SpatialGrid, nearest_on_polyline
+
+
+def random_boxes(count: int, seed: int = 0) -> numpy.ndarray:
+    rng = numpy.random.default_rng(seed)
+
+    corners = rng.uniform(-500, 500, (count, 2))
+    return numpy.concatenate([corners, corners + rng.uniform(0, 200, (count, 2))], axis=1)
+
+
+def intersected(boxes: numpy.ndarray, query) -> set:
+    left, top, right, bottom = query
+
+    return set(numpy.flatnonzero(
+        (boxes[:, 0] <= right) & (boxes[:, 2] >= left) & (boxes[:, 1] <= bottom) & (boxes[:, 3] >= top)
+    ).tolist())
+
+
+def test_query_finds_all_intersected_boxes():
+    boxes = random_boxes(1000)
+    grid = SpatialGrid()
+
+    for key, box in enumerate(boxes.tolist()):
+        grid.insert(key, tuple(box))
+
+    for query in random_boxes(200, seed=1).tolist():
+        assert intersected(boxes, query) <= grid.query(tuple(query))
+
+
+def test_insert_moves_and_remove_drops_entry():
+    grid = SpatialGrid(10.0)
+
+    grid.insert("a", (0, 0, 5, 5))
+    grid.insert("a", (100, 100, 105, 105))
+
+    assert grid.query((0, 0, 5, 5)) == set()
+    assert grid.query((100, 100, 101, 101)) == {"a"}
+    assert len(grid) == 1
+
+    assert grid.remove("a")
+    assert not grid.remove("a")
+    assert "a" not in grid
+    assert grid.query((100, 100, 101, 101)) == set()
+
+
+def test_find_vertex_is_the_nearest_one():
+    vertices = numpy.random.default_rng(0).uniform(0, 1000, (301, 2))
+    bunch = BezierCurvesBunch.from_vertices(vertices)
+
+    for position in numpy.random.default_rng(1).uniform(0, 1000, (200, 2)).tolist():
+        distances = numpy.linalg.norm(vertices - position, axis=1)
+        expected = int(numpy.argmin(distances)) if distances.min() <= 30 else None
+
+        assert bunch.find_vertex(position, 30) == expected
+
+
+def test_nearest_on_polyline():
+    points = numpy.array([[0.0, 0.0], [10.0, 0.0], [10.0, 10.0]])
+
+    point, distance = nearest_on_polyline(points, (5.0, 3.0))
+
+    numpy.testing.assert_allclose(point, (5.0, 0.0))
+    assert distance == 3.0
+
+
+def test_extend_is_the_same_as_inserts():
+    boxes = random_boxes(1000)
+    inserted, extended = SpatialGrid(), SpatialGrid()
+
+    for key, box in enumerate(boxes.tolist()):
+        inserted.insert(key, tuple(box))
+    extended.extend(numpy.arange(len(boxes)), boxes)
+
+    queries = random_boxes(200, seed=1)
+    for query in queries.tolist():
+        assert inserted.query(tuple(query)) == extended.query(tuple(query))
+
+    for key in range(0, len(boxes), 2):
+        assert extended.remove(key)
+        inserted.remove(key)
+
+    for query in queries.tolist():
+        assert inserted.query(tuple(query)) == extended.query(tuple(query))
+
+    assert repr(inserted) == repr(extended)
+
+
+def test_count_cells():
+    grid = SpatialGrid(10.0)
+
+    assert grid.count_cells((0, 0, 9, 9)) == 1
+    assert grid.count_cells((-1, 0, 25, 9)) == 4
+
+
+def test_find_vertex_far_zoomed_out():
+    vertices = numpy.array([[0.0, 0.0], [10.0, 0.0], [20.0, 5.0], [30.0, 0.0]])
+    bunch = BezierCurvesBunch.from_vertices(vertices)
+
+    # Radius of the min zoom covers billions of cells of the grid.
+    assert bunch.find_vertex((1.0, 1.0), 5e5) == 0
+    assert bunch.find_point_on_curve((1.0, 1.0), 5e5)[0] == 0
+
+    bunch.select_point(0)
+    assert bunch.find_vertex((1.0, 1.0), 5e5) == 1
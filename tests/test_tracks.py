@@ -0,0 +1,28 @@
+import numpy
+import os
+import pytest
+
+from tracks.__main__ import main, output_names
+from tracks.io import dump_json
+
+
+def test_output_names_keep_directories(tmp_path):
+    paths = [str(tmp_path / "a" / "trek.json"), str(tmp_path / "b" / "trek.json")]
+
+    assert output_names(paths) == [os.path.join("a", "trek"), os.path.join("b", "trek")]
+
+
+def test_output_names_collision(tmp_path):
+    with pytest.raises(ValueError):
+        output_names([str(tmp_path / "t.json"), str(tmp_path / "t.bin")])
+
+
+def test_tracks_of_the_same_name_are_written_apart(tmp_path):
+    for directory, offset in (("a", 0.0), ("b", 100.0)):
+        (tmp_path / directory).mkdir()
+        dump_json([numpy.arange(14.0).reshape(7, 2) + offset], str(tmp_path / directory / "trek.json"))
+
+    output = tmp_path / "out"
+    assert main([str(tmp_path / "a" / "trek.json"), str(tmp_path / "b" / "trek.json"), "-o", str(output)]) == 0
+
+    assert (output / "a" / "trek.json").read_text() != (output / "b" / "trek.json").read_text()
@@ -0,0 +1,97 @@
+import threading
+
+import numpy
+import pytest
+
+from app.worker import SamplingWorker
+from bezier import BezierCurvesBunch, EditHistory
+
+
+VERTICES = numpy.arange(62.0).reshape(31, 2) ** 1.5
+
+
+@pytest.fixture
+def worker():
+    ready = threading.Event()
+    worker = SamplingWorker(on_ready=ready.set)
+    worker.ready = ready
+
+    yield worker
+
+    worker.close()
+
+
+def wait(worker: SamplingWorker):
+    assert worker.ready.wait(5.0)
+    worker.ready.clear()
+
+
+def test_samples_match_eager_bunch(worker):
+    bunch = BezierCurvesBunch.from_vertices(VERTICES, deferred=True)
+    reference = BezierCurvesBunch.from_vertices(VERTICES)
+
+    worker.submit_bunch(bunch)
+    wait(worker)
+
+    assert worker.apply()
+    assert bunch.curves.peek(3) is None
+
+    for curve, reference_curve in zip(bunch.curves, reference.curves):
+        numpy.testing.assert_allclose(curve.points, reference_curve.points)
+
+
+def test_samples_of_moved_curve_are_dropped(worker):
+    bunch = BezierCurvesBunch.from_vertices(VERTICES, deferred=True)
+
+    worker.submit_bunch(bunch)
+    wait(worker)
+
+    bunch.select_point(4)
+    bunch.move_point((0.0, 0.0))
+    bunch.save_point_position()
+
+    assert worker.apply()
+    assert len(bunch.curves[1].points) == 0
+    assert len(bunch.curves[2].points) > 0
+
+    worker.submit_bunch(bunch)
+    wait(worker)
+
+    assert worker.apply()
+    numpy.testing.assert_allclose(bunch.curves[1].points[0], bunch.vertices[3])
+
+
+def test_samples_of_recreated_curve_are_dropped(worker):
+    history = EditHistory()
+    bunch = BezierCurvesBunch(deferred=True, history=history)
+    for vertex in VERTICES[:7]:
+        bunch.add_vertex(vertex)
+
+    worker.submit_bunch(bunch)
+    wait(worker)
+
+    # Undo drops view of the second curve, the new one is created for other vertices.
+    for _ in range(3):
+        history.undo()
+    for vertex in -VERTICES[4:7]:
+        bunch.add_vertex(vertex)
+
+    assert len(bunch.curves) == 2
+    worker.apply()
+    assert len(bunch.curves[1].points) == 0
+
+
+def test_cancelled_samples_are_dropped(worker):
+    bunch = BezierCurvesBunch.from_vertices(VERTICES, deferred=True)
+    other = BezierCurvesBunch.from_vertices(VERTICES, deferred=True)
+
+    worker.submit_bunch(bunch)
+    worker.cancel(bunch)
+    worker.submit_bunch(other)
+
+    results = []
+    while not any(result.key is other for result in results):
+        wait(worker)
+        results += worker.poll()
+
+    assert all(result.key is other for result in results)
@@ -0,0 +1,18 @@
+"""
+Headless processing of saved tracks.
+
+Nothing here initialises display or reads input devices, so it can be used on
+ servers and in worker pools.
+"""
+
+import os
+
+# `bezier` package imports pygame, which greets in stdout on import and breaks
+#  output of the command line interface.
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from tracks.io import (
+    load_track, iter_track, load_json, iter_json, dump_json, load_binary, dump_binary, from_data, to_data
+)
+from tracks.sampling import BunchSamples, sample_bunch, sample_track
+from tracks.batch import sample_files, sample_track_parallel
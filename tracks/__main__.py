@@ -0,0 +1,131 @@
+"""
+Evaluate curves of saved tracks without display.
+
+Usage:
+    python -m tracks trek.json --format json > samples.json
+    python -m tracks trek.json --format npy --output samples --flatness 0.5
+    python -m tracks tracks/*.json --format npy --output samples/ --processes 32
+"""
+
+import argparse
+import os
+import sys
+
+from typing import List, Optional
+
+from tracks.batch import sample_files, sample_track_parallel
+from tracks.io import load_track
+from tracks.sampling import BunchSamples, sample_track
+from tracks.writers import write_json, write_csv, write_npy
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m tracks", description=__doc__.split("\n\n")[0])
+
+    parser.add_argument("tracks", nargs="+", help="Paths to saved tracks.")
+    parser.add_argument(
+        "-f", "--format", choices=("json", "csv", "npy"), default="json",
+        help="Output format. `csv` and `npy` write two tables, see `tracks.writers`."
+    )
+    parser.add_argument(
+        "-o", "--output",
+        help="Output file for `json` (stdout if omitted), files prefix for `csv` and `npy`. "
+             "Directory, if a few tracks passed."
+    )
+    parser.add_argument("-r", "--resolution", type=int, default=30, help="Steps per curve.")
+    parser.add_argument(
+        "--flatness", type=float, default=None,
+        help="Sample adaptively within that deviation in pixels instead of fixed resolution."
+    )
+    parser.add_argument(
+        "-j", "--processes", type=int, default=1,
+        help="Number of worker processes, 0 to use all cores. Tracks are spread "
+             "between workers by files, or by chunks of curves for a single track."
+    )
+
+    args = parser.parse_args(argv)
+
+    if (args.format != "json" or len(args.tracks) > 1) and not args.output:
+        parser.error("--output is required for a few tracks or not `json` format.")
+
+    if len(args.tracks) > 1:
+        try:
+            output_names(args.tracks)
+        except ValueError as error:
+            parser.error(str(error))
+
+    return args
+
+
+def output_names(paths: List[str]) -> List[str]:
+    """Names of outputs of tracks `paths`, relative to the output directory.
+
+    Names are paths of tracks relative to their common directory, without
+     extensions, so tracks of the same name in different directories don't
+     overwrite each other.
+
+    :raise ValueError: Names of a few tracks are the same, e.g. `t.json` and
+        `t.bin` in one directory.
+    """
+
+    paths = [os.path.abspath(path) for path in paths]
+    root = os.path.commonpath([os.path.dirname(path) for path in paths])
+
+    names = [os.path.splitext(os.path.relpath(path, root))[0] for path in paths]
+
+    seen = {}
+    for path, name in zip(paths, names):
+        if name in seen:
+            raise ValueError(f"Tracks <{seen[name]}> and <{path}> would be written to the same output <{name}>.")
+
+        seen[name] = path
+
+    return names
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    processes = args.processes or None
+
+    if len(args.tracks) == 1:
+        track = load_track(args.tracks[0])
+
+        if processes == 1:
+            samples = sample_track(track, args.resolution, args.flatness)
+        else:
+            samples = sample_track_parallel(track, args.resolution, args.flatness, processes)
+
+        write(samples, args.format, args.output)
+    else:
+        if processes == 1:
+            results = [
+                sample_track(load_track(path), args.resolution, args.flatness)
+                for path in args.tracks
+            ]
+        else:
+            results = sample_files(args.tracks, args.resolution, args.flatness, processes)
+
+        for name, samples in zip(output_names(args.tracks), results):
+            output = os.path.join(args.output, name)
+            os.makedirs(os.path.dirname(output), exist_ok=True)
+
+            write(samples, args.format, f"{output}.json" if args.format == "json" else output)
+
+    return 0
+
+
+def write(samples: List[BunchSamples], output_format: str, output: Optional[str]):
+    if output_format == "json":
+        if output:
+            with open(output, "w") as file:
+                write_json(samples, file)
+        else:
+            write_json(samples, sys.stdout)
+    elif output_format == "csv":
+        write_csv(samples, output)
+    else:
+        write_npy(samples, output)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,193 @@
+"""
+Sampling of big tracks and track collections on a process pool.
+
+Collections are spread by files, every worker reads and samples its file
+ itself. Curves of one huge track are spread by chunks: control points and
+ results are kept in shared memory, so workers get only bounds of their
+ chunk and nothing is pickled except them.
+"""
+
+import math
+import numpy
+import os
+
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Optional, Tuple, Iterable
+
+from bezier.evaluation import bunch_controls
+from tracks.io import load_track
+from tracks.sampling import (
+    BunchSamples, curves_resolutions, points_offsets, sample_into, sample_track, split_points
+)
+
+
+# Too small chunks cost more on scheduling than on sampling.
+MIN_CHUNK_SIZE = 4096
+
+ArraySpec = Tuple[str, Tuple[int, ...], str]  # (shared memory name, shape, dtype)
+
+# Shared memory attached by worker process for the current track.
+_worker_specs: Optional[Dict[str, ArraySpec]] = None
+_worker_arrays: Dict[str, numpy.ndarray] = {}
+_worker_memories: List[SharedMemory] = []
+
+
+class SharedArrays:
+    """Numpy arrays allocated in shared memory, unlinked on exit."""
+
+    def __init__(self, **arrays: numpy.ndarray):
+        self.__memories: List[SharedMemory] = []
+        self.arrays: Dict[str, numpy.ndarray] = {}
+        self.specs: Dict[str, ArraySpec] = {}
+
+        for name, array in arrays.items():
+            memory = SharedMemory(create=True, size=max(1, array.nbytes))
+            self.__memories.append(memory)
+
+            shared = numpy.ndarray(array.shape, dtype=array.dtype, buffer=memory.buf)
+            shared[...] = array
+
+            self.arrays[name] = shared
+            self.specs[name] = memory.name, array.shape, array.dtype.str
+
+    def __enter__(self) -> "SharedArrays":
+        return self
+
+    def __exit__(self, *exc_info):
+        # Views on buffers should be released before closing.
+        self.arrays.clear()
+
+        for memory in self.__memories:
+            memory.close()
+            memory.unlink()
+
+
+def sample_files(
+        paths: Iterable[str],
+        resolution: int = 30,
+        flatness: Optional[float] = None,
+        processes: Optional[int] = None
+) -> List[List[BunchSamples]]:
+    """Sample every track from `paths` on a process pool, results keep order."""
+
+    paths = list(paths)
+    processes = processes or os.cpu_count() or 1
+
+    with Pool(processes) as pool:
+        return pool.starmap(
+            _sample_file,
+            [(path, resolution, flatness) for path in paths],
+            chunksize=max(1, len(paths) // (4 * processes))
+        )
+
+
+def sample_track_parallel(
+        track: List[numpy.ndarray],
+        resolution: int = 30,
+        flatness: Optional[float] = None,
+        processes: Optional[int] = None,
+        chunk_size: Optional[int] = None
+) -> List[BunchSamples]:
+    """Sample curves of one track by chunks on a process pool.
+
+    Results are the same as `sample_track` gives.
+    """
+
+    controls = [bunch_controls(vertices) for vertices in track]
+    counts = [len(c) for c in controls]
+
+    controls = numpy.concatenate(controls) if controls else numpy.empty((0, 4, 2))
+    resolutions = curves_resolutions(controls, resolution, flatness)
+    offsets = points_offsets(resolutions)
+
+    processes = processes or os.cpu_count() or 1
+
+    if chunk_size is None:
+        chunk_size = max(MIN_CHUNK_SIZE, math.ceil(len(controls) / (4 * processes)))
+
+    if len(controls) <= chunk_size:
+        return sample_track(track, resolution, flatness)
+
+    # Shared memory is allocated before workers start, so they inherit
+    #  resource tracker of this process and don't try to clean it up on exit.
+    with SharedArrays(
+            controls=controls,
+            resolutions=resolutions,
+            offsets=offsets,
+            points=numpy.empty((offsets[-1], 2), dtype=numpy.float64),
+            lengths=numpy.empty(len(controls), dtype=numpy.float64),
+            bounds=numpy.empty((len(controls), 4), dtype=numpy.float64),
+    ) as shared:
+        chunks = [
+            (start, min(start + chunk_size, len(controls)))
+            for start in range(0, len(controls), chunk_size)
+        ]
+
+        with Pool(processes) as pool:
+            pool.starmap(_sample_chunk, [(shared.specs, *chunk) for chunk in chunks])
+
+        return _split_track(
+            counts,
+            offsets,
+            shared.arrays["points"].copy(),
+            shared.arrays["lengths"].copy(),
+            shared.arrays["bounds"].copy()
+        )
+
+
+def _split_track(
+        counts: List[int],
+        offsets: numpy.ndarray,
+        points: numpy.ndarray,
+        lengths: numpy.ndarray,
+        bounds: numpy.ndarray
+) -> List[BunchSamples]:
+    curves = split_points(points, offsets)
+    track = []
+
+    start = 0
+    for count in counts:
+        stop = start + count
+        track.append(BunchSamples(curves[start:stop], lengths[start:stop], bounds[start:stop]))
+        start = stop
+
+    return track
+
+
+def _sample_file(path: str, resolution: int, flatness: Optional[float]) -> List[BunchSamples]:
+    return sample_track(load_track(path), resolution, flatness)
+
+
+def _sample_chunk(specs: Dict[str, ArraySpec], start: int, stop: int) -> None:
+    arrays = _attach(specs)
+    offsets = arrays["offsets"]
+
+    sample_into(
+        arrays["controls"][start:stop],
+        arrays["resolutions"][start:stop],
+        offsets[start:stop + 1] - offsets[start],
+        arrays["points"][offsets[start]:offsets[stop]],
+        arrays["lengths"][start:stop],
+        arrays["bounds"][start:stop],
+    )
+
+
+def _attach(specs: Dict[str, ArraySpec]) -> Dict[str, numpy.ndarray]:
+    """Arrays of shared memory, attached once per worker process."""
+
+    global _worker_specs
+
+    if _worker_specs != specs:
+        _worker_arrays.clear()
+        while _worker_memories:
+            _worker_memories.pop().close()
+
+        for name, (memory_name, shape, dtype) in specs.items():
+            memory = SharedMemory(name=memory_name)
+            _worker_memories.append(memory)
+            _worker_arrays[name] = numpy.ndarray(shape, dtype=numpy.dtype(dtype), buffer=memory.buf)
+
+        _worker_specs = specs
+
+    return _worker_arrays
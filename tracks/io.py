@@ -0,0 +1,296 @@
+"""
+Reading and writing of tracks without any display or pygame state.
+
+Track is a list of bunches, every bunch is an array of its packed vertices
+ with shape `(3k + 1, 2)`, as `DataManagement.data` stores them.
+
+Binary format, all numbers are little-endian:
+    header    magic `BZTRACK\0`, u32 version, u32 size of float (4 or 8),
+              u64 number of bunches `n`
+    offsets   `n + 1` of u64, index of the first vertex of every bunch and
+              the total number of vertices in the end
+    vertices  packed `(x, y)` floats of all bunches, aligned by 64 bytes
+"""
+
+import json
+import mmap
+import numpy
+import os
+import re
+import struct
+
+from typing import List, Iterator, TextIO, Tuple
+
+
+_curves_start = re.compile(r'"curves"\s*:\s*\[')
+_vertices_start = re.compile(r'\{\s*"vertices"\s*:\s*\[')
+_vertices_stop = re.compile(r'\]\s*\]')
+_empty_stop = re.compile(r'\s*\]')
+_separators = " \t\r\n,"
+_brackets = str.maketrans("[],", "   ")
+
+
+def iter_json(path: str, chunk_size: int = 1 << 16) -> Iterator[numpy.ndarray]:
+    """Vertices of bunches parsed one by one while reading the file.
+
+    Vertices of bunches as the app and `dump_json` write them, with the only
+     key, are parsed by chunks of the file right into numpy, so even one huge
+     bunch isn't held as python objects. Bunches with other keys are decoded
+     whole, one at a time.
+    """
+
+    decoder = json.JSONDecoder()
+
+    with open(path, "r") as file:
+        buffer = ""
+        read_size = chunk_size
+
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                raise ValueError(f"File <{path}> has no curves.")
+
+            buffer += chunk
+            found = _curves_start.search(buffer)
+            if found:
+                buffer = buffer[found.end():]
+                break
+
+            # Keep tail, key may be split between chunks.
+            buffer = buffer[-32:]
+
+        while True:
+            position = 0
+            while position < len(buffer) and buffer[position] in _separators:
+                position += 1
+
+            if position < len(buffer) and buffer[position] == "]":
+                return
+
+            found = _vertices_start.match(buffer, position)
+            if found:
+                vertices, buffer = _read_vertices(file, buffer[found.end():], chunk_size, path)
+                buffer = _read_bunch_end(file, buffer, chunk_size, path)
+
+                yield vertices
+                continue
+
+            try:
+                curve, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # Bunch isn't read completely. Read size grows to not parse
+                #  huge bunches again and again.
+                chunk = file.read(read_size)
+                if not chunk:
+                    raise
+
+                buffer += chunk
+                read_size *= 2
+                continue
+
+            yield numpy.asarray(curve["vertices"], dtype=numpy.float64).reshape(-1, 2)
+
+            buffer = buffer[end:]
+            read_size = chunk_size
+
+
+def _read_vertices(file: TextIO, buffer: str, chunk_size: int, path: str) -> Tuple[numpy.ndarray, str]:
+    """Array of pairs `[x, y]` after its opening bracket in `buffer` and text after it.
+
+    Pairs read completely are converted by chunks, only the rest of the last
+     one is kept in text.
+    """
+
+    parts = []
+
+    while True:
+        found = _empty_stop.match(buffer)
+        if found:
+            text, buffer = "", buffer[found.end():]
+        else:
+            found = _vertices_stop.search(buffer)
+            if found:
+                text, buffer = buffer[:found.start() + 1], buffer[found.end():]
+
+        if found:
+            parts.append(_parse_pairs(text, path))
+            return numpy.concatenate(parts), buffer
+
+        cut = buffer.rfind("]") + 1
+        parts.append(_parse_pairs(buffer[:cut], path))
+        buffer = buffer[cut:]
+
+        chunk = file.read(chunk_size)
+        if not chunk:
+            raise ValueError(f"File <{path}> ends inside of vertices.")
+
+        buffer += chunk
+
+
+def _parse_pairs(text: str, path: str) -> numpy.ndarray:
+    try:
+        return numpy.array(text.translate(_brackets).split(), dtype=numpy.float64).reshape(-1, 2)
+    except ValueError:
+        raise ValueError(f"File <{path}> has malformed vertices.") from None
+
+
+def _read_bunch_end(file: TextIO, buffer: str, chunk_size: int, path: str) -> str:
+    """Text after closing brace of bunch, which vertices are read from `buffer`."""
+
+    decoder = json.JSONDecoder()
+
+    while True:
+        stripped = buffer.lstrip()
+        if stripped:
+            break
+
+        chunk = file.read(chunk_size)
+        if not chunk:
+            raise ValueError(f"File <{path}> ends inside of bunch.")
+
+        buffer += chunk
+
+    if stripped[0] == "}":
+        return stripped[1:]
+
+    if stripped[0] != ",":
+        raise ValueError(f"File <{path}> has malformed bunch.")
+
+    # Other keys follow vertices, they are skipped as rest of an object.
+    buffer = "{" + stripped[1:]
+    while True:
+        try:
+            _, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                raise
+
+            buffer += chunk
+            continue
+
+        return buffer[end:]
+
+
+def load_json(path: str) -> List[numpy.ndarray]:
+    return list(iter_json(path))
+
+
+def dump_json(track: List[numpy.ndarray], path: str) -> None:
+    with open(path, "w") as file:
+        json.dump(to_data(track), file, indent=4)
+
+
+def from_data(data: dict) -> List[numpy.ndarray]:
+    """Vertices of bunches from `DataManagement.data` format."""
+
+    return [
+        numpy.asarray(curve["vertices"], dtype=numpy.float64).reshape(-1, 2)
+        for curve in data["curves"]
+    ]
+
+
+def to_data(track: List[numpy.ndarray]) -> dict:
+    return {"curves": [{"vertices": vertices.tolist()} for vertices in track]}
+
+
+BINARY_MAGIC = b"BZTRACK\0"
+BINARY_VERSION = 1
+
+_header = struct.Struct("<8sIIQ")
+_alignment = 64
+_float_types = {4: numpy.dtype("<f4"), 8: numpy.dtype("<f8")}
+
+
+def load_binary(path: str) -> List[numpy.ndarray]:
+    """Map binary track in memory.
+
+    Vertices are read-only views of the mapped file, so nothing is copied and
+     only pages of really used vertices are read from disk.
+    """
+
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size < _header.size:
+            raise ValueError(f"File <{path}> is not a binary track.")
+
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, float_size, count = _header.unpack_from(mapped)
+
+    if magic != BINARY_MAGIC:
+        raise ValueError(f"File <{path}> is not a binary track.")
+    if version != BINARY_VERSION or float_size not in _float_types:
+        raise ValueError(
+            f"Unsupported binary track <{path}> version {version} with {float_size} bytes floats."
+        )
+
+    if len(mapped) < _vertices_offset(count):
+        raise ValueError(f"File <{path}> is truncated.")
+
+    offsets = numpy.frombuffer(mapped, dtype="<u8", count=count + 1, offset=_header.size)
+    if offsets[0] != 0 or numpy.any(offsets[1:] < offsets[:-1]):
+        raise ValueError(f"File <{path}> has malformed offsets of bunches.")
+
+    if len(mapped) < _vertices_offset(count) + 2 * float_size * int(offsets[-1]):
+        raise ValueError(f"File <{path}> is truncated.")
+
+    vertices = numpy.frombuffer(
+        mapped,
+        dtype=_float_types[float_size],
+        count=2 * int(offsets[-1]),
+        offset=_vertices_offset(count)
+    ).reshape(-1, 2)
+
+    return [vertices[offsets[i]:offsets[i + 1]] for i in range(count)]
+
+
+def dump_binary(track: List[numpy.ndarray], path: str, float_size: int = 8) -> None:
+    """Write binary track.
+
+    Track is written to temporary file, which then replaces `path`, so
+     tracks loaded from `path` keep their mapped vertices, even if they are
+     saved back to it.
+    """
+
+    dtype = _float_types[float_size]
+
+    offsets = numpy.zeros(len(track) + 1, dtype="<u8")
+    numpy.cumsum([len(vertices) for vertices in track], out=offsets[1:])
+
+    temporary = f"{path}.tmp"
+
+    with open(temporary, "wb") as file:
+        file.write(_header.pack(BINARY_MAGIC, BINARY_VERSION, float_size, len(track)))
+        file.write(offsets.tobytes())
+        file.write(b"\0" * (_vertices_offset(len(track)) - file.tell()))
+
+        for vertices in track:
+            file.write(numpy.ascontiguousarray(vertices, dtype=dtype).tobytes())
+
+    os.replace(temporary, path)
+
+
+def _vertices_offset(count: int) -> int:
+    size = _header.size + 8 * (count + 1)
+
+    return -(-size // _alignment) * _alignment
+
+
+def is_binary(path: str) -> bool:
+    with open(path, "rb") as file:
+        return file.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+
+
+def iter_track(path: str) -> Iterator[numpy.ndarray]:
+    """Vertices of bunches of track in any of supported formats, one by one."""
+
+    if is_binary(path):
+        yield from load_binary(path)
+    else:
+        yield from iter_json(path)
+
+
+def load_track(path: str) -> List[numpy.ndarray]:
+    """Load track in any of supported formats."""
+
+    return load_binary(path) if is_binary(path) else load_json(path)
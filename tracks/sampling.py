@@ -0,0 +1,118 @@
+import numpy
+
+from typing import List, NamedTuple, Optional
+
+from bezier.evaluation import bunch_controls, basis_matrix, flattening_resolution
+
+
+class BunchSamples(NamedTuple):
+    curves: List[numpy.ndarray]  # Sampled points of every curve.
+    lengths: numpy.ndarray  # Length of every curve polyline, `(k,)`.
+    bounds: numpy.ndarray  # (left, top, right, bottom) of every curve, `(k, 4)`.
+
+    @property
+    def polyline(self) -> numpy.ndarray:
+        """Points of all curves with shared endpoints emitted once."""
+
+        if not self.curves:
+            return numpy.empty((0, 2), dtype=numpy.float64)
+
+        return numpy.concatenate([p[:-1] for p in self.curves] + [self.curves[-1][-1:]])
+
+
+def curves_resolutions(
+        controls: numpy.ndarray,
+        resolution: int = 30,
+        flatness: Optional[float] = None
+) -> numpy.ndarray:
+    """Number of steps for every curve of `controls` with shape `(k, 4, 2)`."""
+
+    if flatness is None:
+        return numpy.full(len(controls), resolution, dtype=numpy.int64)
+
+    return flattening_resolution(controls, flatness)
+
+
+def points_offsets(resolutions: numpy.ndarray) -> numpy.ndarray:
+    """Offsets of curves points packed one after another, with total in the end."""
+
+    offsets = numpy.zeros(len(resolutions) + 1, dtype=numpy.int64)
+    numpy.cumsum(resolutions + 1, out=offsets[1:])
+
+    return offsets
+
+
+def sample_into(
+        controls: numpy.ndarray,
+        resolutions: numpy.ndarray,
+        offsets: numpy.ndarray,
+        points: numpy.ndarray,
+        lengths: numpy.ndarray,
+        bounds: numpy.ndarray
+) -> None:
+    """Sample curves into preallocated arrays.
+
+    Points of curve `i` are written in `points[offsets[i]:offsets[i + 1]]`,
+     curves with equal resolution are evaluated together in one batch.
+    """
+
+    for value in numpy.unique(resolutions):
+        value = int(value)
+        indices = numpy.flatnonzero(resolutions == value)
+
+        # Coordinates go first `(k, 2, value + 1)`, so reductions over points
+        #  of every curve run on contiguous memory.
+        coordinates = numpy.matmul(controls[indices].transpose(0, 2, 1), basis_matrix(value).T)
+
+        steps = numpy.diff(coordinates, axis=2)
+        lengths[indices] = numpy.hypot(steps[:, 0], steps[:, 1]).sum(axis=1)
+        bounds[indices, :2] = coordinates.min(axis=2)
+        bounds[indices, 2:] = coordinates.max(axis=2)
+
+        if indices[-1] - indices[0] + 1 == len(indices):
+            # Neighbouring curves, as always with fixed resolution.
+            target = points[offsets[indices[0]]:offsets[indices[-1] + 1]]
+            target.reshape(len(indices), value + 1, 2)[...] = coordinates.transpose(0, 2, 1)
+        else:
+            targets = offsets[indices, None] + numpy.arange(value + 1)
+            points[targets] = coordinates.transpose(0, 2, 1)
+
+
+def sample_bunch(
+        vertices: numpy.ndarray,
+        resolution: int = 30,
+        flatness: Optional[float] = None
+) -> BunchSamples:
+    """Sample all curves of the bunch in batches.
+
+    :param vertices: Packed vertices of the bunch `(3k + 1, 2)`.
+    :param resolution: Number of steps for every curve.
+    :param flatness: Choose resolution of every curve adaptively to keep
+        points within that deviation from the true curve, if passed.
+    """
+
+    controls = bunch_controls(vertices)
+    resolutions = curves_resolutions(controls, resolution, flatness)
+    offsets = points_offsets(resolutions)
+
+    points = numpy.empty((offsets[-1], 2), dtype=numpy.float64)
+    lengths = numpy.empty(len(controls), dtype=numpy.float64)
+    bounds = numpy.empty((len(controls), 4), dtype=numpy.float64)
+
+    sample_into(controls, resolutions, offsets, points, lengths, bounds)
+
+    return BunchSamples(split_points(points, offsets), lengths, bounds)
+
+
+def split_points(points: numpy.ndarray, offsets: numpy.ndarray) -> List[numpy.ndarray]:
+    """Views on points of every curve packed by `points_offsets`."""
+
+    return [points[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+
+
+def sample_track(
+        track: List[numpy.ndarray],
+        resolution: int = 30,
+        flatness: Optional[float] = None
+) -> List[BunchSamples]:
+    return [sample_bunch(vertices, resolution, flatness) for vertices in track]
@@ -0,0 +1,81 @@
+"""
+Writers of sampled tracks.
+
+JSON keeps structure of `DataManagement.data`. CSV and `.npy` are flat tables
+ written in two files: `<prefix>.points.<ext>` with `bunch, curve, x, y`
+ columns and `<prefix>.curves.<ext>` with
+ `bunch, curve, length, left, top, right, bottom` columns.
+"""
+
+import csv
+import json
+import numpy
+
+from typing import List, TextIO
+
+from tracks.sampling import BunchSamples
+
+
+POINTS_COLUMNS = ("bunch", "curve", "x", "y")
+CURVES_COLUMNS = ("bunch", "curve", "length", "left", "top", "right", "bottom")
+
+
+def points_table(track: List[BunchSamples]) -> numpy.ndarray:
+    rows = [
+        numpy.column_stack([
+            numpy.full(len(points), bunch_index),
+            numpy.full(len(points), curve_index),
+            points
+        ])
+        for bunch_index, samples in enumerate(track)
+        for curve_index, points in enumerate(samples.curves)
+    ]
+
+    return numpy.concatenate(rows) if rows else numpy.empty((0, len(POINTS_COLUMNS)))
+
+
+def curves_table(track: List[BunchSamples]) -> numpy.ndarray:
+    rows = [
+        numpy.column_stack([
+            numpy.full(len(samples.lengths), bunch_index),
+            numpy.arange(len(samples.lengths)),
+            samples.lengths,
+            samples.bounds
+        ])
+        for bunch_index, samples in enumerate(track)
+    ]
+
+    return numpy.concatenate(rows) if rows else numpy.empty((0, len(CURVES_COLUMNS)))
+
+
+def write_json(track: List[BunchSamples], file: TextIO) -> None:
+    data = {
+        "curves": [
+            {
+                "points": samples.polyline.tolist(),
+                "lengths": samples.lengths.tolist(),
+                "bounds": samples.bounds.tolist(),
+            }
+            for samples in track
+        ]
+    }
+
+    json.dump(data, file)
+
+
+def write_csv(track: List[BunchSamples], prefix: str) -> None:
+    for name, columns, table in (
+            ("points", POINTS_COLUMNS, points_table(track)),
+            ("curves", CURVES_COLUMNS, curves_table(track)),
+    ):
+        with open(f"{prefix}.{name}.csv", "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(columns)
+            writer.writerows(
+                [int(row[0]), int(row[1]), *row[2:].tolist()] for row in table
+            )
+
+
+def write_npy(track: List[BunchSamples], prefix: str) -> None:
+    numpy.save(f"{prefix}.points.npy", points_table(track))
+    numpy.save(f"{prefix}.curves.npy", curves_table(track))
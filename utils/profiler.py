@@ -0,0 +1,96 @@
+"""
+Timers and counters of frames.
+
+Instrumented code checks `profiler.enabled` before calling it, so disabled
+ profiler costs one attribute lookup on hot paths.
+"""
+
+import json
+import os
+import threading
+import time
+
+from collections import defaultdict, deque
+from typing import Deque, Dict, Tuple
+
+
+class Profiler:
+    """Collects durations of sections and counters, frame by frame.
+
+    Sections and frame counters are kept as events of Chrome trace format, so
+     the recording can be opened in `chrome://tracing` or Perfetto.
+    """
+
+    # Max events of recording, the oldest ones are dropped.
+    MAX_EVENTS = 1 << 18
+
+    def __init__(self):
+        self.enabled = False
+
+        self.__events: Deque[dict] = deque(maxlen=self.MAX_EVENTS)
+        self.__origin = time.perf_counter()
+
+        self.__timings: Dict[str, float] = defaultdict(float)
+        self.__counters: Dict[str, int] = defaultdict(int)
+
+        # Totals of the last finished frame.
+        self.timings: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+
+    def enable(self, enabled: bool = True):
+        self.enabled = enabled
+
+        if not enabled:
+            self.__timings.clear()
+            self.__counters.clear()
+
+            self.timings = {}
+            self.counters = {}
+
+    def add(self, name: str, start: float, duration: float):
+        """Record section `name`, timed by `time.perf_counter`."""
+
+        self.__timings[name] += duration
+        self.__events.append({
+            "name": name,
+            "ph": "X",
+            "ts": (start - self.__origin) * 1e6,
+            "dur": duration * 1e6,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        })
+
+    def count(self, name: str, value: int = 1):
+        self.__counters[name] += value
+
+    def end_frame(self):
+        """Finish the frame, its totals are kept in `timings` and `counters`."""
+
+        self.timings, self.__timings = dict(self.__timings), defaultdict(float)
+        self.counters, self.__counters = dict(self.__counters), defaultdict(int)
+
+        if self.counters:
+            self.__events.append({
+                "name": "counters",
+                "ph": "C",
+                "ts": (time.perf_counter() - self.__origin) * 1e6,
+                "args": self.counters,
+                "pid": os.getpid(),
+            })
+
+    def lines(self) -> Tuple[str, ...]:
+        """Totals of the last frame as text lines, for overlay."""
+
+        return (
+            *(f"{name}: {duration * 1000:.2f} ms" for name, duration in sorted(self.timings.items())),
+            *(f"{name}: {value}" for name, value in sorted(self.counters.items())),
+        )
+
+    def export(self, path: str):
+        """Write recording in Chrome trace format."""
+
+        with open(path, "w") as file:
+            json.dump({"traceEvents": list(self.__events), "displayTimeUnit": "ms"}, file)
+
+
+profiler = Profiler()
@@ -1,23 +1,26 @@
 from __future__ import annotations
 
+import numpy
 import pygame
 
-from typing import TypedDict, Union, Tuple, List, Optional, Callable
+from typing import TypedDict, Union, Tuple, List, Optional, Callable, Sequence
 
 from abc import ABC, abstractmethod
 
 
 class _BezierCurveInterface(ABC):
+    __slots__ = ()
+
     @abstractmethod
-    def update(self):
+    def add_vertex(self, vector: Union[pygame.Vector2, Tuple[float, float]]):
         ...
 
     @abstractmethod
-    def add_vertex(self, vector: Union[pygame.Vector2, Tuple[float, float]]):
+    def select_point(self, index: int) -> numpy.ndarray:
         ...
 
     @abstractmethod
-    def select_point(self, point) -> pygame.Vector2:
+    def move_point(self, position: Tuple[float, float]):
         ...
 
     @abstractmethod
@@ -30,21 +33,17 @@ class _BezierCurveInterface(ABC):
 
 
 class ABCBezierCurve(_BezierCurveInterface, ABC):
+    __slots__ = ()
+
     __curve_resolution: int
     __step_size: float
-    __old_point_position: Union[pygame.Vector2, None] = None
-    __selected_point: Union[pygame.Vector2, None] = None
+    __old_point_position: Union[numpy.ndarray, None]
+    __selected_index: Union[int, None]
 
-    vertices: List[pygame.Vector2]
-    points: List[pygame.Vector2]
-
-    @abstractmethod
-    def select_point(
-            self,
-            point: pygame.Vector2,
-            new_point: pygame.Vector2 = None
-    ) -> pygame.Vector2:
-        ...
+    vertices: numpy.ndarray
+    points: Union[numpy.ndarray, List[pygame.Vector2]]
+    bounds: Optional[Tuple[float, float, float, float]]
+    resolution: int
 
     @property
     @abstractmethod
@@ -55,17 +54,22 @@ class ABCBezierCurve(_BezierCurveInterface, ABC):
     def _set_resolution(self, value):
         ...
 
+    @abstractmethod
+    def level_points(self, resolution: float) -> numpy.ndarray:
+        ...
+
 
 class ABCBezierCurvesBunch(_BezierCurveInterface, ABC):
-    curves: List[ABCBezierCurve]
-    vertices: List[pygame.Vector2]
-    __old_point_position: Union[pygame.Vector2, None] = None
-    __selected_point: Union[pygame.Vector2, None] = None
+    curves: Sequence[ABCBezierCurve]
+    vertices: numpy.ndarray
+    bounds: Tuple[float, float, float, float]
+    __selected_index: Union[int, None]
+    __selected_point: Union[numpy.ndarray, None]
 
 
 class AppStateType(TypedDict):
     running: Union[bool, None]
-    selected_point: Union[Union[Tuple[float, float], pygame.Vector2], None]
+    selected_point: Union[numpy.ndarray, None]
     selected_curve: Union[ABCBezierCurvesBunch, None]
     mode: Union[str, None]
 